@@ -11,7 +11,7 @@ class EmbeddingAgent:
     and calculates their similarity score.
     It utilizes functions from `core/embedding.py`.
     """
-    def process(self, cleaned_resume_list: list[str], cleaned_jd_list: list[str]):
+    def process(self, cleaned_resume_list: list[str], cleaned_jd_list: list[str], resume_chunk_vectors: list = None):
         """
         Generates embeddings for the cleaned resume and job description and calculates
         their cosine similarity.
@@ -19,13 +19,16 @@ class EmbeddingAgent:
         Args:
             cleaned_resume_list (list[str]): The preprocessed tokens of the resume.
             cleaned_jd_list (list[str]): The preprocessed tokens of the job description.
+            resume_chunk_vectors (list, optional): Stored resume chunk embeddings (chunked similarity mode).
 
         Returns:
             float: The cosine similarity score between the resume and job description embeddings.
         """
         print("Generating embeddings and calculating similarity...")
         try:
-            similarity_score = calculate_resume_jd_similarity(cleaned_resume_list, cleaned_jd_list)
+            similarity_score = calculate_resume_jd_similarity(
+                cleaned_resume_list, cleaned_jd_list, resume_chunk_vectors=resume_chunk_vectors
+            )
             print(f"Similarity score calculated: {similarity_score:.4f}")
             return similarity_score
         except Exception as e:
@@ -9,20 +9,22 @@ class IngestionAgent:
     The IngestionAgent handles the loading and initial preprocessing of resumes and job descriptions.
     It utilizes functions from `core/utils.py` for document processing.
     """
-    def ingest(self, resume_path: str, jd_text: str) -> dict:
+    def ingest(self, resume_path: str, jd_text: str, resume_text: str = None, resume_tokens: list[str] = None) -> dict:
         """
         Loads and preprocesses the resume and job description.
         
         Args:
             resume_path (str): The file path to the resume (e.g., PDF).
             jd_path (str): The file path to the job description (e.g., plain text).
+            resume_text (str, optional): Resume text already extracted from the upload; skips loading the file.
+            resume_tokens (list[str], optional): Resume tokens already cleaned; skips cleaning the resume.
             
         Returns:
             dict: A dictionary containing the raw resume and job description text, and their cleaned text (lists of tokens).
         """
         print(f"Ingesting documents: Resume - {resume_path},Job Description Text Provided.")
         try:
-            ingested_data = process_documents(resume_path, jd_text)
+            ingested_data = process_documents(resume_path, jd_text, resume_text, resume_tokens)
             return ingested_data
         except Exception as e:
             print(f"Error during ingestion: {e}")
@@ -1,32 +1,55 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-import tempfile
 import os
+import shutil
+import tempfile
+from typing import List
+
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
 from .models import AtsCheckResponse
-from workflows.ats_flow import ats_analysis_flow
+from workflows.ats_flow import run_ats_analysis
+from workflows.ats_batch import BatchLimits, extract_zip, score_resumes_ndjson
+from core.resume_artifacts import ResumeArtifact
+from core.document_extractor import content_hash
+from core.ats_cache import get_ats_result_cache
+from core.ats_rules import list_rule_packs
 
 router = APIRouter()
 
+
+def _check_rule_pack(rule_pack: str) -> None:
+    # Packs are picked by name only; file paths are for the CLI
+    if rule_pack and rule_pack not in list_rule_packs():
+        raise HTTPException(status_code=400,
+                            detail=f"Unknown rule pack: {rule_pack} (available: {', '.join(list_rule_packs())})")
+
+
 @router.post("/check-file", response_model=AtsCheckResponse)
 async def check_ats_file(
     resume_file: UploadFile = File(...),
-    job_description: str = Form(None)
+    job_description: str = Form(None),
+    rule_pack: str = Form(None)
 ):
-    temp_path = None
+    _check_rule_pack(rule_pack)
     try:
-        # Create a temporary file with the same extension
-        suffix = os.path.splitext(resume_file.filename)[1] or ".pdf"
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            temp_path = tmp.name
-            content = await resume_file.read()
-            tmp.write(content)
-
-        # Run ATS flow
-        results = ats_analysis_flow(
-            resume_path=temp_path,
-            job_description=job_description
-        )
+        content = await resume_file.read()
+        resume_hash = content_hash(content)
+
+        def analyze():
+            # Text and tokens come from the resume artifact store (keyed by content hash)
+            artifact = ResumeArtifact(resume_hash, data=content, filename=resume_file.filename or "resume.pdf")
+            # Run the ATS checks (in-process unless ATS_EXECUTION_MODE=prefect)
+            return run_ats_analysis(
+                job_description=job_description,
+                resume_text=artifact.text,
+                resume_tokens=artifact.tokens,
+                rule_pack=rule_pack
+            )
+
+        # A repeat check of the same resume and JD is answered from the result cache
+        results = await run_in_threadpool(get_ats_result_cache().get_or_compute, resume_hash, job_description, analyze,
+                                         rule_pack)
 
         return AtsCheckResponse(
             overall_score=results["overall_score"],
@@ -37,6 +60,42 @@ async def check_ats_file(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-    finally:
-        if temp_path and os.path.exists(temp_path):
-            os.remove(temp_path)
+
+@router.post("/check-batch")
+async def check_ats_batch(
+    resume_files: List[UploadFile] = File(...),
+    job_description: str = Form(None),
+    rule_pack: str = Form(None)
+):
+    """
+    ATS-scores many resumes (PDFs, or ZIP archives of PDFs) against one optional JD.
+    Streams NDJSON: one line per resume as soon as it is scored.
+    """
+    _check_rule_pack(rule_pack)
+    upload_dir = tempfile.mkdtemp(prefix="ats_batch_")
+    paths = []
+    # One budget for every upload and ZIP member (ATS_BATCH_MAX_FILES / _FILE_MB / _TOTAL_MB)
+    limits = BatchLimits()
+    try:
+        for i, resume_file in enumerate(resume_files):
+            # One subdirectory per upload keeps same-named files apart
+            target_dir = os.path.join(upload_dir, str(i))
+            os.makedirs(target_dir)
+            name = os.path.basename(resume_file.filename or "resume.pdf")
+            if name.lower().endswith(".zip"):
+                paths.extend(await run_in_threadpool(extract_zip, resume_file.file, target_dir, limits))
+                continue
+            path = os.path.join(target_dir, name)
+            await run_in_threadpool(limits.copy, resume_file.file, path, name)
+            paths.append(path)
+    except Exception as e:
+        shutil.rmtree(upload_dir, ignore_errors=True)
+        raise HTTPException(status_code=400, detail=f"Could not read uploads: {e}")
+
+    def stream():
+        try:
+            yield from score_resumes_ndjson(paths, job_description, rule_pack=rule_pack)
+        finally:
+            shutil.rmtree(upload_dir, ignore_errors=True)
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
@@ -0,0 +1,30 @@
+"""
+Gunicorn config for running the backend with several Uvicorn workers:
+
+    cd backend && gunicorn main:app -c gunicorn_conf.py
+
+The app is imported once in the master (preload_app) and the embedding
+models are loaded there before the workers are forked, so every worker
+shares one copy of the weights copy-on-write instead of loading its own.
+`uvicorn --workers` can't do this: it starts workers with spawn.
+"""
+
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+preload_app = True
+
+
+def on_starting(server):
+    """Runs in the master after main is imported and before any worker is forked."""
+    from core.embedding_backends import preload_embedding_models
+
+    timings = preload_embedding_models()
+    server.log.info(f"Preloaded embedding models before fork: {timings}")
+    # Move everything loaded so far out of the GC's reach, so collections in the
+    # workers don't touch (and un-share) those pages.
+    gc.freeze()
@@ -1,7 +1,11 @@
 # router.py
 import sys
 import os
+import json
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from langchain_core.messages import HumanMessage, AIMessage
 from .models import (
     ChatRequest, ChatResponse, 
     CreateSessionResponse, AllSessionsResponse, 
@@ -9,12 +13,23 @@ from .models import (
 )
 from .sessions_store import create_session, list_sessions, delete_session,update_session_title,get_session
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
-from rag_core.retriever import get_full_conversational_chain, llm, get_redis_history
+from rag_core.retriever import (
+    get_full_conversational_chain, get_conversational_branch_chain,
+    with_redis_history, get_llm, get_redis_history
+)
+from core.resources import register_resource
 
 router = APIRouter()
 
 DEFAULT_K = 5
-conversation_chain = get_full_conversational_chain(llm, DEFAULT_K)
+# The streaming endpoint uses the bare branch chain; /chat wraps the same one with Redis history.
+# Both are built on first use (or during warm-up) since that loads FAISS, BM25 and MiniLM.
+get_branch_chain = register_resource(
+    "interview_prep:branch_chain", lambda: get_conversational_branch_chain(get_llm(), DEFAULT_K)
+)
+get_conversation_chain = register_resource(
+    "interview_prep:conversation_chain", lambda: with_redis_history(get_branch_chain())
+)
 
 
 # -----------------------------------------
@@ -78,12 +93,13 @@ async def delete_chat(session_id: str):
 # -----------------------------------------
 @router.post("/chat", response_model=ChatResponse)
 async def chat(payload: ChatRequest):
-    chain = conversation_chain
-
+    # Building a chain loads retrieval resources, so keep it off the event loop
     if payload.k_retrieval != DEFAULT_K:
-        chain = get_full_conversational_chain(llm, payload.k_retrieval)
+        chain = await run_in_threadpool(lambda: get_full_conversational_chain(get_llm(), payload.k_retrieval))
+    else:
+        chain = await run_in_threadpool(get_conversation_chain)
 
-    answer = chain.invoke(
+    answer = await chain.ainvoke(
         {"input": payload.message},
         config={"configurable": {"session_id": payload.session_id}}
     )
@@ -95,3 +111,55 @@ async def chat(payload: ChatRequest):
          update_session_title(payload.session_id, payload.message[:50])
  
     return ChatResponse(session_id=payload.session_id, answer=answer)
+
+
+# -----------------------------------------
+# 6) Streaming Chat Endpoint (Server-Sent Events)
+# -----------------------------------------
+def _sse(data: dict, event: str = None) -> str:
+    """Formats one Server-Sent Event; JSON keeps newlines inside tokens intact."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+@router.post("/chat/stream")
+async def chat_stream(payload: ChatRequest):
+    """
+    Streams the answer token-by-token as SSE `data: {"token": ...}` events,
+    followed by an `event: done` carrying the full answer.
+    The exchange is written to Redis history only after the stream completes.
+    """
+    if payload.k_retrieval != DEFAULT_K:
+        chain = await run_in_threadpool(lambda: get_conversational_branch_chain(get_llm(), payload.k_retrieval))
+    else:
+        chain = await run_in_threadpool(get_branch_chain)
+
+    redis_history = get_redis_history(payload.session_id)
+
+    async def event_stream():
+        chunks = []
+        try:
+            chat_history = await redis_history.aget_messages()
+            async for chunk in chain.astream({"input": payload.message, "chat_history": chat_history}):
+                token = chunk if isinstance(chunk, str) else getattr(chunk, "content", str(chunk))
+                if token:
+                    chunks.append(token)
+                    yield _sse({"token": token})
+        except Exception as e:
+            yield _sse({"detail": f"Error generating answer: {str(e)}"}, event="error")
+            return
+
+        answer = "".join(chunks)
+        await redis_history.aadd_messages([HumanMessage(content=payload.message), AIMessage(content=answer)])
+
+        session_meta = get_session(payload.session_id)
+        if session_meta and session_meta.get("title") == "New Chat":
+            update_session_title(payload.session_id, payload.message[:50])
+
+        yield _sse({"session_id": payload.session_id, "answer": answer}, event="done")
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
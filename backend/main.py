@@ -1,4 +1,8 @@
-from fastapi import FastAPI
+import os
+import asyncio
+from uuid import uuid4
+
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from resume_matcher.router import router as resume_matcher_router
@@ -6,9 +10,19 @@ from ats_checker.router import router as ats_checker_router
 from interview_prep.router import router as interview_prep_router
 from mock_interview.router import router as mock_interview_router
 from portfolio_api.router import router as portfolio_builder_router
+# The routers put the project root on sys.path, so core is importable from here on.
+from core import llm_telemetry
+from core.resources import get_resource_registry
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, REGISTRY, generate_latest
 
 app = FastAPI()
 
+# How expensive resources (LLM clients, NLTK data, MiniLM, the RAG chain) are built:
+# "background" (default) starts serving immediately and builds them in a thread,
+# "blocking" builds them before the first request, "off" leaves them to first use.
+RESOURCE_WARM_UP = os.environ.get("RESOURCE_WARM_UP", "background").lower()
+warm_up_state = {"status": "pending" if RESOURCE_WARM_UP != "off" else "off"}
+
 # CORS Middleware
 origins = [
     "http://localhost",
@@ -23,9 +37,38 @@ app.add_middleware(
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE"],
-    allow_headers=["*"]
+    allow_headers=["*"],
+    expose_headers=["X-Request-ID"]
 )
 
+
+@app.middleware("http")
+async def llm_trace_middleware(request: Request, call_next):
+    """Collects the LLM calls made while serving a request into a trace keyed by X-Request-ID."""
+    request_id = request.headers.get("X-Request-ID") or uuid4().hex[:12]
+    token = llm_telemetry.start_trace(request_id, f"{request.method} {request.url.path}")
+    try:
+        response = await call_next(request)
+    finally:
+        llm_telemetry.end_trace(token)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+async def _warm_up():
+    warm_up_state["status"] = "running"
+    timings = await asyncio.get_running_loop().run_in_executor(None, get_resource_registry().warm_up)
+    warm_up_state["status"] = "done"
+    print(f"Warm-up finished: {timings}")
+
+
+@app.on_event("startup")
+async def warm_up_resources():
+    if RESOURCE_WARM_UP == "blocking":
+        await _warm_up()
+    elif RESOURCE_WARM_UP == "background":
+        warm_up_state["task"] = asyncio.create_task(_warm_up())
+
+
 app.mount("/outputs", StaticFiles(directory="./outputs"), name="outputs")
 
 app.include_router(resume_matcher_router, prefix="/resume-matcher", tags=["resume_matcher"])
@@ -39,6 +82,39 @@ async def ping():
     return {"message": "pong"}
 
 
+@app.get("/ready")
+async def ready():
+    """Warm-up progress and the state of each lazily built resource."""
+    return {"warm_up": warm_up_state["status"], "resources": get_resource_registry().stats()}
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics (LLM latency, tokens, cost, retries and cache hits per call site)."""
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        # Several workers: aggregate the per-process metric files.
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+@app.get("/traces")
+async def list_traces(limit: int = 50):
+    """Per-request LLM summaries for the most recent requests."""
+    return llm_telemetry.recent_traces(limit)
+
+
+@app.get("/traces/{request_id}")
+async def get_trace(request_id: str):
+    """Every LLM call made while serving one request, in order."""
+    trace = llm_telemetry.get_trace(request_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return trace
+
+
 # TODO : UNCOMMENT FOR DEVELOPMENT ( ONLY COMMENT WHEN DEPLOYING )
 # if __name__ == "__main__":
 #     import uvicorn
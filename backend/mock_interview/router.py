@@ -1,8 +1,11 @@
 import os
 import sys
+import json
 import tempfile
 import base64
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from .models import (
     QuestionGenerateRequest, QuestionGenerateResponse,
     AnalyzeResponseRequest, AnalyzeResponseResponse,
@@ -15,19 +18,20 @@ from mock_interview.audio_processor import AudioProcessor
 from mock_interview.interview_analyzer import InterviewAnalyzer
 from mock_interview.question_generator import QuestionGenerator
 from mock_interview.report_generator import InterviewReportGenerator
+from core.resources import register_resource
 
 router = APIRouter()
 
-# Initialize core components (these can be made dependent if they have state)
-audio_processor = AudioProcessor()
-interview_analyzer = InterviewAnalyzer()
-question_generator = QuestionGenerator()
-report_generator = InterviewReportGenerator()
+# Core components are built on first use (or during warm-up), not at import
+get_audio_processor = register_resource("mock_interview:audio_processor", AudioProcessor)
+get_interview_analyzer = register_resource("mock_interview:analyzer", InterviewAnalyzer)
+get_question_generator = register_resource("mock_interview:question_generator", QuestionGenerator)
+get_report_generator = register_resource("mock_interview:report_generator", InterviewReportGenerator)
 
 @router.post("/generate-questions", response_model=QuestionGenerateResponse)
 async def generate_mock_interview_questions(request: QuestionGenerateRequest):
     try:
-        questions = question_generator.generate_questions(
+        questions = await get_question_generator().agenerate_questions(
             job_description=request.job_description,
             num_questions=request.num_questions,
             question_types=request.question_types
@@ -36,6 +40,22 @@ async def generate_mock_interview_questions(request: QuestionGenerateRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating questions: {str(e)}")
 
+@router.post("/generate-questions/stream")
+async def stream_mock_interview_questions(request: QuestionGenerateRequest):
+    """
+    Same questions as /generate-questions, streamed as NDJSON: one question
+    per line as soon as the LLM has finished writing it.
+    """
+    async def question_lines():
+        async for question in get_question_generator().astream_questions(
+            job_description=request.job_description,
+            num_questions=request.num_questions,
+            question_types=request.question_types
+        ):
+            yield json.dumps(question) + "\n"
+
+    return StreamingResponse(question_lines(), media_type="application/x-ndjson")
+
 @router.post("/analyze-response", response_model=AnalyzeResponseResponse)
 async def analyze_mock_interview_response(request: AnalyzeResponseRequest):
     audio_file_path = None
@@ -51,24 +71,24 @@ async def analyze_mock_interview_response(request: AnalyzeResponseRequest):
             
             # If no transcript provided, generate from audio
             if not transcript:
-                transcript = audio_processor.speech_to_text(audio_bytes)
+                transcript = get_audio_processor().speech_to_text(audio_bytes)
                 if transcript == "Could not understand audio":
                     raise ValueError("Could not process audio: speech unrecognisable.")
             
             if request.include_audio_analysis:
-                audio_features = audio_processor.analyze_audio_features(audio_bytes)
+                audio_features = get_audio_processor().analyze_audio_features(audio_bytes)
         
         if not transcript:
             raise ValueError("No transcript or audio provided for analysis.")
 
-        analysis_result = interview_analyzer.analyze_response(
+        analysis_result = await get_interview_analyzer().aanalyze_response(
             transcript=transcript,
             question=request.question,
             job_description=request.job_description,
             audio_features=audio_features
         )
         
-        feedback = interview_analyzer.generate_feedback(analysis_result)
+        feedback = get_interview_analyzer().generate_feedback(analysis_result)
 
         return AnalyzeResponseResponse(analysis=analysis_result,transcript=transcript, feedback=feedback)
     except ValueError as ve:
@@ -82,11 +102,12 @@ async def analyze_mock_interview_response(request: AnalyzeResponseRequest):
 @router.post("/generate-report", response_model=ReportGenerateResponse)
 async def generate_mock_interview_report(request: ReportGenerateRequest):
     try:
-        report_data = report_generator.generate_comprehensive_report(
+        report_data = await run_in_threadpool(
+            get_report_generator().generate_comprehensive_report,
             interview_session=request.interview_session,
             job_description=request.job_description
         )
-        text_report = report_generator.generate_text_report(report_data)
+        text_report = get_report_generator().generate_text_report(report_data)
         return ReportGenerateResponse(report_data=report_data, text_report=text_report)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating report: {str(e)}")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 class ResumeMatchRequest(BaseModel):
     resume_text: str
@@ -9,3 +9,31 @@ class ResumeMatchResponse(BaseModel):
     match_score: float
     insights: Dict
     output_pdf_path: str
+
+
+class JobDescriptionIn(BaseModel):
+    id: str
+    text: str
+    title: Optional[str] = None
+    company: Optional[str] = None
+    url: Optional[str] = None
+
+class JobIngestRequest(BaseModel):
+    jobs: List[JobDescriptionIn]
+
+class JobIngestResponse(BaseModel):
+    added: int
+    total: int
+
+class RankedJob(BaseModel):
+    jd_id: str
+    score: float
+    title: Optional[str] = None
+    company: Optional[str] = None
+    url: Optional[str] = None
+    insights: Optional[Dict] = None
+
+class RankJobsResponse(BaseModel):
+    results: List[RankedJob]
+    indexed_jobs: int
+    search_ms: float
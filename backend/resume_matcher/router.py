@@ -1,13 +1,21 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from .models import ResumeMatchResponse
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import List
+from .models import ResumeMatchResponse, JobIngestRequest, JobIngestResponse, RankedJob, RankJobsResponse
+import asyncio
 import os
-import shutil
 import sys
 import time
 
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 from workflows.resume_match_pipeline import app as resume_match_pipeline
+from core.resume_artifacts import artifact_for_upload
+from core.vector_index import get_jd_index, embed_tokens, embed_docs
+from core.llm_interface import generate_insights
+from workflows.recruiter_pipeline import rank_resumes_ndjson, RECRUITER_SHORTLIST_SIZE
+from workflows.ats_batch import BatchLimits
 
 router = APIRouter()
 @router.post("/match", response_model=ResumeMatchResponse)
@@ -15,17 +23,22 @@ async def match_resume(
     resume_file: UploadFile = File(...),
     job_description: str = Form(...)
 ):
-    timestamp = int(time.time() * 1000)
-    temp_file_path = f"temp_{timestamp}_{resume_file.filename}"
     try:
-        with open(temp_file_path, "wb") as buffer:
-            shutil.copyfileobj(resume_file.file, buffer)
+        # Text and tokens come from the resume artifact store (keyed by content hash)
+        content = await resume_file.read()
+        artifact = artifact_for_upload(content, resume_file.filename or "resume.pdf")
+        resume_text, resume_tokens = await run_in_threadpool(lambda: (artifact.text, artifact.tokens))
 
-        initial_state = {"resume_path": temp_file_path, "jd_text": job_description}
+        initial_state = {
+            "resume_id": artifact.resume_id,
+            "raw_resume_text": resume_text,
+            "cleaned_resume": resume_tokens,
+            "jd_text": job_description
+        }
         final_state = {}
         
         # FIX: Properly extract state from nested stream output
-        for output in resume_match_pipeline.stream(initial_state):
+        async for output in resume_match_pipeline.astream(initial_state):
             # Each output is like: {"node_name": {actual_state_updates}}
             for node_name, state_updates in output.items():
                 if isinstance(state_updates, dict):
@@ -40,6 +53,103 @@ async def match_resume(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-    finally:
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
\ No newline at end of file
+
+@router.post("/jobs", response_model=JobIngestResponse)
+async def ingest_jobs(payload: JobIngestRequest):
+    """Adds (or replaces, by id) job descriptions in the JD index used by /rank-jobs."""
+    def ingest():
+        # Embed before taking the index lock; the update reloads other workers' changes before saving
+        docs, vectors = embed_docs([job.model_dump(exclude_none=True) for job in payload.jobs])
+        index = get_jd_index()
+        with index.update():
+            index.add_vectors(docs, vectors)
+            return len(docs), len(index)
+
+    added, total = await run_in_threadpool(ingest)
+    return JobIngestResponse(added=added, total=total)
+
+
+@router.delete("/jobs/{jd_id}")
+async def remove_job(jd_id: str):
+    def remove():
+        index = get_jd_index()
+        with index.update():
+            return index.remove([jd_id])
+
+    if not await run_in_threadpool(remove):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"removed": jd_id}
+
+
+@router.get("/jobs/stats")
+async def job_index_stats():
+    return await run_in_threadpool(lambda: get_jd_index().stats())
+
+
+@router.post("/rank-jobs", response_model=RankJobsResponse)
+async def rank_jobs(
+    resume_file: UploadFile = File(...),
+    top_k: int = Form(10),
+    insights_top_n: int = Form(0)
+):
+    """
+    Ranks one resume against every indexed JD: the resume is embedded once and
+    matched with a single FAISS search. LLM insights are generated only for the
+    best `insights_top_n` matches (none by default); no PDF is rendered.
+    """
+    try:
+        content = await resume_file.read()
+        artifact = artifact_for_upload(content, resume_file.filename or "resume.pdf")
+        resume_text, resume_tokens = await run_in_threadpool(lambda: (artifact.text, artifact.tokens))
+
+        start = time.perf_counter()
+        index = await run_in_threadpool(get_jd_index)
+        vector = await run_in_threadpool(embed_tokens, resume_tokens)
+        matches = await run_in_threadpool(index.search, vector, max(1, top_k))
+        search_ms = (time.perf_counter() - start) * 1000
+
+        top = matches[:max(0, insights_top_n)]
+        insights = await asyncio.gather(*[
+            run_in_threadpool(generate_insights, resume_text, match.get("text", ""), match["score"])
+            for match in top
+        ])
+        for match, insight in zip(top, insights):
+            match["insights"] = insight
+
+        return RankJobsResponse(
+            results=[RankedJob(jd_id=match["id"], **{k: v for k, v in match.items() if k not in ("id", "text")})
+                     for match in matches],
+            indexed_jobs=len(index),
+            search_ms=round(search_ms, 2)
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/rank-resumes")
+async def rank_resumes(
+    resume_files: List[UploadFile] = File(...),
+    job_description: str = Form(...),
+    shortlist_size: int = Form(RECRUITER_SHORTLIST_SIZE)
+):
+    """
+    Recruiter mode: ranks many resumes against one JD.
+    Streams NDJSON: one line per resume as soon as it is scored, then the shortlist.
+    """
+    # Upload bytes go straight to the in-memory extractor (cached by content hash), no temp files.
+    # Same caps as /ats-checker/check-batch (ATS_BATCH_MAX_FILES / _FILE_MB / _TOTAL_MB), checked while reading.
+    limits = BatchLimits()
+    uploads = []
+    try:
+        for resume_file in resume_files:
+            name = resume_file.filename or "resume.pdf"
+            uploads.append((name, await run_in_threadpool(limits.read, resume_file.file, name)))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Could not read uploads: {e}")
+    return StreamingResponse(
+        rank_resumes_ndjson(uploads, job_description, shortlist_size=shortlist_size),
+        media_type="application/x-ndjson"
+    )
@@ -0,0 +1,71 @@
+"""
+Benchmark: ATS analysis latency in "prefect" vs "inprocess" execution mode.
+
+Both modes run the same checks on text that is already extracted and
+cleaned, so the difference is orchestration overhead. Also checks that both
+modes return the same result.
+
+    python benchmarks/ats_modes_bench.py --requests 200 --concurrency 8
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.utils import load_resume, clean_text
+from workflows.ats_flow import run_ats_analysis
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def run(mode: str, resume_text: str, resume_tokens: list[str], job_description: str,
+        requests: int, concurrency: int) -> dict:
+    """Runs `requests` analyses from `concurrency` threads; returns latency stats in ms."""
+    def one(_):
+        start = time.perf_counter()
+        run_ats_analysis(job_description=job_description, resume_text=resume_text,
+                         resume_tokens=resume_tokens, mode=mode)
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = sorted(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - start
+    return {
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 3),
+        "throughput_rps": round(requests / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ATS execution mode benchmark")
+    parser.add_argument("--resume", default=os.path.join(PROJECT_ROOT, "data", "raw", "resumes", "Ahmed Raza - AI Engineer.pdf"))
+    parser.add_argument("--jd", default=os.path.join(PROJECT_ROOT, "data", "raw", "job_descriptions", "ai_engineer.txt"))
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    resume_text = load_resume(args.resume)
+    resume_tokens = clean_text(resume_text)
+    with open(args.jd, encoding="utf-8") as f:
+        job_description = f.read()
+
+    results = {mode: run_ats_analysis(job_description=job_description, resume_text=resume_text,
+                                      resume_tokens=resume_tokens, mode=mode)
+               for mode in ("prefect", "inprocess")}
+    report = {"identical_results": results["prefect"] == results["inprocess"]}
+    for mode in ("prefect", "inprocess"):
+        report[mode] = run(mode, resume_text, resume_tokens, job_description, args.requests, args.concurrency)
+    report["p50_speedup"] = round(report["prefect"]["p50_ms"] / max(report["inprocess"]["p50_ms"], 1e-6), 1)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
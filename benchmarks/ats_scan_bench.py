@@ -0,0 +1,130 @@
+"""
+Micro-benchmark: ATS category scoring on the bundled resumes.
+
+Scores with the rule pack directly (no Prefect task overhead), so the numbers
+are the cost of scoring itself: "cold" clears the pack's scan cache before
+every resume (a text seen for the first time, e.g. each keystroke of a live
+editor), "warm" re-scores the same text. "baseline" is the keyword-by-keyword
+checks the default pack replaced (`keyword in text.lower()` and a re.search
+per pattern, on every call), for comparison.
+
+--dictionary-size N also times a copy of the pack whose industry keyword set
+is padded with N synthetic terms, to show the cost of large dictionaries.
+
+    python benchmarks/ats_scan_bench.py --repeat 500
+    python benchmarks/ats_scan_bench.py --rule-pack ai_engineer --dictionary-size 10000
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core import keyword_scanner
+from core.ats_rules import RulePack, load_pack_spec, ATS_RULE_PACK
+from core.utils import load_resume, clean_text
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def baseline_checks(resume_text: str, resume_tokens: list, job_description: str) -> None:
+    """The checks core/ats.py ran before the rule pack (results discarded; timing only)."""
+    lower = resume_text.lower
+    sum(1 for s in ['experience', 'education', 'skills', 'summary', 'objective'] if s in lower())
+    any(re.search(p, lower()) for p in [r'<table>', r'<img>', r'<graphic>', r'<image>',
+                                         r'columns?', r'table', r'graphic', r'image'])
+    any(re.search(p, lower()) for p in [r'arial', r'times', r'calibri', r'helvetica']) or re.search(r'font', lower())
+
+    sum(1 for k in ['python', 'machine learning', 'ai', 'data analysis', 'sql', 'javascript', 'react',
+                    'node', 'api', 'database', 'cloud', 'aws', 'azure', 'docker', 'kubernetes', 'git',
+                    'agile'] if k in lower())
+    sum(1 for v in ['developed', 'implemented', 'managed', 'led', 'created', 'designed', 'built',
+                    'optimized', 'improved', 'delivered'] if v in lower())
+    if job_description:
+        len(set(resume_tokens) & set(clean_text(job_description)))
+
+    sum(1 for p in [r'@\w+\.\w+', r'\(\d{3}\)\s*\d{3}-\d{4}', r'\d{3}-\d{3}-\d{4}', r'linkedin\.com',
+                    r'github\.com'] if re.search(p, lower()))
+    for keywords in (['summary', 'profile', 'objective', 'about'],
+                     ['experience', 'employment', 'work history', 'career'],
+                     ['education', 'degree', 'university', 'college', 'bachelor', 'master'],
+                     ['skills', 'technical skills', 'competencies', 'expertise']):
+        any(k in lower() for k in keywords)
+
+    sum(1 for p in [r'\d+%', r'\$\d+', r'\d+x', r'\d+\+', r'\d+ years?', r'increased by \d+',
+                    r'reduced by \d+', r'improved by \d+'] if re.search(p, lower()))
+    len([line.strip() for line in resume_text.split('\n') if line.strip()])
+    sum(1 for k in ['achieved', 'developed', 'implemented', 'managed', 'led'] if k in lower())
+
+
+def time_baseline(samples: list, job_description: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text, tokens in samples:
+            baseline_checks(text, tokens, job_description)
+    return round((time.perf_counter() - start) / (repeat * len(samples)) * 1000, 3)
+
+
+def padded_pack(name: str, size: int) -> RulePack:
+    """`name` with `size` synthetic terms added to its industry keyword set."""
+    spec = load_pack_spec(name)
+    keywords = spec["keyword_sets"]["industry_keywords"]
+    if isinstance(keywords, list):
+        keywords = {term: [] for term in keywords}
+    keywords.update({f"skill{i:06d} tool": [f"skl{i:06d}"] for i in range(size)})
+    spec["keyword_sets"]["industry_keywords"] = keywords
+    return RulePack(spec)
+
+
+def time_pack(pack: RulePack, samples: list, job_description: str, repeat: int) -> dict:
+    results = {"terms": len(pack)}
+    for mode in ("cold", "warm"):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for text, tokens in samples:
+                if mode == "cold":
+                    pack.clear_scan_cache()
+                pack.evaluate(text, tokens, job_description)
+        elapsed = (time.perf_counter() - start) / (repeat * len(samples))
+        results[f"{mode}_ms_per_resume"] = round(elapsed * 1000, 3)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ATS scoring micro-benchmark")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--rule-pack", default=ATS_RULE_PACK)
+    parser.add_argument("--dictionary-size", type=int, default=0,
+                        help="Also time the pack with this many extra industry keywords")
+    args = parser.parse_args()
+
+    resume_dir = os.path.join(PROJECT_ROOT, "data", "raw", "resumes")
+    resumes = [load_resume(os.path.join(resume_dir, name))
+               for name in sorted(os.listdir(resume_dir)) if name.endswith(".pdf")]
+    with open(os.path.join(PROJECT_ROOT, "data", "raw", "job_descriptions", "ai_engineer.txt"), encoding="utf-8") as f:
+        job_description = f.read()
+    samples = [(text, clean_text(text)) for text in resumes]
+
+    results = {
+        "resumes": len(samples),
+        "avg_chars": sum(len(t) for t, _ in samples) // max(1, len(samples)),
+        "scanner": "pyahocorasick" if keyword_scanner.ahocorasick is not None else "regex",
+        "baseline_ms_per_resume": time_baseline(samples, job_description, args.repeat),
+    }
+    results[args.rule_pack] = time_pack(RulePack(load_pack_spec(args.rule_pack)), samples, job_description, args.repeat)
+    if args.dictionary_size:
+        start = time.perf_counter()
+        pack = padded_pack(args.rule_pack, args.dictionary_size)
+        compile_ms = round((time.perf_counter() - start) * 1000, 1)
+        results[f"{args.rule_pack}+{args.dictionary_size}"] = dict(
+            time_pack(pack, samples, job_description, args.repeat), compile_ms=compile_ms
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
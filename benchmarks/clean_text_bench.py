@@ -0,0 +1,96 @@
+"""
+Micro-benchmark: the original per-call clean_text vs TextPreprocessor.
+
+The original rebuilt the stopword set and the lemmatizer on every call and
+ran two regex passes plus NLTK tokenization over the whole text. Also checks
+that both produce identical tokens.
+
+    python benchmarks/clean_text_bench.py --repeat 200
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import string
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import nltk
+from nltk.corpus import stopwords
+from nltk.stem import WordNetLemmatizer
+
+from core.utils import TextPreprocessor, load_resume
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def legacy_clean_text(text: str) -> list[str]:
+    """core.utils.clean_text before TextPreprocessor."""
+    text = text.lower()
+    text = re.sub(f'[{re.escape(string.punctuation)}]', '', text)
+    text = re.sub(r'\d+', '', text)
+    tokens = nltk.word_tokenize(text)
+    stop_words = set(stopwords.words('english'))
+    tokens = [word for word in tokens if word not in stop_words]
+    lemmatizer = WordNetLemmatizer()
+    return [lemmatizer.lemmatize(word) for word in tokens]
+
+
+def sample_texts() -> list[str]:
+    """The bundled resumes and JD."""
+    texts = []
+    resume_dir = os.path.join(PROJECT_ROOT, "data", "raw", "resumes")
+    for name in sorted(os.listdir(resume_dir)):
+        if name.endswith(".pdf"):
+            texts.append(load_resume(os.path.join(resume_dir, name)))
+    jd_dir = os.path.join(PROJECT_ROOT, "data", "raw", "job_descriptions")
+    for name in sorted(os.listdir(jd_dir)):
+        with open(os.path.join(jd_dir, name), encoding="utf-8") as f:
+            texts.append(f.read())
+    return texts
+
+
+def timed(fn, texts: list[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - start) / (repeat * len(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="clean_text micro-benchmark")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--batch", type=int, default=512, help="Texts in the clean_many batch")
+    args = parser.parse_args()
+
+    texts = sample_texts()
+    preprocessor = TextPreprocessor()
+    mismatches = [i for i, text in enumerate(texts) if legacy_clean_text(text) != preprocessor.clean(text)]
+
+    batch = (texts * (args.batch // len(texts) + 1))[:args.batch]
+    start = time.perf_counter()
+    preprocessor.clean_many(batch, workers=1)
+    serial = time.perf_counter() - start
+    start = time.perf_counter()
+    preprocessor.clean_many(batch)
+    parallel = time.perf_counter() - start
+
+    legacy = timed(legacy_clean_text, texts, args.repeat)
+    cached = timed(preprocessor.clean, texts, args.repeat)
+    print(json.dumps({
+        "texts": len(texts),
+        "identical_output": not mismatches,
+        "legacy_ms_per_text": round(legacy * 1000, 3),
+        "preprocessor_ms_per_text": round(cached * 1000, 3),
+        "speedup": round(legacy / cached, 1),
+        f"clean_many_{args.batch}_serial_s": round(serial, 3),
+        f"clean_many_{args.batch}_process_pool_s": round(parallel, 3),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
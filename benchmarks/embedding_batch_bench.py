@@ -0,0 +1,68 @@
+"""
+Throughput benchmark: one MiniLM forward pass per request vs the micro-batcher.
+
+Simulates /resume-matcher/match traffic: every request embeds a distinct
+resume-sized text plus a JD, from `--concurrency` threads at once.
+
+    python benchmarks/embedding_batch_bench.py --requests 200 --concurrency 16
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+RESUME = "Python engineer with FastAPI, LangChain and FAISS experience building RAG services. " * 12
+JD = "We are hiring a backend engineer to build LLM-powered features in Python. " * 8
+
+
+def run(embed, requests: int, concurrency: int) -> dict:
+    latencies = []
+
+    def one(i: int):
+        start = time.perf_counter()
+        embed([f"{RESUME} Candidate {i}.", JD])
+        latencies.append(time.perf_counter() - start)
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - wall_start
+    return {
+        "throughput_rps": round(requests / wall, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "max_ms": round(max(latencies) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding micro-batching benchmark")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5)
+    args = parser.parse_args()
+
+    from core.embedding import get_embeddings
+    from core.embedding_batcher import EmbeddingBatcher
+
+    model = get_embeddings()
+    model.embed_documents([JD])  # load weights before timing
+
+    batcher = EmbeddingBatcher(model.embed_documents, args.max_batch_size, args.max_wait_ms, name="bench")
+    results = {
+        "unbatched": run(model.embed_documents, args.requests, args.concurrency),
+        "batched": run(batcher.embed, args.requests, args.concurrency),
+        "batcher_stats": batcher.stats(),
+    }
+    batcher.close()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,486 @@
+"""
+Offline Groq-compatible stand-in LLM server.
+
+Speaks the OpenAI/Groq chat-completions protocol (`POST /openai/v1/chat/completions`,
+streaming and non-streaming) and answers with canned responses shaped like
+the ones each ARIA prompt expects: resume insights, interview questions,
+response analyses, website plans, section content, JSX components, CSS and
+plain-text reports. Latency is simulated as time-to-first-token drawn from a
+configurable distribution plus generation time at a fixed tokens/sec.
+
+Usage:
+    python benchmarks/groq_stub_server.py --port 8001 --ttft-ms 300 --tokens-per-sec 400
+
+Then point every pipeline at it:
+    GROQ_BASE_URL=http://localhost:8001 uvicorn main:app
+
+The random generator is seeded (--seed), so a run with the same request
+sequence produces the same latencies.
+"""
+
+import re
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass
+class StubConfig:
+    """Latency / throughput knobs for the stub."""
+    distribution: str = "lognormal"   # fixed | uniform | normal | lognormal | exponential
+    ttft_ms: float = 300.0            # median (or mean for exponential) time to first token
+    jitter: float = 0.35              # sigma for lognormal, fraction of ttft for uniform/normal
+    tokens_per_sec: float = 400.0     # 0 disables generation delay
+    error_rate: float = 0.0           # fraction of requests answered with 429
+    seed: int = 0
+
+
+class LatencyModel:
+    """Seeded sampler for time-to-first-token and per-token delay."""
+
+    def __init__(self, config: StubConfig):
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+
+    def ttft_seconds(self) -> float:
+        c = self.config
+        with self._lock:
+            if c.distribution == "fixed":
+                ms = c.ttft_ms
+            elif c.distribution == "uniform":
+                ms = self._rng.uniform(c.ttft_ms * (1 - c.jitter), c.ttft_ms * (1 + c.jitter))
+            elif c.distribution == "normal":
+                ms = self._rng.gauss(c.ttft_ms, c.ttft_ms * c.jitter)
+            elif c.distribution == "exponential":
+                ms = self._rng.expovariate(1.0 / c.ttft_ms)
+            else:
+                ms = c.ttft_ms * math.exp(self._rng.gauss(0.0, c.jitter))
+        return max(ms, 0.0) / 1000.0
+
+    def per_token_seconds(self) -> float:
+        return 1.0 / self.config.tokens_per_sec if self.config.tokens_per_sec > 0 else 0.0
+
+    def should_fail(self) -> bool:
+        if self.config.error_rate <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < self.config.error_rate
+
+
+def count_tokens(text: str) -> int:
+    """Same ~4 chars/token heuristic the gateway uses for budgeting."""
+    return max(1, len(text) // 4)
+
+
+def _json_block(payload) -> str:
+    return "```json\n" + json.dumps(payload, indent=2) + "\n```"
+
+
+# ---------- canned responses ----------
+
+def _insights(prompt: str) -> str:
+    return _json_block({
+        "missing_skills": "Kubernetes, Terraform and production experience with vector databases.",
+        "improvements": "Quantify impact in each role and mirror the job description's terminology.",
+        "strengths": "Strong Python and LLM application background with shipped RAG systems.",
+        "weaknesses": "Limited evidence of cloud infrastructure ownership.",
+        "suggestions": "Add a deployed portfolio project and prepare system design stories.",
+    })
+
+
+def _questions(prompt: str) -> str:
+    match = re.search(r"Generate exactly (\d+) questions", prompt)
+    n = int(match.group(1)) if match else 5
+    kinds = ["technical", "behavioral", "general", "situational"]
+    return _json_block([
+        {
+            "question": f"Stub question {i + 1}: describe a project relevant to this role.",
+            "type": kinds[i % len(kinds)],
+            "difficulty": ["easy", "medium", "hard"][i % 3],
+            "focus_area": "Role-specific experience",
+            "ideal_answer_keywords": ["project", "impact", "trade-offs"],
+        }
+        for i in range(n)
+    ])
+
+
+def _analysis(prompt: str) -> str:
+    metric = lambda score, details: {"score": score, "details": details}
+    return _json_block({
+        "clarity": metric(0.78, "Clear structure with a concrete example."),
+        "confidence": metric(0.72, "Steady delivery with few hedges."),
+        "fluency": metric(0.8, "Few filler words."),
+        "relevance": metric(0.75, "Addresses the question directly."),
+        "sentiment": metric(0.7, "positive"),
+        "keyword_match": metric(0.65, "Mentions most of the expected keywords."),
+    })
+
+
+def _mock_qas(prompt: str) -> str:
+    match = re.search(r"Number: (\d+)", prompt)
+    n = int(match.group(1)) if match else 2
+    fields = dict(re.findall(r"^(Domain|Topic|Difficulty): (.+)$", prompt, re.MULTILINE))
+    return json.dumps([
+        {
+            "id": f"q{i + 1}",
+            "domain": fields.get("Domain", "General"),
+            "topic": fields.get("Topic", "General"),
+            "difficulty": fields.get("Difficulty", "Medium"),
+            "question": f"Stub question {i + 1} about {fields.get('Topic', 'the topic')}?",
+            "answer": "A concise, technically accurate stub answer.",
+        }
+        for i in range(n)
+    ])
+
+
+def _resume_data(prompt: str) -> str:
+    return _json_block({
+        "name": "Jordan Stub",
+        "email": "jordan@example.com",
+        "phone": None,
+        "linkedin": "https://linkedin.com/in/jordanstub",
+        "github": "https://github.com/jordanstub",
+        "website": None,
+        "summary": "AI engineer building LLM-powered products.",
+        "skills": ["Python", "FastAPI", "LangChain", "React", "Docker"],
+        "projects": [{
+            "title": "Resume Analyzer",
+            "description": "Multi-agent resume analysis platform.",
+            "technologies": ["Python", "LangGraph"],
+            "link": None,
+            "github_link": "https://github.com/jordanstub/resume-analyzer",
+        }],
+        "experience": [{
+            "company": "Acme AI",
+            "role": "AI Engineer",
+            "duration": "Jan 2023 - Present",
+            "description": "Builds retrieval-augmented assistants.",
+            "highlights": ["Cut inference cost by 40%"],
+        }],
+        "education": [{
+            "institution": "State University",
+            "degree": "B.Sc.",
+            "field": "Computer Science",
+            "year": "2022",
+            "gpa": None,
+        }],
+        "certifications": [],
+        "languages": ["English"],
+        "interests": ["Open source"],
+    })
+
+
+def _website_plan(prompt: str) -> str:
+    return _json_block({
+        "style": "modern",
+        "color_scheme": {
+            "primary": "#6366f1",
+            "secondary": "#8b5cf6",
+            "accent": "#22d3ee",
+            "background": "#0f172a",
+            "text": "#e2e8f0",
+        },
+        "sections": ["hero", "about", "skills", "projects", "experience", "contact"],
+        "layout": "single_page",
+        "use_animations": True,
+        "animation_library": "framer-motion",
+        "tech_stack": ["react", "tailwind", "framer-motion"],
+        "font_family": "Inter",
+        "dark_mode": True,
+        "navigation_style": "sticky",
+        "design_rationale": "Stub plan for load testing.",
+    })
+
+
+SECTION_CONTENT = {
+    "hero": {
+        "headline": "AI Engineer",
+        "tagline": "I build LLM-powered products.",
+        "cta_primary": {"text": "View My Work", "target_section": "projects"},
+        "cta_secondary": {"text": "Download Resume", "action": "download_resume"},
+        "greeting": "Hi, I'm",
+        "background_style": "gradient",
+        "show_social_links": True,
+        "typing_animation_texts": ["Engineer", "Builder"],
+    },
+    "about": {
+        "title": "About Me",
+        "bio_paragraphs": ["I build retrieval-augmented assistants.", "I care about latency."],
+        "key_facts": [{"icon": "briefcase", "label": "Experience", "value": "3+ Years"}],
+        "profile_image_placeholder": True,
+        "layout": "text-left",
+    },
+    "skills": {
+        "title": "Tech Stack",
+        "subtitle": "Tools I use every day",
+        "categories": [{"name": "Backend", "skills": [{"name": "Python", "proficiency": 90, "icon": "python"}]}],
+        "display_style": "cards",
+        "show_proficiency": True,
+        "featured_skills": ["Python", "LangChain", "React"],
+    },
+    "projects": {
+        "title": "Featured Projects",
+        "subtitle": "Things I've shipped",
+        "projects": [{
+            "title": "Resume Analyzer",
+            "description": "Multi-agent resume analysis platform.",
+            "technologies": ["Python", "LangGraph"],
+            "image_placeholder": "project-1",
+            "links": {"live": None, "github": None},
+            "featured": True,
+            "category": "AI/ML",
+        }],
+        "layout": "grid",
+        "show_filters": False,
+        "filter_categories": ["All"],
+    },
+    "experience": {
+        "title": "Experience",
+        "subtitle": "Where I've worked",
+        "experiences": [{
+            "company": "Acme AI",
+            "role": "AI Engineer",
+            "duration": "Jan 2023 - Present",
+            "location": "Remote",
+            "description": "Builds retrieval-augmented assistants.",
+            "highlights": ["Cut inference cost by 40%"],
+            "technologies": ["Python"],
+            "logo_placeholder": "company-1",
+        }],
+        "layout": "timeline",
+        "show_company_logos": False,
+    },
+    "contact": {
+        "title": "Get In Touch",
+        "subtitle": "My inbox is open.",
+        "cta_message": "Say hello",
+        "show_form": True,
+        "form_fields": ["name", "email", "message"],
+        "contact_info": {"email": "jordan@example.com", "phone": None, "location": None},
+        "social_links": [{"platform": "github", "url": "https://github.com/jordanstub"}],
+        "availability_status": "Available for opportunities",
+    },
+}
+
+
+def _section(name: str) -> Callable[[str], str]:
+    return lambda prompt: _json_block(SECTION_CONTENT[name])
+
+
+def _validation(prompt: str) -> str:
+    return _json_block({"is_valid": True, "errors": []})
+
+
+def _jsx(prompt: str) -> str:
+    match = re.search(r"export default (\w+);", prompt)
+    name = match.group(1) if match else "Section"
+    return (
+        "```jsx\n"
+        "import React from 'react';\n\n"
+        f"const {name} = () => {{\n"
+        "  return (\n"
+        f"    <section id='{name.lower()}' className='py-20 px-6'>\n"
+        f"      <h2 className='text-3xl font-bold'>{name}</h2>\n"
+        "    </section>\n"
+        "  );\n"
+        "};\n\n"
+        f"export default {name};\n"
+        "```"
+    )
+
+
+def _css(prompt: str) -> str:
+    return (
+        "/* Stub utilities */\n"
+        "@keyframes fade-in { from { opacity: 0; } to { opacity: 1; } }\n"
+        ".animate-fade-in { animation: fade-in 0.6s ease-out both; }\n"
+        ".glass { background: rgba(255, 255, 255, 0.08); backdrop-filter: blur(12px); }\n"
+    )
+
+
+def _tailored_cv(prompt: str) -> str:
+    return (
+        "**Jordan Stub | AI Engineer**\n\n"
+        "**CONTACT INFORMATION**\nEmail: jordan@example.com\n---\n\n"
+        "**SUMMARY**\nAI engineer who shipped RAG assistants serving **10,000+ users**.\n---\n\n"
+        "**WORK EXPERIENCE**\n\nAI Engineer | Acme AI | Jan 2023 - Present\n"
+        "* Reduced inference cost by **40%** through response caching.\n---\n"
+    )
+
+
+def _standalone_question(prompt: str) -> str:
+    lines = [line for line in prompt.splitlines() if line.strip()]
+    return lines[-1].split(":", 1)[-1].strip() if lines else "What is RAG?"
+
+
+def _generic(prompt: str) -> str:
+    return (
+        "This is a canned answer from the offline stub server. It has a realistic "
+        "length so that streaming and token accounting behave like the real API."
+    )
+
+
+# (substring, responder) - first match wins, checked against the whole conversation
+RESPONDERS: List[Tuple[str, Callable[[str], str]]] = [
+    ("classify the user's intent", lambda prompt: "rag_query"),
+    ("formulate a standalone question", _standalone_question),
+    ("<JD_TEXT>", _insights),
+    ("interview questions based on the following job description", _questions),
+    ("expert interview evaluator", _analysis),
+    ("mock interview questions (with answers)", _mock_qas),
+    ("expert resume parser", _resume_data),
+    ("portfolio strategist", _website_plan),
+    ("hero section content", _section("hero")),
+    ('"About Me" section', _section("about")),
+    ("skills section for a portfolio", _section("skills")),
+    ("projects showcase section", _section("projects")),
+    ("experience/timeline section", _section("experience")),
+    ("contact section for a portfolio", _section("contact")),
+    ("code quality expert", _validation),
+    ("custom CSS utilities", _css),
+    ("Executive Resume Editor", _tailored_cv),
+    ("Generate a React", _jsx),
+    ("Generate the main App.jsx", _jsx),
+    ("code repair expert", _jsx),
+]
+
+
+def canned_response(prompt: str) -> str:
+    for marker, responder in RESPONDERS:
+        if marker in prompt:
+            return responder(prompt)
+    return _generic(prompt)
+
+
+def _prompt_text(messages: List[Dict]) -> str:
+    parts = []
+    for message in messages:
+        content = message.get("content") or ""
+        if isinstance(content, list):
+            content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+        parts.append(f"{message.get('role', 'user')}: {content}")
+    return "\n".join(parts)
+
+
+def _chunks(text: str) -> List[str]:
+    """Splits text into roughly token-sized pieces, keeping whitespace."""
+    return re.findall(r"\s*\S{1,4}", text) or [text]
+
+
+# ---------- app ----------
+
+def create_app(config: Optional[StubConfig] = None) -> FastAPI:
+    config = config or StubConfig()
+    latency = LatencyModel(config)
+    app = FastAPI(title="Groq stub")
+    app.state.stats = {"requests": 0, "streamed": 0, "rate_limited": 0}
+
+    @app.get("/openai/v1/models")
+    async def list_models():
+        models = ["llama-3.1-8b-instant", "llama-3.3-70b-versatile", "openai/gpt-oss-120b"]
+        return {"object": "list", "data": [{"id": m, "object": "model", "owned_by": "stub"} for m in models]}
+
+    @app.get("/stats")
+    async def stats():
+        return app.state.stats
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.stats["requests"] += 1
+        model = body.get("model", "stub")
+
+        if latency.should_fail():
+            app.state.stats["rate_limited"] += 1
+            return JSONResponse(
+                status_code=429,
+                headers={"retry-after": "1"},
+                content={"error": {"message": "Rate limit reached (stub)", "type": "requests", "code": "rate_limit_exceeded"}},
+            )
+
+        prompt = _prompt_text(body.get("messages", []))
+        text = canned_response(prompt)
+        max_tokens = body.get("max_tokens") or body.get("max_completion_tokens")
+        if max_tokens:
+            text = text[: int(max_tokens) * 4]
+        prompt_tokens, completion_tokens = count_tokens(prompt), count_tokens(text)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        completion_id = f"chatcmpl-stub-{app.state.stats['requests']}"
+        created = int(time.time())
+        ttft = latency.ttft_seconds()
+
+        if body.get("stream"):
+            app.state.stats["streamed"] += 1
+            pieces = _chunks(text)
+            delay = latency.per_token_seconds() * completion_tokens / len(pieces)
+
+            async def event_stream():
+                await asyncio.sleep(ttft)
+                base = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model}
+                first = dict(base, choices=[{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}])
+                yield f"data: {json.dumps(first)}\n\n"
+                for piece in pieces:
+                    if delay:
+                        await asyncio.sleep(delay)
+                    chunk = dict(base, choices=[{"index": 0, "delta": {"content": piece}, "finish_reason": None}])
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                last = dict(base, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}], x_groq={"usage": usage})
+                yield f"data: {json.dumps(last)}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+        await asyncio.sleep(ttft + latency.per_token_seconds() * completion_tokens)
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": usage,
+        }
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline Groq-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--distribution", default="lognormal",
+                        choices=["fixed", "uniform", "normal", "lognormal", "exponential"])
+    parser.add_argument("--ttft-ms", type=float, default=300.0, help="Median time to first token")
+    parser.add_argument("--jitter", type=float, default=0.35, help="Spread of the latency distribution")
+    parser.add_argument("--tokens-per-sec", type=float, default=400.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = StubConfig(
+        distribution=args.distribution,
+        ttft_ms=args.ttft_ms,
+        jitter=args.jitter,
+        tokens_per_sec=args.tokens_per_sec,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Load test for the LLM gateway against a Groq-compatible endpoint.
+
+Fires concurrent requests through core.llm_gateway and reports throughput
+and latency percentiles. Intended to run against the offline stub:
+
+    python benchmarks/groq_stub_server.py --port 8001 &
+    python benchmarks/llm_load_test.py --base-url http://localhost:8001 --requests 200 --concurrency 32
+
+Every prompt is unique and the response cache is disabled, so each request
+really reaches the server. Pass --unthrottled to lift the gateway's
+per-model rate limits and measure raw throughput.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+PROMPT_KINDS = {
+    "questions": "Generate 5 relevant interview questions based on the following job description.\n"
+                 "Job Description:\nBackend engineer, Python. Request {i}\n"
+                 "Generate exactly 5 questions that are highly relevant to this specific job description.",
+    "analysis": "You are an expert interview evaluator. Analyze the following response.\n"
+                "Candidate Response: I led the migration to FastAPI. Request {i}",
+    "plan": "You are an expert web designer and portfolio strategist. Request {i}",
+    "chat": "Explain the difference between a process and a thread. Request {i}",
+}
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def run(args) -> dict:
+    from core.llm_gateway import get_chat_model, ainvoke_llm
+
+    llm = get_chat_model(args.model)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies, errors = [], 0
+
+    async def one(i: int):
+        nonlocal errors
+        prompt = PROMPT_KINDS[args.kind].format(i=i)
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await ainvoke_llm(llm, prompt)
+                latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                errors += 1
+                if errors <= 3:
+                    print(f"Request {i} failed: {e}")
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    wall = time.perf_counter() - wall_start
+
+    if not latencies:
+        return {"requests": args.requests, "errors": errors}
+    return {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "errors": errors,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 2),
+        "latency_ms": {
+            "mean": round(statistics.mean(latencies) * 1000, 1),
+            "p50": round(percentile(latencies, 50) * 1000, 1),
+            "p95": round(percentile(latencies, 95) * 1000, 1),
+            "p99": round(percentile(latencies, 99) * 1000, 1),
+            "max": round(max(latencies) * 1000, 1),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM gateway load test")
+    parser.add_argument("--base-url", default=os.environ.get("GROQ_BASE_URL", "http://localhost:8001"))
+    parser.add_argument("--model", default="llama-3.1-8b-instant")
+    parser.add_argument("--kind", default="questions", choices=sorted(PROMPT_KINDS))
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--unthrottled", action="store_true", help="Lift the gateway's per-model rate limits")
+    args = parser.parse_args()
+
+    # Must be set before core.llm_gateway is imported.
+    os.environ["GROQ_BASE_URL"] = args.base_url
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+    if args.unthrottled:
+        os.environ["LLM_GATEWAY_LIMITS"] = json.dumps(
+            {args.model: {"concurrency": args.concurrency, "rpm": 10**6, "tpm": 10**9, "burst": args.concurrency}}
+        )
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
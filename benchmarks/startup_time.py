@@ -0,0 +1,85 @@
+"""
+Startup-time benchmark for the FastAPI backend.
+
+Each run starts a fresh interpreter in backend/ (like a Render cold start or
+a new autoscaled worker) and measures:
+- import: `import main` (all routers), which should do no model loading,
+- warm-up: building every registered lazy resource (LLM clients, NLTK data,
+  MiniLM, FAISS/BM25 and the interview-prep chain), per resource.
+
+Usage:
+    python benchmarks/startup_time.py --runs 5
+    python benchmarks/startup_time.py --runs 3 --no-warm-up
+
+Use --base-url to point the LLM clients at the offline stub so no API key is needed.
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BACKEND_DIR = os.path.join(PROJECT_ROOT, "backend")
+
+# Runs inside the child interpreter
+CHILD_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import main
+result = {"import_seconds": time.perf_counter() - start}
+if "--warm-up" in sys.argv:
+    from core.resources import get_resource_registry
+    start = time.perf_counter()
+    result["resources"] = get_resource_registry().warm_up()
+    result["warm_up_seconds"] = time.perf_counter() - start
+print("STARTUP_RESULT " + json.dumps(result))
+"""
+
+
+def run_once(warm_up: bool, env: dict) -> dict:
+    args = [sys.executable, "-c", CHILD_SCRIPT] + (["--warm-up"] if warm_up else [])
+    proc = subprocess.run(args, cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    for line in proc.stdout.splitlines():
+        if line.startswith("STARTUP_RESULT "):
+            return json.loads(line[len("STARTUP_RESULT "):])
+    raise RuntimeError(f"Startup run failed:\n{proc.stderr[-2000:]}")
+
+
+def summarize(runs: list) -> dict:
+    def ms(values):
+        values = [v for v in values if v is not None]
+        return round(statistics.median(values) * 1000, 1) if values else None
+
+    summary = {
+        "runs": len(runs),
+        "import_ms": {"median": ms([r["import_seconds"] for r in runs]),
+                      "max": round(max(r["import_seconds"] for r in runs) * 1000, 1)},
+    }
+    if "warm_up_seconds" in runs[0]:
+        summary["warm_up_ms"] = {"median": ms([r["warm_up_seconds"] for r in runs])}
+        names = sorted({name for r in runs for name in r["resources"]})
+        summary["resource_init_ms"] = {name: ms([r["resources"].get(name) for r in runs]) for name in names}
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backend cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--no-warm-up", action="store_true", help="Only measure the import")
+    parser.add_argument("--base-url", default=os.environ.get("GROQ_BASE_URL"),
+                        help="Groq-compatible endpoint, e.g. the offline stub")
+    args = parser.parse_args()
+
+    env = dict(os.environ, RESOURCE_WARM_UP="off")
+    if args.base_url:
+        env["GROQ_BASE_URL"] = args.base_url
+
+    runs = [run_once(not args.no_warm_up, env) for _ in range(args.runs)]
+    print(json.dumps(summarize(runs), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Shared core services for ARIA: document processing, embeddings and LLM access."""
@@ -1,60 +1,26 @@
-import re
 import math
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from matplotlib.patches import Circle, Wedge
 import numpy as np
 from core.utils import load_resume, clean_text
+from core.ats_rules import get_rule_pack
 from prefect import task
 class ATSAnalyzer:
     """
     ATS (Applicant Tracking System) Score Calculator
-    Analyzes resume compatibility with ATS systems and provides a score
+    Analyzes resume compatibility with ATS systems and provides a score.
+    The criteria come from a rule pack (core/ats_rules); the four category
+    checks below are the categories of the default pack.
+    
+    Args:
+        rule_pack: Rule pack name or path (default: ATS_RULE_PACK)
     """
     
-    def __init__(self):
-        self.ats_criteria = {
-            'format_compatibility': {
-                'weight': 0.25,
-                'checks': [
-                    'has_standard_sections',
-                    'no_tables_or_columns',
-                    'no_graphics_or_images',
-                    'standard_fonts',
-                    'proper_file_format'
-                ]
-            },
-            'keyword_optimization': {
-                'weight': 0.30,
-                'checks': [
-                    'relevant_keywords',
-                    'industry_terms',
-                    'skill_keywords',
-                    'action_verbs'
-                ]
-            },
-            'structure_quality': {
-                'weight': 0.25,
-                'checks': [
-                    'clear_contact_info',
-                    'professional_summary',
-                    'work_experience_format',
-                    'education_section',
-                    'skills_section'
-                ]
-            },
-            'content_quality': {
-                'weight': 0.20,
-                'checks': [
-                    'quantified_achievements',
-                    'consistent_formatting',
-                    'no_grammar_errors',
-                    'appropriate_length',
-                    'professional_tone'
-                ]
-            }
-        }
+    def __init__(self, rule_pack: Optional[str] = None):
+        self.rule_pack = get_rule_pack(rule_pack)
+        self.ats_criteria = self.rule_pack.ats_criteria
     
     def calculate_ats_score(self, resume_path: str, job_description: str = None) -> Dict:
         """
@@ -75,11 +41,10 @@ class ATSAnalyzer:
             # Calculate scores for each category
             scores = {}
             total_score = 0
+            category_scores = self.score_categories(resume_text, resume_tokens, job_description)
             
             for category, config in self.ats_criteria.items():
-                category_score = self._calculate_category_score(
-                    category, resume_text, resume_tokens, job_description
-                )
+                category_score = category_scores[category]
                 scores[category] = {
                     'score': category_score,
                     'weight': config['weight'],
@@ -88,7 +53,7 @@ class ATSAnalyzer:
                 total_score += scores[category]['weighted_score']
             
             # Generate recommendations
-            recommendations = self._generate_recommendations(scores, resume_text)
+            recommendations = self.rule_pack.recommendations(category_scores)
             
             return {
                 'overall_score': round(total_score * 100, 1),
@@ -105,200 +70,42 @@ class ATSAnalyzer:
                 'recommendations': ['Error processing resume. Please check file format.']
             }
     
-    def _calculate_category_score(self, category: str, resume_text: str, 
-                                resume_tokens: List[str], job_description: str = None) -> float:
-        """Calculate score for a specific ATS category"""
-        
-        if category == 'format_compatibility':
-            return self._check_format_compatibility(resume_text)
-        elif category == 'keyword_optimization':
-            return self._check_keyword_optimization(resume_text, resume_tokens, job_description)
-        elif category == 'structure_quality':
-            return self._check_structure_quality(resume_text)
-        elif category == 'content_quality':
-            return self._check_content_quality(resume_text, resume_tokens)
-        
-        return 0.0
+    def score_categories(self, resume_text: str, resume_tokens: List[str] = None,
+                         job_description: str = None, jd_tokens: List[str] = None) -> Dict[str, float]:
+        """Score every category of the rule pack in one step"""
+        return self.rule_pack.evaluate(resume_text, resume_tokens, job_description, jd_tokens)
+    
+    @task
+    def check_category(self, category: str, resume_text: str, resume_tokens: List[str] = None,
+                       job_description: str = None, jd_tokens: List[str] = None) -> float:
+        """Score one category of the rule pack"""
+        return self.rule_pack.evaluate(resume_text, resume_tokens, job_description, jd_tokens,
+                                       categories=[category])[category]
     @task
     def check_format_compatibility(self, resume_text: str) -> float:
         """Check resume format compatibility with ATS systems"""
-        score = 0.0
-        checks = 0
-        
-        # Check for standard sections
-        standard_sections = ['experience', 'education', 'skills', 'summary', 'objective']
-        found_sections = sum(1 for section in standard_sections 
-                           if section.lower() in resume_text.lower())
-        score += (found_sections / len(standard_sections)) * 0.3
-        checks += 1
-        
-        # Check for problematic elements
-        problematic_patterns = [
-            r'<table>', r'<img>', r'<graphic>', r'<image>',
-            r'columns?', r'table', r'graphic', r'image'
-        ]
-        
-        has_problematic = any(re.search(pattern, resume_text.lower()) 
-                            for pattern in problematic_patterns)
-        if not has_problematic:
-            score += 0.3
-        checks += 1
-        
-        # Check for standard fonts (basic check)
-        font_patterns = [r'arial', r'times', r'calibri', r'helvetica']
-        has_standard_font = any(re.search(pattern, resume_text.lower()) 
-                              for pattern in font_patterns)
-        if has_standard_font or not re.search(r'font', resume_text.lower()):
-            score += 0.2
-        checks += 1
-        
-        # Check file format (assuming PDF is good)
-        score += 0.2  # PDF is ATS-friendly
-        checks += 1
-        
-        return min(score, 1.0)
+        return self.rule_pack.evaluate(resume_text, categories=['format_compatibility'])['format_compatibility']
     @task
     def check_keyword_optimization(self, resume_text: str, resume_tokens: List[str], 
-                                  job_description: str = None) -> float:
-        """Check keyword optimization"""
-        score = 0.0
-        
-        # Common industry keywords
-        industry_keywords = [
-            'python', 'machine learning', 'ai', 'data analysis', 'sql',
-            'javascript', 'react', 'node', 'api', 'database', 'cloud',
-            'aws', 'azure', 'docker', 'kubernetes', 'git', 'agile'
-        ]
-        
-        found_keywords = sum(1 for keyword in industry_keywords 
-                           if keyword.lower() in resume_text.lower())
-        score += min(found_keywords / 10, 1.0) * 0.4
-        
-        # Action verbs
-        action_verbs = [
-            'developed', 'implemented', 'managed', 'led', 'created',
-            'designed', 'built', 'optimized', 'improved', 'delivered'
-        ]
-        
-        found_verbs = sum(1 for verb in action_verbs 
-                         if verb.lower() in resume_text.lower())
-        score += min(found_verbs / 5, 1.0) * 0.3
-        
-        # Job description keyword matching
-        if job_description:
-            jd_tokens = clean_text(job_description)
-            common_tokens = set(resume_tokens) & set(jd_tokens)
-            if len(jd_tokens) > 0:
-                keyword_match_ratio = len(common_tokens) / len(jd_tokens)
-                score += min(keyword_match_ratio * 2, 1.0) * 0.3
-        else:
-            score += 0.3  # Default score if no job description
-        
-        return min(score, 1.0)
+                                  job_description: str = None, jd_tokens: List[str] = None) -> float:
+        """Check keyword optimization (pass `jd_tokens` when the JD is already cleaned)"""
+        return self.rule_pack.evaluate(resume_text, resume_tokens, job_description, jd_tokens,
+                                       categories=['keyword_optimization'])['keyword_optimization']
     
     @task
     def check_structure_quality(self, resume_text: str) -> float:
         """Check resume structure quality"""
-        score = 0.0
-        
-        # Check for contact information
-        contact_patterns = [
-            r'@\w+\.\w+',  # Email
-            r'\(\d{3}\)\s*\d{3}-\d{4}',  # Phone
-            r'\d{3}-\d{3}-\d{4}',  # Phone alternative
-            r'linkedin\.com',  # LinkedIn
-            r'github\.com'  # GitHub
-        ]
-        
-        contact_found = sum(1 for pattern in contact_patterns 
-                          if re.search(pattern, resume_text.lower()))
-        score += min(contact_found / 3, 1.0) * 0.25
-        
-        # Check for professional summary
-        summary_keywords = ['summary', 'profile', 'objective', 'about']
-        has_summary = any(keyword in resume_text.lower() for keyword in summary_keywords)
-        if has_summary:
-            score += 0.2
-        
-        # Check for work experience section
-        experience_keywords = ['experience', 'employment', 'work history', 'career']
-        has_experience = any(keyword in resume_text.lower() for keyword in experience_keywords)
-        if has_experience:
-            score += 0.2
-        
-        # Check for education section
-        education_keywords = ['education', 'degree', 'university', 'college', 'bachelor', 'master']
-        has_education = any(keyword in resume_text.lower() for keyword in education_keywords)
-        if has_education:
-            score += 0.2
-        
-        # Check for skills section
-        skills_keywords = ['skills', 'technical skills', 'competencies', 'expertise']
-        has_skills = any(keyword in resume_text.lower() for keyword in skills_keywords)
-        if has_skills:
-            score += 0.15
-        
-        return min(score, 1.0)
+        return self.rule_pack.evaluate(resume_text, categories=['structure_quality'])['structure_quality']
     @task
     def check_content_quality(self, resume_text: str, resume_tokens: List[str]) -> float:
         """Check content quality"""
-        score = 0.0
-        
-        # Check for quantified achievements
-        quantified_patterns = [
-            r'\d+%', r'\$\d+', r'\d+x', r'\d+\+', r'\d+ years?',
-            r'increased by \d+', r'reduced by \d+', r'improved by \d+'
-        ]
-        
-        quantified_found = sum(1 for pattern in quantified_patterns 
-                             if re.search(pattern, resume_text.lower()))
-        score += min(quantified_found / 3, 1.0) * 0.3
-        
-        # Check resume length (not too short, not too long)
-        word_count = len(resume_tokens)
-        if 200 <= word_count <= 800:
-            score += 0.3
-        elif 100 <= word_count < 200 or 800 < word_count <= 1200:
-            score += 0.15
-        
-        # Check for consistent formatting (basic check)
-        lines = resume_text.split('\n')
-        non_empty_lines = [line.strip() for line in lines if line.strip()]
-        if len(non_empty_lines) > 10:  # Reasonable number of sections
-            score += 0.2
-        
-        # Check for professional tone (basic keyword check)
-        professional_keywords = ['achieved', 'developed', 'implemented', 'managed', 'led']
-        professional_found = sum(1 for keyword in professional_keywords 
-                               if keyword.lower() in resume_text.lower())
-        score += min(professional_found / 3, 1.0) * 0.2
-        
-        return min(score, 1.0)
+        return self.rule_pack.evaluate(resume_text, resume_tokens,
+                                       categories=['content_quality'])['content_quality']
     
     @task
     def generate_recommendations(self, scores: Dict, resume_text: str) -> List[str]:
         """Generate improvement recommendations based on scores"""
-        recommendations = []
-        
-        for category, data in scores.items():
-            score = data['score']
-            
-            if category == 'format_compatibility' and score < 0.7:
-                recommendations.append("Improve format compatibility: Use standard fonts, avoid tables/graphics, ensure proper file format")
-            
-            elif category == 'keyword_optimization' and score < 0.7:
-                recommendations.append("Optimize keywords: Include more industry-specific terms and action verbs")
-            
-            elif category == 'structure_quality' and score < 0.7:
-                recommendations.append("Improve structure: Ensure all standard sections (contact, summary, experience, education, skills) are present")
-            
-            elif category == 'content_quality' and score < 0.7:
-                recommendations.append("Enhance content: Add quantified achievements and maintain professional tone")
-        
-        if not recommendations:
-            recommendations.append("Great job! Your resume has good ATS compatibility.")
-        
-        return recommendations
+        return self.rule_pack.recommendations({category: data['score'] for category, data in scores.items()})
 
 def create_ats_score_circle(score: float, save_path: str = None) -> str:
     """
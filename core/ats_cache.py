@@ -0,0 +1,306 @@
+"""
+Cache of ATS analysis results.
+
+A result is keyed by (SHA-256 of the resume file, hash of the normalized JD,
+rule pack version, criteria version), so re-checking the same resume against the same JD
+returns the stored result without extracting, cleaning or scoring anything.
+JD normalization (case and whitespace) only folds differences that can't
+change the score.
+
+The criteria version is a hash of everything else a score depends on: the
+rule packs (core.ats_rules.rule_packs_fingerprint) and the extractor and
+preprocessor versions. Each backend records the version
+it was filled with; when it differs from the running code the backend is
+cleared, so a criteria change invalidates every stored result.
+
+The local backend keeps that marker in a small file next to the SQLite file
+(ATS_CACHE_PATH + ".version"), outside the table TTL and LRU eviction apply
+to. `invalidate` writes a new generation to it, and every process checks the
+file on each lookup and drops its RAM tier when the generation changed, so
+`python -m core.ats_cache invalidate` takes effect in running workers without
+a restart.
+
+Backends (ATS_CACHE_BACKEND):
+- "local" (default): RAM LRU + SQLite at ATS_CACHE_PATH (core.llm_cache's store),
+- "redis": ATS_CACHE_REDIS_URL, shared by every worker and host,
+- "off": no caching.
+
+    python -m core.ats_cache invalidate
+    python -m core.ats_cache stats
+"""
+
+import os
+import re
+import sys
+import json
+import uuid
+import hashlib
+import argparse
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.llm_cache import LLMCache
+from core.ats_rules import get_rule_pack
+from core.single_flight import get_single_flight
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+ATS_CACHE_BACKEND = os.environ.get("ATS_CACHE_BACKEND", "local").lower()
+ATS_CACHE_PATH = os.environ.get("ATS_CACHE_PATH", os.path.join(PROJECT_ROOT, "data", "cache", "ats_results.sqlite3"))
+ATS_CACHE_REDIS_URL = os.environ.get("ATS_CACHE_REDIS_URL", os.environ.get("REDIS_URL", "redis://localhost:6379/2"))
+ATS_CACHE_TTL_SECONDS = int(os.environ.get("ATS_CACHE_TTL_SECONDS", 30 * 24 * 60 * 60))
+ATS_CACHE_RAM_ITEMS = int(os.environ.get("ATS_CACHE_RAM_ITEMS", 4096))
+ATS_CACHE_MAX_DISK_MB = int(os.environ.get("ATS_CACHE_MAX_DISK_MB", 128))
+
+_RESULT_PREFIX = "ats:result:"
+_VERSION_KEY = "ats:criteria_version"  # Redis backend
+_MARKER_SUFFIX = ".version"            # Local backend: file next to the SQLite file
+_WHITESPACE = re.compile(r"\s+")
+
+
+def criteria_version() -> str:
+    """Hash of the ATS rule packs and text pipeline versions."""
+    from core.ats_rules import rule_packs_fingerprint
+    from core.utils import PREPROCESSOR_VERSION
+    from core.document_extractor import EXTRACTOR_VERSION
+
+    payload = dict(rule_packs_fingerprint(), preprocessor=PREPROCESSOR_VERSION, extractor=EXTRACTOR_VERSION)
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def jd_hash(job_description: Optional[str]) -> str:
+    """
+    Hash of the normalized JD. No JD at all scores differently from a blank
+    one, so it gets its own key.
+    """
+    if not job_description:
+        return "none"
+    normalized = _WHITESPACE.sub(" ", job_description.lower()).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class ATSResultCache:
+    """
+    ATS results by (resume hash, JD hash, rule pack, criteria version).
+
+    Args:
+        backend: "local", "redis" or "off".
+        path: SQLite file of the local backend (None: RAM only).
+        redis_url: Redis URL of the redis backend.
+        ttl_seconds: How long results are kept.
+        version: Criteria version (default: criteria_version()).
+    """
+
+    def __init__(self, backend: str = ATS_CACHE_BACKEND, path: Optional[str] = ATS_CACHE_PATH,
+                 redis_url: str = ATS_CACHE_REDIS_URL, ttl_seconds: int = ATS_CACHE_TTL_SECONDS,
+                 version: Optional[str] = None):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.version = version or criteria_version()
+        self._local: Optional[LLMCache] = None
+        self._redis = None
+        self._marker_path = f"{path}{_MARKER_SUFFIX}" if path else None
+        self._marker_stamp: Optional[Tuple[int, int]] = None
+        self._generation: Optional[str] = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "errors": 0}
+
+        if backend == "redis":
+            try:
+                import redis
+                self._redis = redis.from_url(redis_url)
+                self._redis.ping()
+            except Exception as e:
+                print(f"Warning: Redis ATS result cache unavailable, using the local cache: {e}")
+                self._redis = None
+                self.backend = "local"
+        if self.backend == "local":
+            self._local = LLMCache(path=path, ttl_seconds=ttl_seconds, max_memory_entries=ATS_CACHE_RAM_ITEMS,
+                                   max_disk_bytes=ATS_CACHE_MAX_DISK_MB * 1024 * 1024)
+        if self.backend != "off":
+            self._check_version()
+
+    # ---------- backend access ----------
+
+    def _read(self, key: str) -> Optional[str]:
+        if self._redis is not None:
+            value = self._redis.get(key)
+            return value.decode("utf-8") if value is not None else None
+        return self._local.get(key) if self._local is not None else None
+
+    def _write(self, key: str, value: str, ttl: bool = True) -> None:
+        if self._redis is not None:
+            if ttl and self.ttl_seconds > 0:
+                self._redis.setex(key, self.ttl_seconds, value)
+            else:
+                self._redis.set(key, value)
+        elif self._local is not None:
+            self._local.set(key, value, model=self.version)
+
+    # ---------- version marker ----------
+
+    def _read_marker(self) -> Optional[Dict]:
+        if self._redis is not None:
+            stored = self._read(_VERSION_KEY)
+            return {"version": stored} if stored is not None else None
+        if self._marker_path is None:
+            return None
+        try:
+            with open(self._marker_path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write_marker(self) -> None:
+        if self._redis is not None:
+            self._write(_VERSION_KEY, self.version, ttl=False)
+            return
+        self._generation = uuid.uuid4().hex
+        if self._marker_path is None:
+            return
+        os.makedirs(os.path.dirname(self._marker_path) or ".", exist_ok=True)
+        tmp_path = f"{self._marker_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": self.version, "generation": self._generation}, f)
+        os.replace(tmp_path, self._marker_path)
+        self._marker_stamp = self._stat_marker()
+
+    def _stat_marker(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self._marker_path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _check_version(self) -> None:
+        """Clears the backend if it was filled under other criteria."""
+        try:
+            stored = self._read_marker()
+            if stored is None or stored.get("version") != self.version:
+                if stored is not None:
+                    print(f"ATS criteria changed ({stored.get('version')} -> {self.version}); clearing cached ATS results")
+                self.invalidate()
+            elif self._local is not None:
+                self._generation = stored.get("generation")
+                self._marker_stamp = self._stat_marker()
+        except Exception as e:
+            print(f"Warning: could not check the ATS result cache version: {e}")
+
+    def _sync_local(self) -> None:
+        """Drops this process's RAM tier if another process invalidated the cache since the last lookup."""
+        if self._marker_path is None or self._stat_marker() == self._marker_stamp:
+            return
+        with self._lock:
+            stamp = self._stat_marker()
+            if stamp == self._marker_stamp:
+                return
+            stored = self._read_marker() or {}
+            if stored.get("generation") != self._generation:
+                self._local.clear_memory()
+                self._generation = stored.get("generation")
+            self._marker_stamp = stamp
+
+    # ---------- public API ----------
+
+    def key(self, resume_hash: str, job_description: Optional[str], rule_pack: Optional[str] = None) -> str:
+        pack_version = get_rule_pack(rule_pack).version
+        return f"{_RESULT_PREFIX}{self.version}:{pack_version}:{resume_hash}:{jd_hash(job_description)}"
+
+    def get(self, resume_hash: str, job_description: Optional[str], rule_pack: Optional[str] = None) -> Optional[Dict]:
+        """The cached result, or None."""
+        if self.backend == "off":
+            return None
+        try:
+            if self._local is not None:
+                self._sync_local()
+            value = self._read(self.key(resume_hash, job_description, rule_pack))
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+            print(f"Warning: ATS result cache read failed: {e}")
+            value = None
+        with self._lock:
+            self._stats["hits" if value is not None else "misses"] += 1
+        return json.loads(value) if value is not None else None
+
+    def set(self, resume_hash: str, job_description: Optional[str], result: Dict,
+            rule_pack: Optional[str] = None) -> None:
+        if self.backend == "off":
+            return
+        try:
+            self._write(self.key(resume_hash, job_description, rule_pack), json.dumps(result))
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+            print(f"Warning: ATS result cache write failed: {e}")
+
+    def get_or_compute(self, resume_hash: str, job_description: Optional[str], compute: Callable[[], Dict],
+                       rule_pack: Optional[str] = None) -> Dict:
+        """
+        Returns the cached result, or computes, stores and returns it.
+        Concurrent misses for the same key compute it once.
+        """
+        result = self.get(resume_hash, job_description, rule_pack)
+        if result is not None:
+            return result
+
+        def run():
+            result = compute()
+            self.set(resume_hash, job_description, result, rule_pack)
+            return result
+
+        key = self.key(resume_hash, job_description, rule_pack)
+        return get_single_flight("ats_results", distributed=False).do(key, run)
+
+    def invalidate(self) -> None:
+        """
+        Drops every cached result and records the current criteria version.
+        Other processes drop their RAM tier on their next lookup.
+        """
+        if self._redis is not None:
+            pipe = self._redis.pipeline()
+            for key in self._redis.scan_iter(match=f"{_RESULT_PREFIX}*", count=1000):
+                pipe.delete(key)
+            pipe.execute()
+        elif self._local is not None:
+            self._local.clear()
+        self._write_marker()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats, backend=self.backend, criteria_version=self.version)
+        if self._local is not None:
+            stats["local"] = self._local.stats()
+        return stats
+
+
+# Singleton instance
+_ats_result_cache: Optional[ATSResultCache] = None
+_ats_result_cache_lock = threading.Lock()
+
+
+def get_ats_result_cache() -> ATSResultCache:
+    """Get the process-wide ATSResultCache, configured from environment variables."""
+    global _ats_result_cache
+    if _ats_result_cache is None:
+        with _ats_result_cache_lock:
+            if _ats_result_cache is None:
+                _ats_result_cache = ATSResultCache()
+    return _ats_result_cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ATS result cache maintenance")
+    parser.add_argument("command", choices=["invalidate", "stats"])
+    args = parser.parse_args()
+
+    cache = get_ats_result_cache()
+    if args.command == "invalidate":
+        cache.invalidate()
+        print(f"Cleared cached ATS results ({cache.backend})")
+    print(json.dumps(cache.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
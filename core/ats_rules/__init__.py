@@ -0,0 +1,382 @@
+"""
+Data-driven ATS criteria: rule packs.
+
+A rule pack is a JSON (or YAML, with PyYAML installed) file in this directory
+(or ATS_RULE_PACK_DIR) describing the ATS categories, their weights and
+recommendation thresholds, and the rules that score them. Adding a role pack
+is adding a file; ATS_RULE_PACK picks the default pack, and the API takes a
+`rule_pack` per request.
+
+    {
+      "name": "ai_engineer",
+      "extends": "default",                 # optional: start from another pack
+      "keyword_sets": {                      # named sets, shared by rules
+        "industry_keywords": {"kubernetes": ["k8s"], "python": []}   # term -> synonyms, or a plain list
+      },
+      "categories": {
+        "keyword_optimization": {
+          "weight": 0.3, "recommend_below": 0.7, "recommendation": "...",
+          "rules": [{"id": "industry_keywords", "keyword_set": "industry_keywords",
+                     "score": "ratio", "threshold": 10, "points": 0.4, "whole_word": true}]
+        }
+      },
+      "default_recommendation": "..."
+    }
+
+A pack that extends another replaces keyword sets by name, merges category
+fields, and merges rules by id (a rule with a new id is appended).
+
+Rules:
+- value: the number of distinct terms of the rule's keywords ("keyword_set"
+  and/or inline "keywords") found in the lowercased resume, plus the number
+  of its regex "patterns" that match; or, with "metric", the resume's
+  "token_count", "non_empty_lines" or "jd_overlap" (share of JD tokens also
+  in the resume; "no_jd_points" are awarded when there is no JD).
+- score: "ratio" (points * min(value / threshold, 1)), "present"
+  (points if value >= threshold, default 1, or if none of the "or_absent"
+  terms occur), "absent" (points if value is 0), "constant" (points), or
+  "bands" (points of the first {"min", "max"} band containing value).
+Terms match as substrings unless the rule sets "whole_word". A category
+scores min(sum of its rules, 1).
+
+Packs are compiled once: every term of every rule goes into one
+KeywordScanner (core.keyword_scanner), so a resume is scanned once however
+large the dictionaries are, and all rules are then scored together with
+NumPy from the terms found.
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import threading
+from copy import deepcopy
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from core.keyword_scanner import KeywordScanner
+
+# Bump when the meaning of rule pack fields changes (cached ATS results are then discarded)
+RULE_ENGINE_VERSION = "1"
+RULE_PACK_DIR = os.environ.get("ATS_RULE_PACK_DIR", os.path.dirname(os.path.abspath(__file__)))
+ATS_RULE_PACK = os.environ.get("ATS_RULE_PACK", "default")
+RULE_PACK_EXTENSIONS = (".json", ".yaml", ".yml")
+
+SCORE_MODES = ("ratio", "present", "absent", "constant", "bands")
+METRICS = ("keywords", "token_count", "non_empty_lines", "jd_overlap")
+_RATIO, _PRESENT, _ABSENT, _CONSTANT, _BANDS = range(len(SCORE_MODES))
+_KEYWORDS, _TOKEN_COUNT, _NON_EMPTY_LINES, _JD_OVERLAP = range(len(METRICS))
+
+
+@lru_cache(maxsize=256)
+def jd_token_set(job_description: str) -> Tuple[FrozenSet[str], int]:
+    """Cleaned JD tokens as a set, and the token count. Cached per JD text."""
+    from core.utils import clean_text
+    jd_tokens = clean_text(job_description)
+    return frozenset(jd_tokens), len(jd_tokens)
+
+
+# ---------- loading ----------
+
+def _pack_path(name_or_path: str) -> str:
+    if os.path.isfile(name_or_path):
+        return name_or_path
+    for extension in RULE_PACK_EXTENSIONS:
+        path = os.path.join(RULE_PACK_DIR, name_or_path + extension)
+        if os.path.isfile(path):
+            return path
+    raise ValueError(f"Unknown ATS rule pack: {name_or_path} (available: {', '.join(list_rule_packs())})")
+
+
+def _read_pack_file(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".json"):
+            return json.load(f)
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError(
+                "PyYAML is required to load YAML rule packs. "
+                "Install it with: pip install pyyaml"
+            )
+        return yaml.safe_load(f)
+
+
+def _merge_packs(base: dict, child: dict) -> dict:
+    merged = deepcopy(base)
+    for key, value in child.items():
+        if key == "keyword_sets":
+            merged.setdefault("keyword_sets", {}).update(deepcopy(value))
+        elif key == "categories":
+            categories = merged.setdefault("categories", {})
+            for category, config in value.items():
+                target = categories.setdefault(category, {})
+                rules = {rule["id"]: rule for rule in target.get("rules", [])}
+                for rule in config.get("rules", []):
+                    rules[rule["id"]] = dict(rules.get(rule["id"], {}), **deepcopy(rule))
+                target.update({k: deepcopy(v) for k, v in config.items() if k != "rules"})
+                target["rules"] = list(rules.values())
+        elif key != "extends":
+            merged[key] = deepcopy(value)
+    return merged
+
+
+def load_pack_spec(name_or_path: str, _seen: Tuple[str, ...] = ()) -> dict:
+    """
+    Reads a rule pack (by name or path) and resolves its "extends" chain.
+
+    Raises:
+        ValueError: Unknown pack or circular "extends".
+    """
+    path = _pack_path(name_or_path)
+    if path in _seen:
+        raise ValueError(f"Circular 'extends' in ATS rule packs: {' -> '.join(_seen + (path,))}")
+    spec = _read_pack_file(path)
+    if spec.get("extends"):
+        spec = _merge_packs(load_pack_spec(spec["extends"], _seen + (path,)), spec)
+    spec.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    return spec
+
+
+def pack_version(spec: dict) -> str:
+    """Hash of a resolved pack and the rule engine version."""
+    return hashlib.sha256((RULE_ENGINE_VERSION + json.dumps(spec, sort_keys=True)).encode("utf-8")).hexdigest()[:16]
+
+
+def list_rule_packs() -> List[str]:
+    """Names of the packs in RULE_PACK_DIR."""
+    return sorted(
+        os.path.splitext(name)[0] for name in os.listdir(RULE_PACK_DIR)
+        if name.endswith(RULE_PACK_EXTENSIONS)
+    )
+
+
+# ---------- compiled pack ----------
+
+def _terms(keywords) -> Dict[str, List[str]]:
+    """Normalizes a keyword list or {term: [synonyms]} mapping to the mapping form."""
+    if isinstance(keywords, dict):
+        return {term: list(synonyms or []) for term, synonyms in keywords.items()}
+    return {term: [] for term in keywords}
+
+
+class RulePack:
+    """
+    A rule pack compiled for scoring.
+
+    Args:
+        spec: The resolved pack (see load_pack_spec).
+    """
+
+    def __init__(self, spec: dict):
+        self.spec = spec
+        self.name = spec.get("name", "custom")
+        self.version = pack_version(spec)
+        self.categories: List[str] = list(spec["categories"])
+        self.default_recommendation = spec.get("default_recommendation", "")
+        self._compile()
+        self._scan = lru_cache(maxsize=64)(self._scan_text)
+
+    def _compile(self) -> None:
+        keyword_sets = self.spec.get("keyword_sets", {})
+        rule_category, modes, metrics, points, thresholds, no_jd_points = [], [], [], [], [], []
+        self.rule_ids: List[str] = []
+        self._bands: Dict[int, List[dict]] = {}
+        self._patterns: List[Tuple[int, "re.Pattern"]] = []
+        self._has_or_absent: List[bool] = []
+        # Terms: one concept per (rule, term); every surface form (term or synonym) points to its concepts
+        concept_rule, concept_blocks = [], []
+        surfaces: Dict[str, List[Tuple[int, bool]]] = {}
+
+        def add_terms(rule_index: int, terms: Dict[str, List[str]], whole_word: bool, blocks: bool) -> None:
+            for term, synonyms in terms.items():
+                concept = len(concept_rule)
+                concept_rule.append(rule_index)
+                concept_blocks.append(blocks)
+                for surface in dict.fromkeys(s.lower() for s in [term] + synonyms if s):
+                    surfaces.setdefault(surface, []).append((concept, whole_word))
+
+        for category_index, category in enumerate(self.categories):
+            for rule in self.spec["categories"][category].get("rules", []):
+                index = len(self.rule_ids)
+                mode, metric = rule.get("score", "ratio"), rule.get("metric", "keywords")
+                if mode not in SCORE_MODES or metric not in METRICS:
+                    raise ValueError(f"ATS rule {rule.get('id')}: unknown score '{mode}' or metric '{metric}'")
+                threshold = float(rule.get("threshold", 1))
+                if threshold <= 0:
+                    raise ValueError(f"ATS rule {rule.get('id')}: threshold must be positive")
+                self.rule_ids.append(rule["id"])
+                rule_category.append(category_index)
+                modes.append(SCORE_MODES.index(mode))
+                metrics.append(METRICS.index(metric))
+                points.append(float(rule.get("points", 0)))
+                thresholds.append(threshold)
+                no_jd_points.append(float(rule.get("no_jd_points", 0)))
+                if mode == "bands":
+                    self._bands[index] = rule["bands"]
+
+                terms = {}
+                if rule.get("keyword_set"):
+                    if rule["keyword_set"] not in keyword_sets:
+                        raise ValueError(f"ATS rule {rule['id']}: unknown keyword set '{rule['keyword_set']}'")
+                    terms.update(_terms(keyword_sets[rule["keyword_set"]]))
+                terms.update(_terms(rule.get("keywords", [])))
+                whole_word = bool(rule.get("whole_word", False))
+                add_terms(index, terms, whole_word, blocks=False)
+                add_terms(index, _terms(rule.get("or_absent", [])), whole_word, blocks=True)
+                self._has_or_absent.append(bool(rule.get("or_absent")))
+                self._patterns.extend((index, re.compile(p)) for p in rule.get("patterns", []))
+
+        self._rule_category = np.asarray(rule_category, dtype=np.int64)
+        self._modes = np.asarray(modes)
+        self._metrics = np.asarray(metrics)
+        self._points = np.asarray(points)
+        self._thresholds = np.asarray(thresholds)
+        self._no_jd_points = np.asarray(no_jd_points)
+        self._has_or_absent = np.asarray(self._has_or_absent, dtype=bool)
+        self._concept_rule = np.asarray(concept_rule, dtype=np.int64)
+        self._concept_blocks = np.asarray(concept_blocks, dtype=bool)
+        self._scanner = KeywordScanner(surfaces)
+        self._surface_concepts = [tuple(surfaces[s]) for s in self._scanner.keywords]
+        self._needs_tokens = np.isin(self._metrics, (_TOKEN_COUNT, _JD_OVERLAP))
+
+    # ---------- scoring ----------
+
+    def _scan_text(self, resume_text: str):
+        """Concepts found, pattern matches per rule and non-empty lines (cached per text)."""
+        text = resume_text.lower()
+        found = set()
+        for start, index in self._scanner.iter_matches(text):
+            end = start + len(self._scanner.keywords[index])
+            bounded = None
+            for concept, whole_word in self._surface_concepts[index]:
+                if whole_word:
+                    if bounded is None:
+                        bounded = ((start == 0 or not text[start - 1].isalnum())
+                                   and (end == len(text) or not text[end].isalnum()))
+                    if not bounded:
+                        continue
+                found.add(concept)
+        pattern_found = np.zeros(len(self.rule_ids))
+        for rule_index, pattern in self._patterns:
+            if pattern.search(text):
+                pattern_found[rule_index] += 1
+        non_empty_lines = sum(1 for line in resume_text.split('\n') if line.strip())
+        return np.fromiter(found, dtype=np.int64, count=len(found)), pattern_found, non_empty_lines
+
+    def clear_scan_cache(self) -> None:
+        self._scan.cache_clear()
+
+    def evaluate(self, resume_text: str, resume_tokens: Optional[List[str]] = None,
+                 job_description: Optional[str] = None, jd_tokens: Optional[List[str]] = None,
+                 categories: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """
+        Scores a resume.
+
+        Args:
+            resume_text: Raw resume text.
+            resume_tokens: clean_text(resume_text); computed if a selected rule needs it and it isn't given.
+            job_description: Optional JD.
+            jd_tokens: clean_text(job_description), when already known.
+            categories: Categories to score (default: all).
+
+        Returns:
+            Category -> score in [0, 1].
+        """
+        categories = self.categories if categories is None else list(categories)
+        selected = np.isin(self._rule_category, [self.categories.index(c) for c in categories])
+        concepts, pattern_found, non_empty_lines = self._scan(resume_text)
+        rule_count = len(self.rule_ids)
+
+        hit_rules = self._concept_rule[concepts]
+        blocks = self._concept_blocks[concepts]
+        value = np.bincount(hit_rules[~blocks], minlength=rule_count) + pattern_found
+        blocked = np.bincount(hit_rules[blocks], minlength=rule_count)
+
+        value[self._metrics == _NON_EMPTY_LINES] = non_empty_lines
+        has_jd = bool(job_description)
+        if (selected & self._needs_tokens).any():
+            if resume_tokens is None:
+                from core.utils import clean_text
+                resume_tokens = clean_text(resume_text)
+            value[self._metrics == _TOKEN_COUNT] = len(resume_tokens)
+            if has_jd:
+                if jd_tokens is not None:
+                    jd_set, jd_count = frozenset(jd_tokens), len(jd_tokens)
+                else:
+                    jd_set, jd_count = jd_token_set(job_description)
+                value[self._metrics == _JD_OVERLAP] = len(jd_set.intersection(resume_tokens)) / jd_count if jd_count else 0
+
+        scores = np.select(
+            [self._modes == _RATIO, self._modes == _PRESENT, self._modes == _ABSENT, self._modes == _CONSTANT],
+            [self._points * np.minimum(value / self._thresholds, 1.0),
+             self._points * ((value >= self._thresholds) | (self._has_or_absent & (blocked == 0))),
+             self._points * (value == 0),
+             self._points],
+            default=0.0,
+        )
+        for rule_index, bands in self._bands.items():
+            scores[rule_index] = next(
+                (band["points"] for band in bands
+                 if band.get("min", float("-inf")) <= value[rule_index] <= band.get("max", float("inf"))), 0.0
+            )
+        if not has_jd:
+            jd_rules = self._metrics == _JD_OVERLAP
+            scores[jd_rules] = self._no_jd_points[jd_rules]
+
+        scores[~selected] = 0.0
+        totals = np.minimum(np.bincount(self._rule_category, weights=scores, minlength=len(self.categories)), 1.0)
+        return {category: float(totals[self.categories.index(category)]) for category in categories}
+
+    def recommendations(self, category_scores: Dict[str, float]) -> List[str]:
+        """Recommendation of every category scoring below its "recommend_below"."""
+        recommendations = []
+        for category, score in category_scores.items():
+            config = self.spec["categories"].get(category, {})
+            if config.get("recommendation") and score < config.get("recommend_below", 0.7):
+                recommendations.append(config["recommendation"])
+        if not recommendations and self.default_recommendation:
+            recommendations.append(self.default_recommendation)
+        return recommendations
+
+    @property
+    def ats_criteria(self) -> Dict[str, dict]:
+        """Category -> {"weight", "checks"} (the shape of ATSAnalyzer.ats_criteria)."""
+        return {
+            category: {
+                "weight": self.spec["categories"][category]["weight"],
+                "checks": [rule["id"] for rule in self.spec["categories"][category].get("rules", [])],
+            }
+            for category in self.categories
+        }
+
+    def __len__(self) -> int:
+        """Number of distinct terms (including synonyms) in the pack."""
+        return len(self._scanner)
+
+
+# Compiled packs by name (or path)
+_rule_packs: Dict[str, RulePack] = {}
+_rule_packs_lock = threading.Lock()
+
+
+def get_rule_pack(name: Optional[str] = None) -> RulePack:
+    """Get the compiled rule pack `name` (default: ATS_RULE_PACK), compiling it on first use."""
+    name = name or ATS_RULE_PACK
+    pack = _rule_packs.get(name)
+    if pack is None:
+        with _rule_packs_lock:
+            pack = _rule_packs.get(name)
+            if pack is None:
+                pack = _rule_packs[name] = RulePack(load_pack_spec(name))
+    return pack
+
+
+def rule_packs_fingerprint() -> Dict[str, str]:
+    """Rule engine version and the version of every pack in RULE_PACK_DIR (see core.ats_cache)."""
+    return dict({"engine": RULE_ENGINE_VERSION},
+                **{name: pack_version(load_pack_spec(name)) for name in list_rule_packs()})
@@ -0,0 +1,189 @@
+"""
+In-memory resume text extraction with a content-hash cache.
+
+Uploads are parsed straight from their bytes (no temp files), and the page
+texts are cached by the SHA-256 of the file, so the same resume sent to the
+ATS checker, the resume matcher and the portfolio builder is parsed by pypdf
+once. Concurrent requests for the same file share one parse (single-flight).
+
+Long PDFs (PDF_PARALLEL_MIN_PAGES pages or more) are split into page ranges
+extracted in a process pool; pypdf is pure Python, so threads wouldn't help.
+"""
+
+import io
+import os
+import sys
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from pypdf import PdfReader
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.single_flight import get_single_flight
+
+EXTRACTION_CACHE_ITEMS = int(os.environ.get("EXTRACTION_CACHE_ITEMS", 256))
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", 16))
+PDF_EXTRACT_WORKERS = int(os.environ.get("PDF_EXTRACT_WORKERS", min(4, os.cpu_count() or 1)))
+
+TEXT_ENCODINGS = ("utf-8", "latin-1", "cp1252")
+# Bump when extraction output changes, so stored resume artifacts are rebuilt
+EXTRACTOR_VERSION = "pypdf-plain-1"
+
+
+def content_hash(data: bytes) -> str:
+    """SHA-256 hex digest of the file content."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _extract_page_range(data: bytes, start: int, stop: int) -> List[str]:
+    """Page texts for pages [start, stop). Runs in a worker process for long PDFs."""
+    reader = PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+class DocumentExtractor:
+    """
+    Extracts page texts from PDF/TXT/DOCX bytes, cached by content hash.
+
+    Args:
+        cache_items: Max documents kept in the LRU cache.
+        parallel_min_pages: PDFs with at least this many pages are extracted in a process pool.
+        workers: Size of that process pool.
+    """
+
+    def __init__(self, cache_items: int = EXTRACTION_CACHE_ITEMS,
+                 parallel_min_pages: int = PDF_PARALLEL_MIN_PAGES, workers: int = PDF_EXTRACT_WORKERS):
+        self.cache_items = cache_items
+        self.parallel_min_pages = parallel_min_pages
+        self.workers = max(1, workers)
+        self._cache: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_pid: Optional[int] = None
+        self._stats = {"hits": 0, "misses": 0}
+
+    # ---------- cache ----------
+
+    def _cached(self, key: str) -> Optional[Tuple[str, ...]]:
+        with self._lock:
+            pages = self._cache.get(key)
+            if pages is not None:
+                self._cache.move_to_end(key)
+                self._stats["hits"] += 1
+            return pages
+
+    def _store(self, key: str, pages: Tuple[str, ...]) -> None:
+        with self._lock:
+            self._cache[key] = pages
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_items:
+                self._cache.popitem(last=False)
+
+    # ---------- extraction ----------
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            # A pool inherited through fork is unusable; start a fresh one.
+            if self._pool is None or self._pool_pid != os.getpid():
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                self._pool_pid = os.getpid()
+            return self._pool
+
+    def _extract_pdf(self, data: bytes) -> List[str]:
+        reader = PdfReader(io.BytesIO(data))
+        page_count = len(reader.pages)
+        if page_count < self.parallel_min_pages or self.workers == 1:
+            return [page.extract_text() or "" for page in reader.pages]
+
+        step = -(-page_count // self.workers)
+        pool = self._process_pool()
+        futures = [pool.submit(_extract_page_range, data, start, min(start + step, page_count))
+                   for start in range(0, page_count, step)]
+        return [text for future in futures for text in future.result()]
+
+    @staticmethod
+    def _extract_text_file(data: bytes) -> List[str]:
+        for encoding in TEXT_ENCODINGS:
+            try:
+                return [data.decode(encoding)]
+            except UnicodeDecodeError:
+                continue
+        raise ValueError("Could not decode file with any supported encoding")
+
+    @staticmethod
+    def _extract_docx(data: bytes) -> List[str]:
+        try:
+            from docx import Document
+        except ImportError:
+            raise ImportError(
+                "python-docx is required to parse DOCX files. "
+                "Install it with: pip install python-docx"
+            )
+        return ["\n".join(para.text for para in Document(io.BytesIO(data)).paragraphs)]
+
+    def extract_pages(self, data: bytes, filename: str) -> List[str]:
+        """
+        Text of each page (one element for TXT/DOCX).
+
+        Args:
+            data: File content.
+            filename: Original file name; only its extension is used.
+
+        Returns:
+            Page texts, in order (empty strings for pages without text).
+
+        Raises:
+            ValueError: Unsupported extension or undecodable text file.
+        """
+        extension = os.path.splitext(filename)[1].lower()
+        if extension == ".pdf":
+            extract = self._extract_pdf
+        elif extension == ".txt":
+            extract = self._extract_text_file
+        elif extension in (".doc", ".docx"):
+            extract = self._extract_docx
+        else:
+            raise ValueError(f"Unsupported file format: {extension}")
+
+        key = f"{extension}:{content_hash(data)}"
+        pages = self._cached(key)
+        if pages is None:
+            def run():
+                # Re-check: the previous leader for this key may have just finished.
+                cached = self._cached(key)
+                if cached is not None:
+                    return cached
+                with self._lock:
+                    self._stats["misses"] += 1
+                result = tuple(extract(data))
+                self._store(key, result)
+                return result
+
+            pages = get_single_flight("document_extraction", distributed=False).do(key, run)
+        return list(pages)
+
+    def extract_text(self, data: bytes, filename: str, separator: str = " ") -> str:
+        """All page texts joined with `separator`."""
+        return separator.join(self.extract_pages(data, filename))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats, cached_documents=len(self._cache))
+
+
+# Singleton instance
+_document_extractor: Optional[DocumentExtractor] = None
+_document_extractor_lock = threading.Lock()
+
+
+def get_document_extractor() -> DocumentExtractor:
+    """Get the process-wide DocumentExtractor."""
+    global _document_extractor
+    if _document_extractor is None:
+        with _document_extractor_lock:
+            if _document_extractor is None:
+                _document_extractor = DocumentExtractor()
+    return _document_extractor
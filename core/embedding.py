@@ -1,33 +1,66 @@
 import os
 import sys
+import hashlib
 from typing import List
 
 import numpy as np
 from langchain_community.vectorstores import FAISS
-from langchain_groq import ChatGroq
-from langchain_huggingface import HuggingFaceEmbeddings
 from sklearn.metrics.pairwise import cosine_similarity
 from dotenv import load_dotenv
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from core.utils import process_documents
+from core.single_flight import get_single_flight
+from core.embedding_store import get_embedding_store, embedding_store_enabled
+from core.embedding_batcher import get_embedding_batcher
+from core.embedding_backends import shared_embedding_model, embedding_namespace
 
 load_dotenv()
-groq_api_key = os.environ["GROQ_API_KEY"]
-hf_api_key = os.environ["HUGGINGFACEHUB_API_TOKEN"]
-groq_llm = ChatGroq(groq_api_key=groq_api_key, model_name="llama-3.1-8b-instant")
-huggingface_embeddings = HuggingFaceEmbeddings(
-    model_name="sentence-transformers/all-MiniLM-l6-v2",
-    model_kwargs={'device': 'cpu'},
-    encode_kwargs={'normalize_embeddings': True}
+hf_api_key = os.environ.get("HUGGINGFACEHUB_API_TOKEN")
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-l6-v2"
+# Coalesce concurrent requests into batched forward passes (see core.embedding_batcher)
+EMBEDDING_BATCHING = os.environ.get("EMBEDDING_BATCHING", "true").lower() not in ("0", "false", "no")
+
+# Resume-JD similarity: "single" embeds each document as one string, which MiniLM truncates
+# at 256 word pieces; "chunked" embeds token-bounded chunks and pools their similarities.
+SIMILARITY_MODE = os.environ.get("EMBEDDING_SIMILARITY_MODE", "single").lower()
+# 160 cleaned tokens stay under 256 word pieces for typical resume vocabulary.
+CHUNK_MAX_TOKENS = int(os.environ.get("EMBEDDING_CHUNK_TOKENS", 160))
+CHUNK_OVERLAP = int(os.environ.get("EMBEDDING_CHUNK_OVERLAP", 32))
+CHUNK_POOLING = os.environ.get("EMBEDDING_CHUNK_POOLING", "topk").lower()
+CHUNK_TOP_K = int(os.environ.get("EMBEDDING_CHUNK_TOP_K", 3))
+
+
+# MiniLM (PyTorch or int8 ONNX, see EMBEDDING_BACKEND) is loaded on first use or during warm-up, not at import.
+# The instance is shared with every other user of the same model (e.g. the RAG retriever).
+get_embeddings = shared_embedding_model(EMBEDDING_MODEL_NAME)
+EMBEDDING_NAMESPACE = embedding_namespace(EMBEDDING_MODEL_NAME)
+
+
+def _embed_uncached(texts: List[str]) -> List[List[float]]:
+    """Runs the model; concurrent requests are micro-batched (or, without batching, identical ones coalesced)."""
+    if EMBEDDING_BATCHING:
+        batcher = get_embedding_batcher(EMBEDDING_NAMESPACE, lambda batch: get_embeddings().embed_documents(batch))
+        return batcher.embed(texts)
+
+    digest = hashlib.sha256(EMBEDDING_NAMESPACE.encode("utf-8"))
+    for text in texts:
+        digest.update(b"\x00" + text.encode("utf-8"))
+    # The embedding store is re-checked by callers, so coalesce in-process only.
+    return get_single_flight("embeddings", distributed=False).do(
+        digest.hexdigest(), lambda: get_embeddings().embed_documents(texts)
+    )
 
-)
 
 def create_embeddings(texts: List[str]) -> List[List[float]]:
     """
-    Generates embeddings for a list of texts using the pre-initialized HuggingFace Sentence Transformers model.
+    Generates embeddings for a list of texts using the HuggingFace Sentence Transformers model.
+    Texts already embedded (by any worker) are served from the persistent embedding store;
+    only the rest go through the model.
     """
-    return huggingface_embeddings.embed_documents(texts)
+    if not embedding_store_enabled():
+        return _embed_uncached(texts)
+    return get_embedding_store().embed(EMBEDDING_NAMESPACE, texts, _embed_uncached)
 
 
 def calculate_similarity(embedding1: List[float], embedding2: List[float]) -> float:
@@ -35,11 +68,84 @@ def calculate_similarity(embedding1: List[float], embedding2: List[float]) -> fl
     Calculates the cosine similarity between two embedding vectors.
     """
     return cosine_similarity([embedding1], [embedding2])[0][0]
-def calculate_resume_jd_similarity(cleaned_resume_list: list[str], cleaned_jd_list: list[str]):
+
+
+def chunk_tokens(tokens: List[str], max_tokens: int = CHUNK_MAX_TOKENS, overlap: int = CHUNK_OVERLAP) -> List[str]:
+    """
+    Splits a token list into overlapping chunks of at most `max_tokens` tokens, each joined into a string.
+    """
+    tokens = [t for t in tokens if t]
+    if not tokens:
+        return [""]
+    step = max(1, max_tokens - overlap)
+    chunks = []
+    for start in range(0, len(tokens), step):
+        chunks.append(" ".join(tokens[start:start + max_tokens]))
+        if start + max_tokens >= len(tokens):
+            break
+    return chunks
+
+
+def pool_similarity(matrix: np.ndarray, pooling: str = CHUNK_POOLING, top_k: int = CHUNK_TOP_K) -> float:
+    """
+    Reduces a chunk-by-chunk cosine similarity matrix to one score.
+
+    Args:
+        matrix: (resume chunks x JD chunks) cosine similarities.
+        pooling: "max" (best pair), "mean" (all pairs) or "topk" (mean of the `top_k` best pairs).
+        top_k: Number of pairs averaged by "topk".
+
+    Returns:
+        The pooled similarity score.
+    """
+    values = matrix.ravel()
+    if pooling == "max":
+        return float(values.max())
+    if pooling == "mean":
+        return float(values.mean())
+    if pooling == "topk":
+        k = min(max(1, top_k), values.size)
+        return float(np.partition(values, values.size - k)[-k:].mean())
+    raise ValueError(f"Unknown pooling: {pooling}")
+
+
+def chunked_similarity(resume_tokens: List[str], jd_tokens: List[str], pooling: str = CHUNK_POOLING,
+                       top_k: int = CHUNK_TOP_K, resume_vectors: List[List[float]] = None) -> float:
+    """
+    Resume-JD similarity over the whole of both documents.
+    All chunks of both documents are embedded in one batch (only the JD's when
+    `resume_vectors`, the resume's chunk embeddings, are already known), then the
+    chunk-by-chunk similarity matrix is pooled (see pool_similarity).
+    """
+    resume_chunks = [] if resume_vectors is not None else chunk_tokens(resume_tokens)
+    jd_chunks = chunk_tokens(jd_tokens)
+    vectors = np.asarray(create_embeddings(resume_chunks + jd_chunks), dtype=np.float32)
+    if resume_vectors is not None:
+        vectors = np.concatenate([np.asarray(resume_vectors, dtype=np.float32), vectors])
+    vectors /= np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+    resume_count = len(vectors) - len(jd_chunks)
+    matrix = vectors[:resume_count] @ vectors[resume_count:].T
+    return pool_similarity(matrix, pooling, top_k)
+
+
+def calculate_resume_jd_similarity(cleaned_resume_list: list[str], cleaned_jd_list: list[str],
+                                   mode: str = None, pooling: str = None, resume_chunk_vectors: list = None):
     """
     Calculates the cosine similarity between a cleaned resume and job description.
-    Optionally stores the embeddings in a FAISS vector database.
+
+    Args:
+        cleaned_resume_list: Cleaned resume tokens.
+        cleaned_jd_list: Cleaned job description tokens.
+        mode: "single" embeds each document as one (truncated) string, "chunked" covers
+            the whole document (default: EMBEDDING_SIMILARITY_MODE).
+        pooling: Chunk pooling for "chunked" mode (default: EMBEDDING_CHUNK_POOLING).
+        resume_chunk_vectors: Stored resume chunk embeddings for "chunked" mode (see core.resume_artifacts).
     """
+    mode = (mode or SIMILARITY_MODE).lower()
+    if mode == "chunked":
+        return chunked_similarity(cleaned_resume_list, cleaned_jd_list, pooling or CHUNK_POOLING,
+                                  resume_vectors=resume_chunk_vectors)
+
     # Generate embeddings
     cleaned_resume_text = " ".join(cleaned_resume_list)
     cleaned_jd_text = " ".join(cleaned_jd_list)
@@ -52,7 +158,6 @@ def calculate_resume_jd_similarity(cleaned_resume_list: list[str], cleaned_jd_li
     similarity_score = calculate_similarity(resume_embedding, jd_embedding)
     return similarity_score
 
-
 if __name__ == "__main__":
     # Example Usage:
     RESUME_PATH = "../data/raw/resumes/Ahmed Raza - AI Engineer.pdf"
@@ -0,0 +1,288 @@
+"""
+Selectable sentence-embedding backends.
+
+- "torch" (default): sentence-transformers via HuggingFaceEmbeddings.
+- "onnx": the same MiniLM exported to ONNX and int8-quantized, run with ONNX
+  Runtime and a `tokenizers` fast tokenizer. No PyTorch import, a fraction of
+  the RSS, and faster CPU inference. Pooling and normalization match the
+  sentence-transformers pipeline (mean pooling over the attention mask, then
+  L2 normalization).
+
+Select with EMBEDDING_BACKEND=onnx. Export the model once with:
+
+    python -m core.embedding_backends export
+
+and check it against PyTorch with:
+
+    python -m core.embedding_backends parity
+"""
+
+import os
+import sys
+import json
+import argparse
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.resources import register_resource, get_resource_registry
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+MODELS_DIR = os.path.join(PROJECT_ROOT, "data", "models")
+
+EMBEDDING_BACKEND = os.environ.get("EMBEDDING_BACKEND", "torch").lower()
+DEFAULT_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+ONNX_MODEL_FILE = "model_quantized.onnx"
+
+# all-MiniLM-L6-v2 was trained with 256 word-piece inputs; sentence-transformers truncates there too.
+MAX_SEQ_LENGTH = 256
+ONNX_BATCH_SIZE = 32
+
+# Cosine between the two backends' vectors must stay above this for every parity sample.
+PARITY_MIN_COSINE = 0.99
+
+
+def onnx_model_dir(model_name: str) -> str:
+    """Directory holding the exported model (EMBEDDING_ONNX_DIR overrides it)."""
+    default = os.path.join(MODELS_DIR, f"{model_name.split('/')[-1].lower()}-onnx-int8")
+    return os.environ.get("EMBEDDING_ONNX_DIR", default)
+
+
+class OnnxSentenceEmbeddings(Embeddings):
+    """
+    LangChain Embeddings running an int8 ONNX export of a sentence-transformers model.
+
+    Args:
+        model_dir: Directory with model_quantized.onnx and tokenizer.json.
+        max_seq_length: Inputs are truncated to this many word pieces.
+        batch_size: Texts per ONNX Runtime call.
+        intra_op_threads: ONNX Runtime threads per call (0 = runtime default).
+    """
+
+    def __init__(self, model_dir: str, max_seq_length: int = MAX_SEQ_LENGTH,
+                 batch_size: int = ONNX_BATCH_SIZE, intra_op_threads: int = 0):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_path = os.path.join(model_dir, ONNX_MODEL_FILE)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"No ONNX model at {model_path}; run `python -m core.embedding_backends export` first."
+            )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.enable_padding()
+        self.batch_size = batch_size
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling over real tokens, then L2 normalization (sentence-transformers' Pooling + Normalize).
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return pooled / np.clip(norms, 1e-12, None)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        # Length-sorted batches keep padding small; results are returned in input order.
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        results: List[Optional[np.ndarray]] = [None] * len(texts)
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            vectors = self._encode_batch([texts[i] for i in batch])
+            for i, vector in zip(batch, vectors):
+                results[i] = vector
+        return [v.tolist() for v in results]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def embedding_namespace(model_name: str, backend: Optional[str] = None) -> str:
+    """Cache namespace for vectors of `model_name`; quantized vectors are kept apart from PyTorch ones."""
+    backend = (backend or EMBEDDING_BACKEND).lower()
+    return model_name if backend == "torch" else f"{model_name}@{backend}-int8"
+
+
+def load_embedding_model(model_name: str = DEFAULT_MODEL_NAME, backend: Optional[str] = None, device: str = "cpu") -> Embeddings:
+    """
+    Builds the sentence embedder for `model_name` on the configured backend.
+
+    Args:
+        model_name: sentence-transformers model id.
+        backend: "torch" or "onnx" (default: EMBEDDING_BACKEND).
+        device: Torch device; the ONNX backend always runs on CPU.
+
+    Returns:
+        A LangChain Embeddings producing L2-normalized vectors.
+    """
+    backend = (backend or EMBEDDING_BACKEND).lower()
+    if backend == "onnx":
+        return OnnxSentenceEmbeddings(onnx_model_dir(model_name))
+    if backend != "torch":
+        raise ValueError(f"Unknown embedding backend: {backend}")
+
+    from langchain_huggingface import HuggingFaceEmbeddings
+    return HuggingFaceEmbeddings(
+        model_name=model_name,
+        model_kwargs={'device': device},
+        encode_kwargs={'normalize_embeddings': True}
+    )
+
+
+# ---------- shared instances ----------
+
+def _resource_name(model_name: str, device: str, backend: str) -> str:
+    # Hub ids are case-insensitive ("all-MiniLM-l6-v2" and "all-MiniLM-L6-v2" are one model)
+    return f"embeddings:{model_name.lower()}@{device}/{backend}"
+
+
+def shared_embedding_model(model_name: str = DEFAULT_MODEL_NAME, device: str = "cpu",
+                           backend: Optional[str] = None, warm_up: bool = True) -> Callable[[], Embeddings]:
+    """
+    Getter for the process-wide instance of `model_name` on `device`.
+
+    Every caller asking for the same (model, device, backend) gets the same
+    loaded model, so the resume matcher and the RAG retriever share one copy.
+    The instance lives in the resource registry, so it is built lazily (or
+    during warm-up / preload_embedding_models) and shows up in /ready.
+    """
+    backend = (backend or EMBEDDING_BACKEND).lower()
+    return register_resource(
+        _resource_name(model_name, device, backend),
+        lambda: load_embedding_model(model_name, backend, device),
+        warm_up=warm_up,
+    )
+
+
+def get_embedding_model(model_name: str = DEFAULT_MODEL_NAME, device: str = "cpu",
+                        backend: Optional[str] = None) -> Embeddings:
+    """The shared instance of `model_name` on `device`, loading it on first use."""
+    return shared_embedding_model(model_name, device, backend)()
+
+
+def preload_embedding_models() -> Dict[str, Optional[float]]:
+    """
+    Loads every registered embedding model now. Meant for a server's parent
+    process before it forks workers, so the weights are shared copy-on-write.
+
+    Inference must not run before the fork (PyTorch's thread pools don't survive
+    it), and ONNX Runtime sessions are skipped: they start their own thread
+    pools when created.
+    """
+    registry = get_resource_registry()
+    names = [name for name in registry.stats()
+             if name.startswith("embeddings:") and not name.endswith("/onnx")]
+    return registry.warm_up(names)
+
+
+# ---------- export / parity ----------
+
+def export_onnx(model_name: str = DEFAULT_MODEL_NAME, output_dir: Optional[str] = None) -> str:
+    """
+    Exports the transformer to ONNX and applies dynamic int8 quantization.
+    Needs torch and transformers (only here, not at serving time).
+    """
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    output_dir = output_dir or onnx_model_dir(model_name)
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name).eval()
+
+    sample = tokenizer(["An example sentence."], return_tensors="pt")
+    fp32_path = os.path.join(output_dir, "model.onnx")
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"], sample["token_type_ids"]),
+            fp32_path,
+            input_names=["input_ids", "attention_mask", "token_type_ids"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={name: {0: "batch", 1: "sequence"}
+                          for name in ("input_ids", "attention_mask", "token_type_ids", "last_hidden_state")},
+            opset_version=17,
+        )
+    quantize_dynamic(fp32_path, os.path.join(output_dir, ONNX_MODEL_FILE), weight_type=QuantType.QInt8)
+    os.remove(fp32_path)
+    tokenizer.backend_tokenizer.save(os.path.join(output_dir, "tokenizer.json"))
+    with open(os.path.join(output_dir, "export.json"), "w") as f:
+        json.dump({"model_name": model_name, "max_seq_length": MAX_SEQ_LENGTH, "quantization": "dynamic-int8"}, f)
+    return output_dir
+
+
+def _sample_texts() -> List[str]:
+    """Resume / JD text from data/raw plus a few short queries."""
+    texts = [
+        "What is the difference between a process and a thread?",
+        "Explain retrieval-augmented generation.",
+        "Senior Python engineer with FastAPI, Docker and AWS experience.",
+    ]
+    jd_dir = os.path.join(PROJECT_ROOT, "data", "raw", "job_descriptions")
+    if os.path.isdir(jd_dir):
+        for name in sorted(os.listdir(jd_dir)):
+            with open(os.path.join(jd_dir, name), encoding="utf-8", errors="ignore") as f:
+                texts.append(f.read())
+    return texts
+
+
+def check_parity(model_name: str = DEFAULT_MODEL_NAME, texts: Optional[List[str]] = None) -> dict:
+    """
+    Compares the ONNX backend with PyTorch on the same texts.
+
+    Returns:
+        Per-vector cosine stats, the largest change in pairwise similarity
+        scores and whether every cosine is above PARITY_MIN_COSINE.
+    """
+    texts = texts or _sample_texts()
+    reference = np.array(load_embedding_model(model_name, "torch").embed_documents(texts))
+    candidate = np.array(load_embedding_model(model_name, "onnx").embed_documents(texts))
+
+    cosines = (reference * candidate).sum(axis=1)
+    score_drift = np.abs(reference @ reference.T - candidate @ candidate.T).max()
+    return {
+        "texts": len(texts),
+        "min_cosine": round(float(cosines.min()), 5),
+        "mean_cosine": round(float(cosines.mean()), 5),
+        "max_similarity_drift": round(float(score_drift), 5),
+        "passed": bool(cosines.min() >= PARITY_MIN_COSINE),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ONNX embedding backend tools")
+    parser.add_argument("command", choices=["export", "parity"])
+    parser.add_argument("--model", default=DEFAULT_MODEL_NAME)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        print(f"Exported to {export_onnx(args.model)}")
+        return
+    result = check_parity(args.model)
+    print(json.dumps(result, indent=2))
+    sys.exit(0 if result["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Micro-batching embedding worker.
+
+Concurrent callers each submit a few texts (a resume and a JD, a query).
+Instead of one small model forward pass per caller, a background thread
+collects submissions for up to `max_wait_ms` or `max_batch_size` texts,
+de-duplicates them, sorts them by length so each padded batch wastes little
+compute, runs the model once per batch and hands every caller its vectors
+through a Future.
+"""
+
+import os
+import time
+import queue
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+EMBEDDING_MAX_BATCH_SIZE = int(os.environ.get("EMBEDDING_MAX_BATCH_SIZE", 64))
+EMBEDDING_MAX_WAIT_MS = float(os.environ.get("EMBEDDING_MAX_WAIT_MS", 5))
+
+_STOP = object()
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces embedding requests from many threads/coroutines into batched model calls.
+
+    Args:
+        embed_fn: Embeds a list of texts (e.g. HuggingFaceEmbeddings.embed_documents).
+        max_batch_size: Max texts per model call.
+        max_wait_ms: How long the first request of a batch waits for company.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[List[str]], List[List[float]]],
+        max_batch_size: int = EMBEDDING_MAX_BATCH_SIZE,
+        max_wait_ms: float = EMBEDDING_MAX_WAIT_MS,
+        name: str = "embeddings",
+    ):
+        self.embed_fn = embed_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._stats = {"requests": 0, "texts": 0, "model_calls": 0, "model_texts": 0}
+        self._stats_lock = threading.Lock()
+        self._pid = os.getpid()
+        self._worker = threading.Thread(target=self._run, name=f"{name}-batcher", daemon=True)
+        self._worker.start()
+
+    # ---------- callers ----------
+
+    def submit(self, texts: List[str]) -> Future:
+        """Queues `texts`; the Future resolves to their vectors, in order."""
+        future: Future = Future()
+        if not texts:
+            future.set_result([])
+            return future
+        self._queue.put((list(texts), future))
+        return future
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Blocking embed through the batcher."""
+        return self.submit(texts).result()
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        """Awaitable embed through the batcher; doesn't block the event loop."""
+        return await asyncio.wrap_future(self.submit(texts))
+
+    def close(self) -> None:
+        self._queue.put(_STOP)
+        self._worker.join()
+
+    def stats(self) -> Dict[str, float]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["avg_texts_per_model_call"] = round(stats["model_texts"] / stats["model_calls"], 2) if stats["model_calls"] else 0.0
+        return stats
+
+    # ---------- worker ----------
+
+    def _collect(self, first) -> Tuple[List[Tuple[List[str], Future]], bool]:
+        """Gathers requests until the batch is full or the first one has waited max_wait."""
+        batch = [first]
+        size = len(first[0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+            size += len(item[0])
+        return batch, False
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch, stop = self._collect(first)
+            self._process(batch)
+            if stop:
+                return
+
+    def _process(self, batch: List[Tuple[List[str], Future]]) -> None:
+        requests = [(texts, future) for texts, future in batch if future.set_running_or_notify_cancel()]
+        # Distinct texts, longest first, so each model call pads to similar lengths.
+        unique = sorted({text for texts, _ in requests for text in texts}, key=len, reverse=True)
+        vectors: Dict[str, List[float]] = {}
+        try:
+            for start in range(0, len(unique), self.max_batch_size):
+                chunk = unique[start:start + self.max_batch_size]
+                vectors.update(zip(chunk, self.embed_fn(chunk)))
+                with self._stats_lock:
+                    self._stats["model_calls"] += 1
+                    self._stats["model_texts"] += len(chunk)
+        except Exception as e:
+            for _, future in requests:
+                future.set_exception(e)
+            return
+
+        with self._stats_lock:
+            self._stats["requests"] += len(requests)
+            self._stats["texts"] += sum(len(texts) for texts, _ in requests)
+        for texts, future in requests:
+            future.set_result([vectors[text] for text in texts])
+
+
+_batchers: Dict[str, EmbeddingBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_embedding_batcher(name: str, embed_fn: Optional[Callable[[List[str]], List[List[float]]]] = None) -> EmbeddingBatcher:
+    """
+    Get the process-wide batcher called `name`, creating it with `embed_fn` on first use.
+    """
+    with _batchers_lock:
+        # A batcher inherited through fork has no worker thread; build a fresh one.
+        if name not in _batchers or _batchers[name]._pid != os.getpid():
+            if embed_fn is None and name not in _batchers:
+                raise KeyError(f"Embedding batcher '{name}' has not been created")
+            embed_fn = embed_fn or _batchers[name].embed_fn
+            _batchers[name] = EmbeddingBatcher(embed_fn, name=name)
+        return _batchers[name]
@@ -0,0 +1,316 @@
+"""
+Persistent embedding cache.
+
+Vectors are keyed by (model name, hash of the whitespace-normalized text), so
+a JD that was embedded once is never embedded again, in this process or any
+other worker sharing the directory.
+
+Two tiers:
+- RAM: an LRU of recently used vectors.
+- Disk: one directory per model with an append-only `vectors.bin` (rows of
+  float32 or float16, read through a memory map) and a compact `index.bin`
+  holding one 16-byte text digest per row. Appends take an exclusive file
+  lock, and readers pick up rows appended by other processes on a miss.
+"""
+
+import os
+import re
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DEFAULT_STORE_DIR = os.path.join(PROJECT_ROOT, "data", "cache", "embeddings")
+
+EMBEDDING_STORE_ENABLED = os.environ.get("EMBEDDING_STORE_ENABLED", "true").lower() not in ("0", "false", "no")
+EMBEDDING_STORE_DIR = os.environ.get("EMBEDDING_STORE_DIR", DEFAULT_STORE_DIR)
+EMBEDDING_STORE_DTYPE = os.environ.get("EMBEDDING_STORE_DTYPE", "float32")
+EMBEDDING_STORE_RAM_ITEMS = int(os.environ.get("EMBEDDING_STORE_RAM_ITEMS", 10000))
+
+DIGEST_SIZE = 16
+_WHITESPACE = re.compile(r"\s+")
+
+
+def text_digest(text: str) -> bytes:
+    """16-byte digest of the whitespace-normalized text."""
+    normalized = _WHITESPACE.sub(" ", text or "").strip()
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=DIGEST_SIZE).digest()
+
+
+def _model_dirname(model_name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "__", model_name)
+
+
+class _ModelShard:
+    """Append-only vector file + digest index for one model."""
+
+    def __init__(self, directory: str, model_name: str, dtype: str):
+        self.directory = directory
+        self.model_name = model_name
+        os.makedirs(directory, exist_ok=True)
+        self._vectors_path = os.path.join(directory, "vectors.bin")
+        self._index_path = os.path.join(directory, "index.bin")
+        self._meta_path = os.path.join(directory, "meta.json")
+        self._lock_path = os.path.join(directory, ".lock")
+
+        self.dtype = np.dtype(dtype)
+        self.dim: Optional[int] = None
+        self._rows: Dict[bytes, int] = {}
+        self._index_offset = 0
+        self._mmap: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path) as f:
+                meta = json.load(f)
+            # The file format is fixed by whoever created the shard.
+            self.dtype, self.dim = np.dtype(meta["dtype"]), meta["dim"]
+        self._refresh_index()
+
+    # ---------- file locking ----------
+
+    def _exclusive(self):
+        handle = open(self._lock_path, "a+")
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    @staticmethod
+    def _release(handle) -> None:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+        handle.close()
+
+    # ---------- reading ----------
+
+    @property
+    def _row_bytes(self) -> int:
+        return self.dim * self.dtype.itemsize
+
+    def _complete_rows(self) -> int:
+        if self.dim is None or not os.path.exists(self._vectors_path):
+            return 0
+        return os.path.getsize(self._vectors_path) // self._row_bytes
+
+    def _refresh_index(self) -> None:
+        """Reads index records appended (by any process) since the last refresh."""
+        if not os.path.exists(self._index_path):
+            return
+        if self.dim is None and os.path.exists(self._meta_path):
+            with open(self._meta_path) as f:
+                meta = json.load(f)
+            self.dtype, self.dim = np.dtype(meta["dtype"]), meta["dim"]
+        with open(self._index_path, "rb") as f:
+            f.seek(self._index_offset)
+            data = f.read()
+        usable = len(data) - len(data) % DIGEST_SIZE
+        # Never trust index records whose vector row isn't fully written.
+        usable = min(usable, max(0, self._complete_rows() * DIGEST_SIZE - self._index_offset))
+        first_row = self._index_offset // DIGEST_SIZE
+        for i in range(0, usable, DIGEST_SIZE):
+            self._rows.setdefault(data[i:i + DIGEST_SIZE], first_row + i // DIGEST_SIZE)
+        self._index_offset += usable
+
+    def _vector_at(self, row: int) -> np.ndarray:
+        if self._mmap is None or row >= self._mmap.shape[0]:
+            self._mmap = np.memmap(self._vectors_path, dtype=self.dtype, mode="r",
+                                   shape=(self._complete_rows(), self.dim))
+        return np.asarray(self._mmap[row], dtype=np.float32)
+
+    def get(self, digest: bytes) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self._rows.get(digest)
+            if row is None:
+                self._refresh_index()
+                row = self._rows.get(digest)
+            return None if row is None else self._vector_at(row)
+
+    # ---------- writing ----------
+
+    def append(self, items: Dict[bytes, np.ndarray]) -> None:
+        if not items:
+            return
+        with self._lock:
+            handle = self._exclusive()
+            try:
+                self._refresh_index()
+                new = {d: v for d, v in items.items() if d not in self._rows}
+                if not new:
+                    return
+                if self.dim is None:
+                    self.dim = len(next(iter(new.values())))
+                    with open(self._meta_path, "w") as f:
+                        json.dump({"model": self.model_name, "dim": self.dim, "dtype": self.dtype.name}, f)
+
+                # Drop any torn tail left by a crashed writer, so rows stay aligned with the index.
+                start_row = self._index_offset // DIGEST_SIZE
+                with open(self._vectors_path, "ab") as vectors:
+                    vectors.truncate(start_row * self._row_bytes)
+                    block = np.stack([np.asarray(v, dtype=self.dtype) for v in new.values()])
+                    vectors.write(block.tobytes())
+                    vectors.flush()
+                    os.fsync(vectors.fileno())
+                # The index is written after the vectors, so readers never see a row before its data.
+                with open(self._index_path, "ab") as index:
+                    index.truncate(self._index_offset)
+                    index.write(b"".join(new.keys()))
+                for i, digest in enumerate(new):
+                    self._rows[digest] = start_row + i
+                self._index_offset += len(new) * DIGEST_SIZE
+            finally:
+                self._release(handle)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+class EmbeddingStore:
+    """
+    Two-tier (LRU RAM + memory-mapped disk) embedding cache.
+
+    Args:
+        directory: Root directory; each model gets its own subdirectory.
+        dtype: On-disk precision, "float32" or "float16" (half the size).
+        ram_items: Max vectors kept in the in-RAM LRU tier.
+    """
+
+    def __init__(self, directory: str = EMBEDDING_STORE_DIR, dtype: str = EMBEDDING_STORE_DTYPE,
+                 ram_items: int = EMBEDDING_STORE_RAM_ITEMS):
+        self.directory = directory
+        self.dtype = dtype
+        self.ram_items = ram_items
+        self._ram: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._shards: Dict[str, _ModelShard] = {}
+        self._lock = threading.Lock()
+        self._stats = {"ram_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    def _shard(self, model_name: str) -> _ModelShard:
+        with self._lock:
+            if model_name not in self._shards:
+                path = os.path.join(self.directory, _model_dirname(model_name))
+                self._shards[model_name] = _ModelShard(path, model_name, self.dtype)
+            return self._shards[model_name]
+
+    def _remember(self, key: tuple, vector: np.ndarray) -> None:
+        with self._lock:
+            self._ram[key] = vector
+            self._ram.move_to_end(key)
+            while len(self._ram) > self.ram_items:
+                self._ram.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def get_many(self, model_name: str, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Cached float32 vectors for `texts` (None where not cached)."""
+        shard = self._shard(model_name)
+        results: List[Optional[np.ndarray]] = []
+        for text in texts:
+            key = (model_name, text_digest(text))
+            with self._lock:
+                vector = self._ram.get(key)
+                if vector is not None:
+                    self._ram.move_to_end(key)
+                    self._stats["ram_hits"] += 1
+            if vector is None:
+                vector = shard.get(key[1])
+                with self._lock:
+                    self._stats["disk_hits" if vector is not None else "misses"] += 1
+                if vector is not None:
+                    self._remember(key, vector)
+            results.append(vector)
+        return results
+
+    def put_many(self, model_name: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """Stores vectors for `texts` in both tiers."""
+        items = {}
+        for text, vector in zip(texts, vectors):
+            digest = text_digest(text)
+            array = np.asarray(vector, dtype=np.float32)
+            items[digest] = array
+            self._remember((model_name, digest), array)
+        self._shard(model_name).append(items)
+
+    def embed(
+        self,
+        model_name: str,
+        texts: Sequence[str],
+        embed_fn: Callable[[List[str]], List[List[float]]],
+    ) -> List[List[float]]:
+        """
+        Returns embeddings for `texts`, computing only the uncached ones.
+
+        Args:
+            model_name: Cache namespace (model name plus anything that changes the vectors).
+            texts: Texts to embed.
+            embed_fn: Embeds a list of texts (called once, with the distinct misses).
+
+        Returns:
+            One vector (list of floats) per input text, in order.
+        """
+        cached = self.get_many(model_name, texts)
+        # One model input per distinct normalized text
+        missing: Dict[bytes, str] = {}
+        for text, vector in zip(texts, cached):
+            if vector is None:
+                missing.setdefault(text_digest(text), text)
+        if missing:
+            computed = dict(zip(missing, embed_fn(list(missing.values()))))
+            self.put_many(model_name, list(missing.values()), [computed[d] for d in missing])
+            cached = [v if v is not None else np.asarray(computed[text_digest(t)], dtype=np.float32)
+                      for t, v in zip(texts, cached)]
+        return [v.tolist() for v in cached]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats, ram_items=len(self._ram))
+            stats["disk_items"] = {name: len(shard) for name, shard in self._shards.items()}
+        return stats
+
+
+class CachedEmbeddings(Embeddings):
+    """LangChain Embeddings wrapper that serves documents and queries from the EmbeddingStore."""
+
+    def __init__(self, embeddings: Embeddings, model_name: str):
+        self.embeddings = embeddings
+        self.model_name = model_name
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not embedding_store_enabled():
+            return self.embeddings.embed_documents(texts)
+        return get_embedding_store().embed(self.model_name, texts, self.embeddings.embed_documents)
+
+    def embed_query(self, text: str) -> List[float]:
+        if not embedding_store_enabled():
+            return self.embeddings.embed_query(text)
+        # Queries may be encoded differently from documents, so they get their own namespace.
+        return get_embedding_store().embed(
+            f"{self.model_name}#query", [text], lambda texts: [self.embeddings.embed_query(texts[0])]
+        )[0]
+
+
+def embedding_store_enabled() -> bool:
+    return EMBEDDING_STORE_ENABLED
+
+
+# Singleton instance
+_embedding_store: Optional[EmbeddingStore] = None
+_embedding_store_lock = threading.Lock()
+
+
+def get_embedding_store() -> EmbeddingStore:
+    """Get the process-wide EmbeddingStore."""
+    global _embedding_store
+    if _embedding_store is None:
+        with _embedding_store_lock:
+            if _embedding_store is None:
+                _embedding_store = EmbeddingStore()
+    return _embedding_store
@@ -0,0 +1,307 @@
+"""
+Shared JSON extraction for LLM responses.
+
+Replaces the fenced-JSON parsing that used to be copy-pasted across modules:
+- `JSONStreamParser` pulls complete JSON values (or the items of a top-level
+  array) out of a token stream as soon as they close.
+- `repair_json` fixes common local damage: trailing commas, unterminated
+  strings, truncated literals and unclosed brackets from a cut-off response.
+- `extract_json` parses a response and reports which required fields are
+  missing, and `fill_missing_fields` re-requests only those fields instead
+  of regenerating the whole answer.
+"""
+
+import re
+import json
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Tuple
+
+_FENCED_BLOCK = re.compile(r"```(?:json|JSON)?\s*\n?(.*?)(?:\n?```|$)", re.DOTALL)
+_CONTROL_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_PARTIAL_LITERAL = re.compile(r"(?<![\w\"])(t|tr|tru|f|fa|fal|fals|n|nu|nul)$")
+_LITERALS = {"t": "true", "f": "false", "n": "null"}
+
+_EMPTY = (None, "", [], {})
+
+
+def _loads(text: str) -> Any:
+    # strict=False tolerates raw newlines/tabs inside strings, which LLMs emit often
+    return json.loads(text, strict=False)
+
+
+def strip_to_json(text: str) -> str:
+    """Removes markdown fences, control characters and any prose before the first { or [."""
+    if not text:
+        return ""
+    text = text.strip()
+    fenced = _FENCED_BLOCK.search(text)
+    if fenced and fenced.group(1).strip():
+        text = fenced.group(1).strip()
+    text = _CONTROL_CHARS.sub("", text)
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    return text[min(starts):] if starts else text
+
+
+def strip_trailing_commas(text: str) -> str:
+    """Removes commas directly before a closing } or ], leaving string contents untouched."""
+    out: List[str] = []
+    in_string = escape = False
+    pending_comma: Optional[int] = None
+    for ch in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == ",":
+            pending_comma = len(out)
+        elif ch in "}]" and pending_comma is not None:
+            del out[pending_comma]
+        elif ch == '"':
+            in_string = True
+        if not ch.isspace() and ch != ",":
+            pending_comma = None
+        out.append(ch)
+    return "".join(out)
+
+
+class JSONStreamParser:
+    """
+    Incremental JSON scanner for LLM token streams.
+
+    Feed chunks as they arrive; `feed` returns the values completed by that
+    chunk. With `emit_items=True`, the elements of a top-level array are
+    returned one by one as each closes, so e.g. generated questions can be
+    used before the array ends. Text outside JSON values is ignored.
+    """
+
+    def __init__(self, emit_items: bool = False):
+        self.emit_items = emit_items
+        self._reset()
+
+    def _reset(self) -> None:
+        self._buf: List[str] = []
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._item_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[Any]:
+        completed = []
+        for ch in chunk:
+            if not self._stack:
+                if ch in "{[":
+                    self._stack.append(ch)
+                    self._buf = [ch]
+                continue
+
+            self._buf.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._stack.append(ch)
+                if len(self._stack) == 2 and self._stack[0] == "[":
+                    self._item_start = len(self._buf) - 1
+            elif ch in "}]":
+                self._stack.pop()
+                if not self._stack:
+                    value = self._parse("".join(self._buf))
+                    if value is not None and not (self.emit_items and isinstance(value, list)):
+                        completed.append(value)
+                    self._reset()
+                elif self.emit_items and len(self._stack) == 1 and self._item_start is not None:
+                    item = self._parse("".join(self._buf[self._item_start:]))
+                    if item is not None:
+                        completed.append(item)
+                    self._item_start = None
+        return completed
+
+    def finish(self) -> Any:
+        """Returns the repaired partial value left in the buffer (None if nothing is pending)."""
+        if not self._stack:
+            return None
+        value = self._parse(repair_json("".join(self._buf)))
+        self._reset()
+        return value
+
+    @staticmethod
+    def _parse(text: str) -> Any:
+        try:
+            return _loads(strip_trailing_commas(text))
+        except json.JSONDecodeError:
+            return None
+
+
+def repair_json(text: str) -> str:
+    """
+    Repairs common local damage in LLM JSON output.
+
+    Handles trailing commas, an unterminated final string, a dangling key or
+    comma, truncated true/false/null and unclosed objects/arrays, which is
+    what a response cut off by max_tokens usually looks like.
+    """
+    text = strip_to_json(text)
+    stack: List[str] = []
+    in_string = escape = False
+    for ch in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]" and stack:
+            stack.pop()
+
+    if in_string:
+        text += "\\" if escape else ""
+        text += '"'
+    text = text.rstrip()
+
+    literal = _PARTIAL_LITERAL.search(text)
+    if literal:
+        text = text[: literal.start()] + _LITERALS[literal.group(1)[0]]
+    text = re.sub(r"[-+.eE]+$", "", text) if re.search(r"\d[-+.eE]+$", text) else text
+
+    if stack and stack[-1] == "}":
+        # A key with no value yet: drop it along with its colon.
+        text = re.sub(r'([{,])\s*"(?:[^"\\]|\\.)*"\s*:?\s*$', r"\1", text)
+    text = re.sub(r"[,:]\s*$", "", text.rstrip())
+
+    text += "".join(reversed(stack))
+    return strip_trailing_commas(text)
+
+
+def parse_json(text: str, default: Any = None) -> Any:
+    """
+    Parses the JSON value in an LLM response.
+
+    Tries a direct parse, then the first complete value in the text (ignoring
+    trailing prose), then a local repair. Returns `default` if all fail.
+    """
+    return _parse_with_flag(text, default)[0]
+
+
+def _parse_with_flag(text: str, default: Any) -> Tuple[Any, bool]:
+    candidate = strip_to_json(text)
+    if not candidate:
+        return default, False
+    try:
+        return _loads(candidate), False
+    except json.JSONDecodeError:
+        pass
+
+    values = JSONStreamParser().feed(candidate)
+    if values:
+        return values[0], False
+    try:
+        return _loads(repair_json(candidate)), True
+    except json.JSONDecodeError:
+        return default, False
+
+
+def missing_fields(value: Any, required: Iterable[str]) -> List[str]:
+    """Required top-level keys that are absent or empty in `value`."""
+    if not isinstance(value, dict):
+        return list(required)
+    return [key for key in required if value.get(key) in _EMPTY]
+
+
+@dataclass
+class JSONExtraction:
+    """Result of `extract_json`."""
+    value: Any
+    repaired: bool = False
+    missing: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.value is not None and not self.missing
+
+
+def extract_json(text: str, required_fields: Iterable[str] = (), default: Any = None) -> JSONExtraction:
+    """
+    Parses an LLM response and reports what is missing.
+
+    Args:
+        text: Raw response content.
+        required_fields: Top-level keys the caller needs.
+        default: Value used when nothing can be parsed.
+
+    Returns:
+        JSONExtraction with the parsed value, whether it needed repair and
+        the required fields still missing.
+    """
+    required = list(required_fields)
+    value, repaired = _parse_with_flag(text, None)
+    if value is None:
+        return JSONExtraction(default, False, required)
+    return JSONExtraction(value, repaired, missing_fields(value, required) if required else [])
+
+
+def missing_fields_prompt(original_prompt: str, partial: dict, missing: List[str]) -> str:
+    """Follow-up prompt asking only for `missing` keys, given what was already produced."""
+    return (
+        f"{original_prompt}\n\n"
+        f"An earlier answer already provided these fields:\n{json.dumps(partial, default=str)}\n\n"
+        f"Return ONLY a JSON object containing the missing keys: {', '.join(missing)}. "
+        "Do not repeat the other keys."
+    )
+
+
+def _merge_missing(value: dict, reply: str, missing: List[str]) -> dict:
+    extra = parse_json(reply, default={})
+    if isinstance(extra, dict):
+        for key in missing:
+            if extra.get(key) not in _EMPTY:
+                value[key] = extra[key]
+    return value
+
+
+def fill_missing_fields(
+    result: JSONExtraction,
+    original_prompt: str,
+    ask: Callable[[str], str],
+) -> JSONExtraction:
+    """
+    Re-requests only the missing fields of a partially valid object.
+
+    Args:
+        result: Output of `extract_json` for the first response.
+        original_prompt: Prompt that produced it (gives the model context).
+        ask: Calls the LLM with a prompt and returns the response text.
+    """
+    if result.ok or not isinstance(result.value, dict):
+        return result
+    reply = ask(missing_fields_prompt(original_prompt, result.value, result.missing))
+    value = _merge_missing(result.value, reply, result.missing)
+    return JSONExtraction(value, result.repaired, missing_fields(value, result.missing))
+
+
+async def afill_missing_fields(
+    result: JSONExtraction,
+    original_prompt: str,
+    ask: Callable[[str], Awaitable[str]],
+) -> JSONExtraction:
+    """Async counterpart of `fill_missing_fields`."""
+    if result.ok or not isinstance(result.value, dict):
+        return result
+    reply = await ask(missing_fields_prompt(original_prompt, result.value, result.missing))
+    value = _merge_missing(result.value, reply, result.missing)
+    return JSONExtraction(value, result.repaired, missing_fields(value, result.missing))
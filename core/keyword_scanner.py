@@ -0,0 +1,106 @@
+"""
+Single-pass multi-keyword matching.
+
+A KeywordScanner compiles a keyword list once; scanning a text then finds
+every occurrence of every keyword in a single pass over the text, however
+many keywords there are. Matching is plain substring matching (the same as
+`keyword in text`), overlaps included: "data analysis" and "analysis" both
+hit in "data analysis".
+
+The scan runs in C: an Aho-Corasick automaton from pyahocorasick when it is
+installed, otherwise one regex compiled from a trie of the keywords and run
+with `finditer`.
+
+Keywords are lowercased at build time; pass text that is already lowercased
+(lowercase a resume once and scan it with as many scanners as needed).
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # fall back to the trie regex
+    ahocorasick = None
+
+
+def _trie_pattern(trie: dict) -> str:
+    """Regex for a trie node: longest keyword first, shorter ones via optional tails."""
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(trie.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    return f"(?:{body})?" if "" in trie else body
+
+
+class KeywordScanner:
+    """
+    Multi-keyword matcher over a fixed set of keywords.
+
+    Args:
+        keywords: Keywords to match (lowercased; duplicates and empty strings are dropped).
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: Tuple[str, ...] = tuple(dict.fromkeys(k.lower() for k in keywords if k))
+        self._automaton = None
+        self._pattern = None
+        if not self.keywords:
+            return
+        if ahocorasick is not None:
+            self._build_automaton()
+        else:
+            self._build_pattern()
+
+    def _build_automaton(self) -> None:
+        automaton = ahocorasick.Automaton()
+        for index, keyword in enumerate(self.keywords):
+            automaton.add_word(keyword, (index, len(keyword) - 1))
+        automaton.make_automaton()
+        self._automaton = automaton
+
+    def _build_pattern(self) -> None:
+        trie: dict = {}
+        for index, keyword in enumerate(self.keywords):
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = index
+
+        # The lookahead reports the longest keyword starting at each position;
+        # every other keyword starting there is one of its prefixes.
+        self._prefixes: Dict[str, Tuple[int, ...]] = {}
+        for keyword in self.keywords:
+            node, found = trie, []
+            for char in keyword:
+                node = node[char]
+                if "" in node:
+                    found.append(node[""])
+            self._prefixes[keyword] = tuple(found)
+        self._pattern = re.compile(f"(?=({_trie_pattern(trie)}))")
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yields (start, keyword index) for every occurrence."""
+        if self._automaton is not None:
+            for end, (index, offset) in self._automaton.iter(text):
+                yield end - offset, index
+        elif self._pattern is not None:
+            prefixes = self._prefixes
+            for match in self._pattern.finditer(text):
+                start = match.start()
+                for index in prefixes[match.group(1)]:
+                    yield start, index
+
+    def count_all(self, text: str) -> List[int]:
+        """Occurrences of each keyword in `text`, in keyword order."""
+        counts = [0] * len(self.keywords)
+        for _, index in self.iter_matches(text):
+            counts[index] += 1
+        return counts
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """Occurrences of the keywords found in `text` (keywords not found are omitted)."""
+        return {keyword: count for keyword, count in zip(self.keywords, self.count_all(text)) if count}
+
+    def __len__(self) -> int:
+        return len(self.keywords)
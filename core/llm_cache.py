@@ -0,0 +1,250 @@
+"""
+Content-addressed cache for LLM responses.
+
+The LLM gateway (core.llm_gateway) consults this cache before every ChatGroq
+call, keying the response on (model name, temperature, the model's other request
+parameters, hash of the normalized prompt).
+Lookups hit a bounded in-memory LRU first and then a persistent SQLite tier
+with TTL and size-based eviction, so re-running a match or a resume parse on
+the same input skips the round-trip to Groq entirely. Callers that want a
+fresh answer on purpose (regenerating portfolio sections, a new set of
+interview questions) pass use_cache=False to the gateway.
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DEFAULT_CACHE_PATH = os.path.join(PROJECT_ROOT, "data", "cache", "llm_cache.sqlite3")
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_MEMORY_ENTRIES = 512
+DEFAULT_MAX_DISK_MB = 256
+
+
+def normalize_prompt(prompt: Any) -> str:
+    """
+    Normalizes a prompt so that cosmetic differences (indentation, trailing
+    whitespace, blank lines) map to the same cache key.
+    Accepts a plain string or a list of LangChain messages / (role, content) tuples.
+    """
+    if isinstance(prompt, str):
+        text = prompt
+    elif isinstance(prompt, (list, tuple)):
+        parts = []
+        for message in prompt:
+            if hasattr(message, "content"):
+                parts.append(f"{getattr(message, 'type', 'message')}: {message.content}")
+            elif isinstance(message, (list, tuple)) and len(message) == 2:
+                parts.append(f"{message[0]}: {message[1]}")
+            else:
+                parts.append(str(message))
+        text = "\n".join(parts)
+    else:
+        text = str(prompt)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def make_cache_key(model_name: str, temperature: Optional[float], prompt: Any,
+                   params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Builds the content address for a prompt: model name, temperature, any
+    other generation parameters (max_tokens, stop, ...) and a SHA-256 of the
+    normalized prompt.
+    """
+    prompt_hash = hashlib.sha256(normalize_prompt(prompt).encode("utf-8")).hexdigest()
+    temp = "default" if temperature is None else f"{float(temperature):.3f}"
+    extra = json.dumps(params, sort_keys=True, default=str) if params else ""
+    return hashlib.sha256(f"{model_name}|{temp}|{extra}|{prompt_hash}".encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Two-tier LLM response cache.
+
+    - Memory tier: OrderedDict LRU bounded by `max_memory_entries`.
+    - Disk tier: SQLite table bounded by `max_disk_bytes`; least recently
+      accessed rows are evicted first and rows older than `ttl_seconds` expire.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = DEFAULT_CACHE_PATH,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_memory_entries: int = DEFAULT_MAX_MEMORY_ENTRIES,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_MB * 1024 * 1024,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+        self._conn = None
+        if path:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    model TEXT,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(accessed_at)")
+            self._conn.commit()
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, value: str, created_at: float) -> None:
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the cached response text for `key`, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if not self._is_expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, created_at = row
+                    if self._is_expired(created_at, now):
+                        self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                        self._conn.commit()
+                    else:
+                        self._conn.execute(
+                            "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+                        )
+                        self._conn.commit()
+                        self._remember(key, value, created_at)
+                        self._stats["disk_hits"] += 1
+                        return value
+
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, key: str, value: str, model: Optional[str] = None) -> None:
+        """Stores a response in both tiers and enforces the disk size budget."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            self._stats["writes"] += 1
+            if self._conn is None:
+                return
+            size = len(value.encode("utf-8"))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, value, size, now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        """Drops expired rows, then least recently accessed rows until under budget."""
+        if self.ttl_seconds > 0:
+            cursor = self._conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            self._stats["evictions"] += max(cursor.rowcount, 0)
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM llm_cache ORDER BY accessed_at ASC").fetchall()
+        stale_keys = []
+        for key, size in rows:
+            if total <= self.max_disk_bytes:
+                break
+            stale_keys.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", stale_keys)
+        self._stats["evictions"] += len(stale_keys)
+
+    def clear_memory(self) -> None:
+        """Empties the memory tier only (e.g. after another process cleared the disk tier)."""
+        with self._lock:
+            self._memory.clear()
+
+    def clear(self) -> None:
+        """Empties both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM llm_cache")
+                self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit/miss/eviction counters since process start."""
+        with self._lock:
+            return dict(self._stats, memory_entries=len(self._memory))
+
+
+# Singleton instance
+_llm_cache: Optional[LLMCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def llm_cache_enabled() -> bool:
+    return os.environ.get("LLM_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+
+
+def get_llm_cache() -> LLMCache:
+    """Get the process-wide LLMCache, configured from environment variables."""
+    global _llm_cache
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = LLMCache(
+                    path=os.environ.get("LLM_CACHE_PATH", DEFAULT_CACHE_PATH) or None,
+                    ttl_seconds=int(os.environ.get("LLM_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+                    max_memory_entries=int(os.environ.get("LLM_CACHE_MAX_MEMORY_ENTRIES", DEFAULT_MAX_MEMORY_ENTRIES)),
+                    max_disk_bytes=int(os.environ.get("LLM_CACHE_MAX_DISK_MB", DEFAULT_MAX_DISK_MB)) * 1024 * 1024,
+                )
+    return _llm_cache
+
+
+def cache_key_for(llm, prompt: Any) -> str:
+    """
+    Cache key for invoking `llm` (a ChatGroq-like model) with `prompt`.
+    The model's default request parameters are part of the key, so two
+    clients that differ only in e.g. max_tokens don't share answers.
+    """
+    model_name = getattr(llm, "model_name", None) or type(llm).__name__
+    try:
+        params = dict(getattr(llm, "_default_params", None) or {})
+    except Exception:
+        params = {}
+    params.pop("callbacks", None)
+    return make_cache_key(model_name, getattr(llm, "temperature", None), prompt, params)
+
@@ -0,0 +1,494 @@
+"""
+Shared LLM gateway.
+
+Single place that builds ChatGroq clients and runs LLM calls. All clients share
+one HTTP connection pool, and every call passes through:
+1. the LLM response cache (core.llm_cache),
+2. single-flight coalescing of identical in-flight prompts (core.single_flight),
+3. a fair per-model concurrency limit shared by sync and async callers,
+4. per-model token buckets for requests/minute and (estimated) tokens/minute,
+and is recorded by the LLM telemetry (core.llm_telemetry).
+
+The LangGraph pipelines use the sync `invoke_llm`; the FastAPI routers use
+`ainvoke_llm` / `abatch_llm` so they never block the event loop.
+"""
+
+import os
+import json
+import time
+import asyncio
+import threading
+from collections import deque
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+from langchain_groq import ChatGroq
+from langchain_core.messages import AIMessage
+from langchain_core.rate_limiters import BaseRateLimiter
+
+from core.llm_cache import cache_key_for, get_llm_cache, llm_cache_enabled, normalize_prompt
+from core.single_flight import get_single_flight, single_flight_stats
+from core import llm_telemetry
+
+# Groq per-model limits (requests/minute, tokens/minute) plus how many calls we
+# allow in flight at once. Override with LLM_GATEWAY_LIMITS='{"model": {...}}'.
+DEFAULT_MODEL_LIMITS = {
+    "llama-3.1-8b-instant": {"concurrency": 8, "rpm": 30, "tpm": 6000},
+    "llama-3.3-70b-versatile": {"concurrency": 4, "rpm": 30, "tpm": 12000},
+    "openai/gpt-oss-120b": {"concurrency": 4, "rpm": 30, "tpm": 8000},
+}
+FALLBACK_LIMITS = {"concurrency": 4, "rpm": 30, "tpm": 6000}
+
+# Point every pipeline at another Groq-compatible endpoint, e.g. the offline
+# stub in benchmarks/groq_stub_server.py (GROQ_BASE_URL=http://localhost:8001).
+GROQ_BASE_URL = os.environ.get("GROQ_BASE_URL") or None
+
+MAX_CONNECTIONS = int(os.environ.get("LLM_GATEWAY_MAX_CONNECTIONS", 50))
+MAX_RATE_LIMIT_RETRIES = int(os.environ.get("LLM_GATEWAY_MAX_RETRIES", 2))
+
+
+def estimate_tokens(prompt: Any) -> int:
+    """Rough token estimate (~4 characters per token) used for TPM budgeting."""
+    return max(1, len(normalize_prompt(prompt)) // 4)
+
+
+class TokenBucket(BaseRateLimiter):
+    """
+    Reservation-based token bucket usable from threads and coroutines.
+
+    Each caller reserves its cost immediately and is told how long to wait,
+    so waiting callers are served in arrival order instead of racing.
+    Also plugs into ChatGroq's `rate_limiter` hook, so chains that call the
+    model directly are throttled by the same bucket.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, cost: float = 1.0) -> float:
+        """Reserves `cost` tokens and returns the seconds to wait before using them."""
+        cost = min(cost, self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= cost
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def try_reserve(self, cost: float = 1.0) -> bool:
+        cost = min(cost, self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens < cost:
+                return False
+            self._tokens -= cost
+            return True
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        if not blocking:
+            return self.try_reserve()
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+        return True
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        if not blocking:
+            return self.try_reserve()
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+        return True
+
+
+class _Waiter:
+    __slots__ = ("event", "loop", "future", "granted")
+
+    def __init__(self, event=None, loop=None, future=None):
+        self.event = event
+        self.loop = loop
+        self.future = future
+        self.granted = False
+
+
+class FairSemaphore:
+    """
+    FIFO concurrency limit shared by threads and coroutines.
+    Released slots are handed directly to the oldest waiter.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._in_use = 0
+        self._waiters: deque = deque()
+        self._lock = threading.Lock()
+
+    def _acquire_or_enqueue(self, waiter: _Waiter) -> bool:
+        with self._lock:
+            if self._in_use < self.limit and not self._waiters:
+                self._in_use += 1
+                return True
+            self._waiters.append(waiter)
+            return False
+
+    def acquire(self) -> None:
+        waiter = _Waiter(event=threading.Event())
+        if not self._acquire_or_enqueue(waiter):
+            waiter.event.wait()
+
+    async def aacquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(loop=loop, future=loop.create_future())
+        if self._acquire_or_enqueue(waiter):
+            return
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+            if waiter.granted:
+                self.release()
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            if not self._waiters:
+                self._in_use -= 1
+                return
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+        if waiter.event is not None:
+            waiter.event.set()
+        else:
+            waiter.loop.call_soon_threadsafe(_grant_future, waiter.future)
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+
+def _grant_future(future: asyncio.Future) -> None:
+    # A cancelled waiter releases its granted slot itself in aacquire().
+    if not future.done():
+        future.set_result(True)
+
+
+def _is_rate_limit_error(exc: Exception) -> bool:
+    return getattr(exc, "status_code", None) == 429 or type(exc).__name__ == "RateLimitError"
+
+
+def _retry_after_seconds(exc: Exception, attempt: int) -> float:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return float(2 ** attempt)
+
+
+class LLMGateway:
+    """Factory for shared ChatGroq clients and the entry point for all LLM calls."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        limits: Optional[Dict[str, Dict]] = None,
+        base_url: Optional[str] = None,
+    ):
+        self.api_key = api_key if api_key is not None else os.environ.get("GROQ_API_KEY")
+        self.base_url = base_url if base_url is not None else GROQ_BASE_URL
+        self.limits = {model: dict(config) for model, config in DEFAULT_MODEL_LIMITS.items()}
+        overrides = limits if limits is not None else json.loads(os.environ.get("LLM_GATEWAY_LIMITS", "{}"))
+        for model, config in overrides.items():
+            self.limits.setdefault(model, dict(FALLBACK_LIMITS)).update(config)
+
+        self._lock = threading.Lock()
+        self._models: Dict[tuple, ChatGroq] = {}
+        self._request_buckets: Dict[str, TokenBucket] = {}
+        self._token_buckets: Dict[str, TokenBucket] = {}
+        self._slots: Dict[str, FairSemaphore] = {}
+        self._http_client: Optional[httpx.Client] = None
+        self._http_async_client: Optional[httpx.AsyncClient] = None
+
+    # ---------- shared resources ----------
+
+    def _limits_for(self, model_name: str) -> Dict:
+        return self.limits.get(model_name, FALLBACK_LIMITS)
+
+    def _http_clients(self):
+        if self._http_client is None:
+            pool = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS)
+            timeout = httpx.Timeout(60.0, connect=10.0)
+            self._http_client = httpx.Client(limits=pool, timeout=timeout)
+            self._http_async_client = httpx.AsyncClient(limits=pool, timeout=timeout)
+        return self._http_client, self._http_async_client
+
+    def request_limiter(self, model_name: str) -> TokenBucket:
+        """Requests/minute bucket for a model (also used as ChatGroq's rate_limiter)."""
+        with self._lock:
+            if model_name not in self._request_buckets:
+                config = self._limits_for(model_name)
+                self._request_buckets[model_name] = TokenBucket(
+                    config["rpm"] / 60.0, capacity=config.get("burst", config["concurrency"])
+                )
+            return self._request_buckets[model_name]
+
+    def _token_limiter(self, model_name: str) -> TokenBucket:
+        with self._lock:
+            if model_name not in self._token_buckets:
+                tpm = self._limits_for(model_name)["tpm"]
+                self._token_buckets[model_name] = TokenBucket(tpm / 60.0, capacity=tpm)
+            return self._token_buckets[model_name]
+
+    def _slots_for(self, model_name: str) -> FairSemaphore:
+        with self._lock:
+            if model_name not in self._slots:
+                self._slots[model_name] = FairSemaphore(self._limits_for(model_name)["concurrency"])
+            return self._slots[model_name]
+
+    def get_chat_model(self, model_name: str, temperature: Optional[float] = None, **kwargs) -> ChatGroq:
+        """
+        Returns a shared ChatGroq client for (model, temperature, kwargs).
+        Clients are built on the shared HTTP pool and throttled by the model's
+        request bucket, so even direct chain usage respects the rate limit.
+        """
+        key = (model_name, temperature, tuple(sorted(kwargs.items())))
+        with self._lock:
+            if key in self._models:
+                return self._models[key]
+
+        api_key = self.api_key
+        if not api_key:
+            # Don't fail at import time: modules build their clients on import,
+            # and a stub server does not need a real key.
+            if not self.base_url:
+                print("Warning: GROQ_API_KEY not set; LLM calls will fail until it is (or GROQ_BASE_URL is set).")
+            api_key = "not-set"
+
+        http_client, http_async_client = self._http_clients()
+        params = {
+            "groq_api_key": api_key,
+            "model_name": model_name,
+            "rate_limiter": self.request_limiter(model_name),
+            "http_client": http_client,
+            "http_async_client": http_async_client,
+        }
+        if self.base_url:
+            params["base_url"] = self.base_url
+        if temperature is not None:
+            params["temperature"] = temperature
+        params["callbacks"] = [llm_telemetry.get_telemetry_handler()]
+        params.update(kwargs)
+        llm = ChatGroq(**params)
+
+        with self._lock:
+            return self._models.setdefault(key, llm)
+
+    # ---------- calls ----------
+
+    @staticmethod
+    def _model_name(llm) -> str:
+        return getattr(llm, "model_name", None) or type(llm).__name__
+
+    def _cache_lookup(self, llm, prompt):
+        """Returns (cache key, cached AIMessage or None)."""
+        key = cache_key_for(llm, prompt)
+        if not llm_cache_enabled():
+            return key, None
+        cached = get_llm_cache().get(key)
+        if cached is not None:
+            return key, AIMessage(content=cached, response_metadata={"cache_hit": True})
+        return key, None
+
+    def _cache_store(self, key, llm, response) -> None:
+        if llm_cache_enabled() and isinstance(response.content, str) and response.content.strip():
+            get_llm_cache().set(key, response.content, model=self._model_name(llm))
+
+    def _recheck(self, llm, prompt):
+        """Lets single-flight followers in other workers pick up the leader's cached answer."""
+        if not llm_cache_enabled():
+            return None
+        return lambda: self._cache_lookup(llm, prompt)[1]
+
+    def invoke(self, llm, prompt: Any, use_cache: bool = True):
+        """
+        Blocking call: cache -> single-flight -> concurrency slot -> token budget -> llm.invoke.
+        With use_cache=False the cached answer is ignored and the call isn't
+        coalesced with other callers (for "regenerate" paths); the fresh
+        answer still replaces the cached one.
+        """
+        call_site = llm_telemetry.find_call_site()
+        start = time.perf_counter()
+        if not use_cache:
+            with llm_telemetry.llm_call(call_site):
+                return self._invoke_uncached(cache_key_for(llm, prompt), llm, prompt)
+        key, cached = self._cache_lookup(llm, prompt)
+        if cached is not None:
+            llm_telemetry.record_call(call_site, self._model_name(llm), time.perf_counter() - start, cache="hit")
+            return cached
+
+        led = []
+
+        def lead():
+            led.append(True)
+            with llm_telemetry.llm_call(call_site):
+                return self._invoke_uncached(key, llm, prompt)
+
+        response = get_single_flight("llm").do(key, lead, recheck=self._recheck(llm, prompt))
+        if not led:
+            llm_telemetry.record_call(call_site, self._model_name(llm), time.perf_counter() - start, cache="coalesced")
+        return response
+
+    def _invoke_uncached(self, key, llm, prompt: Any):
+        model_name = self._model_name(llm)
+        slots = self._slots_for(model_name)
+        slots.acquire()
+        try:
+            wait = self._token_limiter(model_name).reserve(estimate_tokens(prompt))
+            if wait:
+                time.sleep(wait)
+            for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+                try:
+                    response = llm.invoke(prompt)
+                    break
+                except Exception as e:
+                    if not _is_rate_limit_error(e) or attempt == MAX_RATE_LIMIT_RETRIES:
+                        raise
+                    llm_telemetry.note_retry()
+                    time.sleep(_retry_after_seconds(e, attempt))
+        finally:
+            slots.release()
+
+        self._cache_store(key, llm, response)
+        return response
+
+    async def ainvoke(self, llm, prompt: Any, call_site: Optional[str] = None, use_cache: bool = True):
+        """Async counterpart of `invoke`; waiting callers queue in FIFO order."""
+        call_site = call_site or llm_telemetry.find_call_site()
+        start = time.perf_counter()
+        if not use_cache:
+            with llm_telemetry.llm_call(call_site):
+                return await self._ainvoke_uncached(cache_key_for(llm, prompt), llm, prompt)
+        key, cached = self._cache_lookup(llm, prompt)
+        if cached is not None:
+            llm_telemetry.record_call(call_site, self._model_name(llm), time.perf_counter() - start, cache="hit")
+            return cached
+
+        led = []
+
+        async def lead():
+            led.append(True)
+            with llm_telemetry.llm_call(call_site):
+                return await self._ainvoke_uncached(key, llm, prompt)
+
+        response = await get_single_flight("llm").ado(key, lead, recheck=self._recheck(llm, prompt))
+        if not led:
+            llm_telemetry.record_call(call_site, self._model_name(llm), time.perf_counter() - start, cache="coalesced")
+        return response
+
+    async def _ainvoke_uncached(self, key, llm, prompt: Any):
+        model_name = self._model_name(llm)
+        slots = self._slots_for(model_name)
+        await slots.aacquire()
+        try:
+            wait = self._token_limiter(model_name).reserve(estimate_tokens(prompt))
+            if wait:
+                await asyncio.sleep(wait)
+            for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+                try:
+                    response = await llm.ainvoke(prompt)
+                    break
+                except Exception as e:
+                    if not _is_rate_limit_error(e) or attempt == MAX_RATE_LIMIT_RETRIES:
+                        raise
+                    llm_telemetry.note_retry()
+                    await asyncio.sleep(_retry_after_seconds(e, attempt))
+        finally:
+            slots.release()
+
+        self._cache_store(key, llm, response)
+        return response
+
+    async def astream(self, llm, prompt: Any) -> AsyncIterator[str]:
+        """
+        Streams the response text chunk by chunk, holding a concurrency slot
+        until the stream ends. Streams are never cached or coalesced.
+        """
+        model_name = self._model_name(llm)
+        slots = self._slots_for(model_name)
+        await slots.aacquire()
+        try:
+            wait = self._token_limiter(model_name).reserve(estimate_tokens(prompt))
+            if wait:
+                await asyncio.sleep(wait)
+            async with aclosing(llm.astream(prompt)) as chunks:
+                async for chunk in chunks:
+                    if isinstance(chunk.content, str) and chunk.content:
+                        yield chunk.content
+        finally:
+            slots.release()
+
+    async def abatch(self, llm, prompts: List[Any]) -> List[Any]:
+        """Runs several prompts concurrently, bounded by the model's limits."""
+        # Tasks started by gather don't see the caller's stack, so resolve the call site here.
+        call_site = llm_telemetry.find_call_site()
+        return list(await asyncio.gather(*(self.ainvoke(llm, prompt, call_site) for prompt in prompts)))
+
+    def stats(self) -> Dict[str, Dict]:
+        """In-flight/queued counts per model plus single-flight counters."""
+        with self._lock:
+            models = {
+                model: {"in_flight": slots._in_use, "queued": slots.queued, "limit": slots.limit}
+                for model, slots in self._slots.items()
+            }
+        return {"models": models, "single_flight": single_flight_stats()}
+
+
+# Singleton instance
+_llm_gateway: Optional[LLMGateway] = None
+_llm_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Get the process-wide LLMGateway."""
+    global _llm_gateway
+    if _llm_gateway is None:
+        with _llm_gateway_lock:
+            if _llm_gateway is None:
+                _llm_gateway = LLMGateway()
+    return _llm_gateway
+
+
+def get_chat_model(model_name: str, temperature: Optional[float] = None, **kwargs) -> ChatGroq:
+    """Convenience function to get a shared ChatGroq client."""
+    return get_llm_gateway().get_chat_model(model_name, temperature, **kwargs)
+
+
+def invoke_llm(llm, prompt: Any, use_cache: bool = True):
+    """Convenience function for a blocking, cached, rate-limited LLM call."""
+    return get_llm_gateway().invoke(llm, prompt, use_cache=use_cache)
+
+
+async def ainvoke_llm(llm, prompt: Any, use_cache: bool = True):
+    """Convenience function for an async, cached, rate-limited LLM call."""
+    return await get_llm_gateway().ainvoke(llm, prompt, use_cache=use_cache)
+
+
+def astream_llm(llm, prompt: Any) -> AsyncIterator[str]:
+    """Convenience function for a rate-limited, streamed LLM call (text chunks)."""
+    return get_llm_gateway().astream(llm, prompt)
+
+
+async def abatch_llm(llm, prompts: List[Any]) -> List[Any]:
+    """Convenience function for a concurrent batch of LLM calls."""
+    return await get_llm_gateway().abatch(llm, prompts)
@@ -1,21 +1,19 @@
 import os
-import re
-import json
 import sys
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from core.utils import process_documents
 from core.embedding import calculate_resume_jd_similarity
+from core.llm_gateway import invoke_llm
+from core.resources import lazy_chat_model
+from core.json_extract import extract_json, fill_missing_fields
+from core.prompt_budget import truncate_to_tokens, strip_jd_boilerplate, RESUME_TOKEN_BUDGET, JD_TOKEN_BUDGET
 
 load_dotenv()
-groq_api_key = os.environ["GROQ_API_KEY"]
+get_groq_llm = lazy_chat_model("llama-3.1-8b-instant")
 
-if not groq_api_key:
-    raise ValueError("GROQ_API_KEY not found in environment variables. Please set it in your .env file.")
-
-groq_llm = ChatGroq(groq_api_key=groq_api_key, model_name="llama-3.1-8b-instant")
+INSIGHT_FIELDS = ["missing_skills", "improvements", "strengths", "weaknesses", "suggestions"]
 
 def generate_insights(resume_text: str, jd_text: str, similarity_score: float) -> dict:
     """
@@ -23,6 +21,10 @@ def generate_insights(resume_text: str, jd_text: str, similarity_score: float) -
     using an LLM. Insights include Missing Skills, Improvements, Strengths, Weaknesses,
     and Suggestions.
     """
+    groq_llm = get_groq_llm()
+    resume_text = truncate_to_tokens(resume_text, RESUME_TOKEN_BUDGET, groq_llm.model_name)
+    jd_text = truncate_to_tokens(strip_jd_boilerplate(jd_text), JD_TOKEN_BUDGET, groq_llm.model_name)
+
     prompt = f"""
 You are an AI assistant specialized in resume analysis and career counseling.
 Your task is to provide a detailed analysis of a candidate's resume against a given job description.
@@ -50,24 +52,18 @@ Format your response as a JSON object with the following keys: "missing_skills",
 """
 
     try:
-        response = groq_llm.invoke(prompt)
+        response = invoke_llm(groq_llm, prompt)
         # print("Raw LLM response:", response.content) 
-        json_string = response.content.strip()
-        start_index = json_string.find("```json")
-        end_index = json_string.find("```", start_index + len("```json"))
-
-        if start_index != -1 and end_index != -1:
-            json_string = json_string[start_index + len("```json\n") : end_index].strip()
-        else:
-            # If markdown not found, try to parse the whole string as a fallback
-            print("Warning: JSON markdown block not found. Attempting to parse raw response.")
-        cleaned_json_string = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f]', '', json_string)
-        insights = json.loads(cleaned_json_string)
-        return insights
-    except json.JSONDecodeError as e:
-        print(f"JSON Decode Error in generate_insights: {e}")
-        # Include a snippet of the problematic string for better debugging
-        return {"error": f"JSON parsing failed: {e}. Problematic string snippet: {cleaned_json_string[:200]}..."}
+        result = extract_json(response.content, INSIGHT_FIELDS)
+        if result.value is None:
+            print("JSON Decode Error in generate_insights: no JSON object in response")
+            # Include a snippet of the problematic string for better debugging
+            return {"error": f"JSON parsing failed. Problematic string snippet: {response.content[:200]}..."}
+        if result.missing and isinstance(result.value, dict):
+            # Ask only for the fields we didn't get instead of regenerating everything
+            print(f"Warning: insights missing {result.missing}, re-requesting only those fields.")
+            result = fill_missing_fields(result, prompt, lambda p: invoke_llm(groq_llm, p).content)
+        return result.value
     except Exception as e:
         print(f"Error generating insights with LLM: {e}")
         return {"error": str(e)}
@@ -0,0 +1,286 @@
+"""
+Per-call LLM telemetry.
+
+Every ChatGroq call is recorded with its call site (the function that asked
+for it, e.g. `website_planner_node` or `_self_heal_with_llm`), model, prompt
+and completion tokens, latency, retries, estimated cost and whether it was
+served from the cache, coalesced onto another in-flight call or sent to Groq.
+
+Records go to two places:
+- Prometheus metrics (histograms/counters), served by `/metrics` in backend/main.py.
+- The per-request trace of the HTTP request that triggered them, kept in a
+  bounded in-memory buffer and retrievable by request id.
+
+Model calls are observed through a LangChain callback handler attached to
+every client the gateway builds, so chains that call the model directly
+(the interview-prep RAG chain) are covered too.
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import threading
+import contextvars
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from prometheus_client import Counter, Histogram
+
+# USD per 1M tokens (input, output). Override with LLM_PRICES='{"model": [in, out]}'.
+DEFAULT_PRICES = {
+    "llama-3.1-8b-instant": (0.05, 0.08),
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "openai/gpt-oss-120b": (0.15, 0.75),
+}
+PRICES = {**DEFAULT_PRICES, **{k: tuple(v) for k, v in json.loads(os.environ.get("LLM_PRICES", "{}")).items()}}
+
+MAX_TRACES = int(os.environ.get("LLM_TRACE_BUFFER_SIZE", 500))
+
+# Frames from these modules are plumbing, not call sites.
+_PLUMBING_PREFIXES = (
+    "core.llm_gateway", "core.llm_telemetry", "core.single_flight", "core.json_extract",
+    "portfolio_builder.core.llm_config",
+    "langchain", "langgraph", "langsmith", "pydantic", "groq", "httpx", "httpcore",
+    "asyncio", "concurrent", "threading", "contextlib", "functools", "anyio", "starlette",
+)
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13, 21, 34, 60, 120)
+TOKEN_BUCKETS = (16, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+
+LLM_CALL_LATENCY = Histogram(
+    "llm_call_latency_seconds", "LLM call latency", ["call_site", "model", "cache"], buckets=LATENCY_BUCKETS
+)
+LLM_PROMPT_TOKENS = Histogram(
+    "llm_prompt_tokens", "Prompt tokens per LLM call", ["call_site", "model"], buckets=TOKEN_BUCKETS
+)
+LLM_COMPLETION_TOKENS = Histogram(
+    "llm_completion_tokens", "Completion tokens per LLM call", ["call_site", "model"], buckets=TOKEN_BUCKETS
+)
+LLM_CALLS = Counter("llm_calls_total", "LLM calls", ["call_site", "model", "cache", "status"])
+LLM_RETRIES = Counter("llm_retries_total", "Rate-limit retries of LLM calls", ["call_site", "model"])
+LLM_COST = Counter("llm_cost_usd_total", "Estimated LLM cost in USD", ["call_site", "model"])
+LLM_CASCADE = Counter("llm_cascade_calls_total", "Fast-model-first cascade calls", ["task", "outcome"])
+
+# Call site / retry counter of the gateway call in progress, and the trace of the current request.
+_call_context: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar("llm_call_context", default=None)
+_current_trace: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar("llm_trace", default=None)
+
+_traces: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_traces_lock = threading.Lock()
+
+
+def find_call_site(skip: int = 1) -> str:
+    """Name of the first function up the stack that isn't LLM plumbing."""
+    frame = sys._getframe(skip)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        name = frame.f_code.co_name
+        if not module.startswith(_PLUMBING_PREFIXES) and not name.startswith("<"):
+            return name
+        frame = frame.f_back
+    return "unknown"
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    price_in, price_out = PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * price_in + completion_tokens * price_out) / 1_000_000
+
+
+# ---------- gateway hooks ----------
+
+@contextmanager
+def llm_call(call_site: str):
+    """Marks a gateway call so the callback handler attributes it to `call_site`."""
+    token = _call_context.set({"call_site": call_site, "retries": 0})
+    try:
+        yield
+    finally:
+        _call_context.reset(token)
+
+
+def note_retry() -> None:
+    """Counts a rate-limit retry against the gateway call in progress."""
+    context = _call_context.get()
+    if context is not None:
+        context["retries"] += 1
+
+
+def record_call(
+    call_site: str,
+    model: str,
+    latency: float,
+    cache: str = "miss",
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    retries: int = 0,
+    status: str = "ok",
+) -> None:
+    """
+    Records one LLM call in Prometheus and in the current request's trace.
+
+    Args:
+        cache: "miss" (sent to Groq), "hit" (response cache) or "coalesced"
+            (waited on an identical in-flight call).
+    """
+    cost = estimate_cost(model, prompt_tokens, completion_tokens) if cache == "miss" else 0.0
+
+    LLM_CALL_LATENCY.labels(call_site, model, cache).observe(latency)
+    LLM_CALLS.labels(call_site, model, cache, status).inc()
+    if cache == "miss" and status == "ok":
+        LLM_PROMPT_TOKENS.labels(call_site, model).observe(prompt_tokens)
+        LLM_COMPLETION_TOKENS.labels(call_site, model).observe(completion_tokens)
+        LLM_COST.labels(call_site, model).inc(cost)
+    if retries:
+        LLM_RETRIES.labels(call_site, model).inc(retries)
+
+    trace = _current_trace.get()
+    if trace is not None:
+        now = time.perf_counter()
+        trace["calls"].append({
+            "call_site": call_site,
+            "model": model,
+            "cache": cache,
+            "status": status,
+            "started_at_ms": round((now - latency - trace["_started"]) * 1000, 1),
+            "latency_ms": round(latency * 1000, 1),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "retries": retries,
+            "cost_usd": round(cost, 6),
+        })
+
+
+def record_cascade(task: str, escalated: bool) -> None:
+    """Counts a cascade call; escalation rate = escalated / (accepted + escalated)."""
+    LLM_CASCADE.labels(task, "escalated" if escalated else "accepted").inc()
+
+
+# ---------- LangChain callback ----------
+
+def _token_usage(response: LLMResult) -> Dict[str, int]:
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    if not usage and response.generations and response.generations[0]:
+        message = getattr(response.generations[0][0], "message", None)
+        metadata = getattr(message, "usage_metadata", None) or {}
+        usage = {"prompt_tokens": metadata.get("input_tokens", 0), "completion_tokens": metadata.get("output_tokens", 0)}
+    return {
+        "prompt_tokens": int(usage.get("prompt_tokens") or 0),
+        "completion_tokens": int(usage.get("completion_tokens") or 0),
+    }
+
+
+class LLMTelemetryHandler(BaseCallbackHandler):
+    """Times every chat model run and records it via `record_call`."""
+
+    # Run in the caller's thread/task so the stack and context vars are the caller's.
+    run_inline = True
+
+    def __init__(self):
+        self._runs: Dict[UUID, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs) -> None:
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model") or params.get("model_name") or (kwargs.get("metadata") or {}).get("ls_model_name", "unknown")
+        context = _call_context.get()
+        call_site = context["call_site"] if context else find_call_site(2)
+        with self._lock:
+            self._runs[run_id] = {"start": time.perf_counter(), "model": model, "call_site": call_site, "context": context}
+
+    def _finish(self, run_id: UUID, status: str, usage: Optional[Dict[str, int]] = None) -> None:
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        usage = usage or {"prompt_tokens": 0, "completion_tokens": 0}
+        retries = run["context"]["retries"] if run["context"] else 0
+        record_call(
+            run["call_site"],
+            run["model"],
+            time.perf_counter() - run["start"],
+            cache="miss",
+            retries=retries if status == "ok" else 0,
+            status=status,
+            **usage,
+        )
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs) -> None:
+        self._finish(run_id, "ok", _token_usage(response))
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs) -> None:
+        self._finish(run_id, "error")
+
+
+_handler: Optional[LLMTelemetryHandler] = None
+_handler_lock = threading.Lock()
+
+
+def get_telemetry_handler() -> LLMTelemetryHandler:
+    """Get the process-wide callback handler attached to every ChatGroq client."""
+    global _handler
+    if _handler is None:
+        with _handler_lock:
+            if _handler is None:
+                _handler = LLMTelemetryHandler()
+    return _handler
+
+
+# ---------- per-request traces ----------
+
+def start_trace(request_id: Optional[str] = None, name: str = "") -> contextvars.Token:
+    """Starts collecting LLM calls made while handling the current request."""
+    request_id = request_id or uuid.uuid4().hex[:12]
+    trace = {"request_id": request_id, "name": name, "started": time.time(), "_started": time.perf_counter(), "calls": []}
+    with _traces_lock:
+        _traces[request_id] = trace
+        while len(_traces) > MAX_TRACES:
+            _traces.popitem(last=False)
+    return _current_trace.set(trace)
+
+
+def end_trace(token: contextvars.Token) -> None:
+    """Stops attributing calls to the request; the trace stays in the buffer."""
+    _current_trace.reset(token)
+
+
+def current_request_id() -> Optional[str]:
+    trace = _current_trace.get()
+    return trace["request_id"] if trace else None
+
+
+def _summarize(trace: Dict[str, Any], include_calls: bool) -> Dict[str, Any]:
+    calls = list(trace["calls"])
+    summary = {
+        "request_id": trace["request_id"],
+        "name": trace["name"],
+        "started": trace["started"],
+        "llm_calls": len(calls),
+        "llm_time_ms": round(sum(c["latency_ms"] for c in calls), 1),
+        "prompt_tokens": sum(c["prompt_tokens"] for c in calls),
+        "completion_tokens": sum(c["completion_tokens"] for c in calls),
+        "cache_hits": sum(1 for c in calls if c["cache"] != "miss"),
+        "cost_usd": round(sum(c["cost_usd"] for c in calls), 6),
+    }
+    if include_calls:
+        summary["calls"] = calls
+    return summary
+
+
+def get_trace(request_id: str) -> Optional[Dict[str, Any]]:
+    """Full trace (summary plus every call) for a request id."""
+    with _traces_lock:
+        trace = _traces.get(request_id)
+    return _summarize(trace, include_calls=True) if trace else None
+
+
+def recent_traces(limit: int = 50) -> List[Dict[str, Any]]:
+    """Summaries of the most recent requests, newest first."""
+    with _traces_lock:
+        traces = list(_traces.values())[-limit:]
+    return [_summarize(trace, include_calls=False) for trace in reversed(traces)]
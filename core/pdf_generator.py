@@ -3,18 +3,15 @@ import sys
 import json
 import datetime 
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
 from fpdf import FPDF # For PDF generation
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from core.utils import process_documents
+from core.llm_gateway import invoke_llm
+from core.resources import lazy_chat_model
+from core.prompt_budget import truncate_to_tokens, strip_jd_boilerplate, RESUME_TOKEN_BUDGET, JD_TOKEN_BUDGET
 load_dotenv()
-groq_api_key = os.environ.get("GROQ_API_KEY")
-
-if not groq_api_key:
-    raise ValueError("GROQ_API_KEY not found in environment variables. Please set it in your .env file.")
-
-groq_llm = ChatGroq(groq_api_key=groq_api_key, model_name="llama-3.1-8b-instant")
+get_groq_llm = lazy_chat_model("llama-3.1-8b-instant")
 is_mock_llm = False
 
 # --- LLM Content Generation Function (THE INTELLIGENCE) ---
@@ -72,6 +69,12 @@ Databases: PostgreSQL, MongoDB, Redis
 """
 
     # Real LLM call if API key is present
+    groq_llm = get_groq_llm()
+    original_resume_text = truncate_to_tokens(original_resume_text, RESUME_TOKEN_BUDGET, groq_llm.model_name)
+    original_jd_text = truncate_to_tokens(
+        strip_jd_boilerplate(original_jd_text), JD_TOKEN_BUDGET, groq_llm.model_name
+    )
+
     prompt = f"""
 You are the **Executive Resume Editor**. Your task is to rewrite the candidate's provided resume to be a high-impact, single-page professional document perfectly tailored to the job description.
 
@@ -97,7 +100,7 @@ Here is the **target job description**:
   ...(see the prompt structure for user input for details )...
 """
     try:
-        response = groq_llm.invoke(prompt)
+        response = invoke_llm(groq_llm, prompt)
         clean_content = response.content
         clean_content = clean_content.encode('ascii', 'ignore').decode('ascii')
         clean_content = clean_content.replace("# ", "").replace("  ", " ")
@@ -0,0 +1,231 @@
+"""
+Token-budgeted prompt assembly.
+
+Counts tokens with tiktoken (per model encoding), strips boilerplate such as
+EEO statements and benefits blocks from job descriptions, and fits resume /
+plan payloads into a hard per-call token budget before they are pasted into
+a prompt. Fewer input tokens means lower Groq latency and cost.
+"""
+
+import re
+import json
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional
+
+# Groq's Llama models are not in tiktoken's registry; cl100k_base is a close
+# enough proxy for budgeting. gpt-oss uses the o200k tokenizer.
+MODEL_ENCODINGS = {
+    "openai/gpt-oss-120b": "o200k_base",
+}
+DEFAULT_ENCODING = "cl100k_base"
+
+TRUNCATION_MARKER = "\n[...truncated]"
+
+# Default per-call budgets for raw resume / JD text pasted into a prompt.
+RESUME_TOKEN_BUDGET = 3000
+JD_TOKEN_BUDGET = 1500
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(encoding_name: str):
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+        # tiktoken fetches its BPE files on first use; fall back to a heuristic offline.
+        print(f"Warning: tiktoken encoding '{encoding_name}' unavailable, estimating tokens: {e}")
+        return None
+
+
+def encoding_for_model(model_name: Optional[str] = None):
+    """Returns the tiktoken encoding used to budget prompts for `model_name` (or None)."""
+    return _get_encoding(MODEL_ENCODINGS.get(model_name or "", DEFAULT_ENCODING))
+
+
+def count_tokens(text: str, model_name: Optional[str] = None) -> int:
+    """Counts tokens in `text` for `model_name`."""
+    if not text:
+        return 0
+    encoding = encoding_for_model(model_name)
+    if encoding is None:
+        return max(1, len(text) // 4)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model_name: Optional[str] = None) -> str:
+    """
+    Cuts `text` down to at most `max_tokens` tokens, preferring a line break
+    near the cut so the model doesn't see half a sentence.
+    """
+    if not text or count_tokens(text, model_name) <= max_tokens:
+        return text
+    encoding = encoding_for_model(model_name)
+    if encoding is None:
+        head = text[: max_tokens * 4]
+    else:
+        head = encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+    line_break = head.rfind("\n")
+    if line_break > len(head) * 0.8:
+        head = head[:line_break]
+    return head.rstrip() + TRUNCATION_MARKER
+
+
+# ---------- JD boilerplate ----------
+
+_BOILERPLATE_HEADING = re.compile(
+    r"^\W*(benefits|perks|what we offer|why (you'll love )?(working|join)|compensation( and benefits)?|"
+    r"equal (employment )?opportunity|eeo|diversity( statement)?|disclaimer|"
+    r"pay transparency|accommodations?|privacy notice)\b",
+    re.IGNORECASE,
+)
+_BOILERPLATE_SENTENCE = re.compile(
+    r"equal opportunity employer|without regard to (race|color|religion|sex|age)|"
+    r"reasonable accommodation|e-verify|protected veteran|sexual orientation|gender identity|"
+    r"\b401\s?\(?k\)?|paid time off|\bPTO\b|health,? dental,? (and )?vision|parental leave",
+    re.IGNORECASE,
+)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_BLANK_LINES = re.compile(r"\n\s*\n")
+
+# If stripping would leave less than this share of the JD, it is returned as-is:
+# a JD that is mostly "boilerplate" was most likely misread, not mostly legal text.
+MIN_KEPT_FRACTION = 0.5
+
+
+def _is_heading(line: str) -> bool:
+    """Markdown / bold headings, ALL-CAPS lines and short lines ending with a colon."""
+    stripped = line.strip()
+    if not stripped or len(stripped) > 60 or stripped.startswith(("-", "•")):
+        return False
+    if stripped.startswith("*") and not stripped.startswith("**"):
+        return False
+    return (
+        stripped.startswith("#")
+        or (stripped.startswith("**") and stripped.rstrip(":").endswith("**"))
+        or stripped.endswith(":")
+        or (stripped.isupper() and len(stripped.split()) <= 6)
+    )
+
+
+def _strip_sentences(line: str) -> str:
+    """Drops the sentences of `line` that are boilerplate, keeping the rest."""
+    if not _BOILERPLATE_SENTENCE.search(line):
+        return line
+    indent = line[: len(line) - len(line.lstrip())]
+    kept = [s for s in _SENTENCE_END.split(line.strip()) if not _BOILERPLATE_SENTENCE.search(s)]
+    return indent + " ".join(kept) if kept else ""
+
+
+def strip_jd_boilerplate(jd_text: str) -> str:
+    """
+    Removes what doesn't describe the role: sections under benefits / EEO /
+    disclaimer headings (up to the next block that isn't boilerplate), and
+    EEO, benefits and legal sentences anywhere else. Falls back to the
+    original text if stripping would remove most of it.
+    """
+    if not jd_text:
+        return jd_text
+
+    kept_blocks = []
+    skipping = False
+    skipped_body = False
+    for block in _BLANK_LINES.split(jd_text):
+        lines = block.strip("\n").splitlines()
+        if not lines:
+            continue
+        # A skipped section ends at the first block after its body that isn't a heading or boilerplate
+        if skipping and skipped_body and not _is_heading(lines[0]) and not _BOILERPLATE_SENTENCE.search(block):
+            skipping = False
+        kept_lines = []
+        for line in lines:
+            if _is_heading(line):
+                skipping = bool(_BOILERPLATE_HEADING.match(line.strip().lstrip("#*").strip()))
+                skipped_body = False
+            elif skipping:
+                skipped_body = True
+            if skipping:
+                continue
+            line = _strip_sentences(line)
+            if line.strip():
+                kept_lines.append(line)
+        if kept_lines:
+            kept_blocks.append("\n".join(kept_lines))
+
+    stripped = "\n\n".join(kept_blocks)
+    if len(stripped.strip()) < MIN_KEPT_FRACTION * len(jd_text.strip()):
+        return jd_text
+    return stripped
+
+
+# ---------- structured payloads ----------
+
+def select_fields(data: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """Keeps only `fields` of `data`, dropping empty values."""
+    data = data or {}
+    return {field: data[field] for field in fields if data.get(field) not in (None, "", [], {})}
+
+
+def _dumps(data: Any) -> str:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _longest_list(node: Any, best=None):
+    """Finds the list (len > 1) with the largest serialized size anywhere in `node`."""
+    if isinstance(node, list):
+        if len(node) > 1 and (best is None or len(_dumps(node)) > len(_dumps(best))):
+            best = node
+        for item in node:
+            best = _longest_list(item, best)
+    elif isinstance(node, dict):
+        for value in node.values():
+            best = _longest_list(value, best)
+    return best
+
+
+def fit_json(data: Any, max_tokens: int, model_name: Optional[str] = None) -> str:
+    """
+    Serializes `data` compactly and trims it to `max_tokens`.
+
+    Drops trailing items from the largest lists first (oldest projects, last
+    highlights), so the result stays valid JSON; only if that is not enough
+    is the serialized text truncated.
+    """
+    data = json.loads(_dumps(data))  # deep copy with default=str applied
+    text = _dumps(data)
+    while count_tokens(text, model_name) > max_tokens:
+        target = _longest_list(data)
+        if target is None:
+            return truncate_to_tokens(text, max_tokens, model_name)
+        target.pop()
+        text = _dumps(data)
+    return text
+
+
+def build_prompt(
+    template: str,
+    budgets: Optional[Dict[str, int]] = None,
+    model_name: Optional[str] = None,
+    **values: Any,
+) -> str:
+    """
+    Formats `template`, fitting each budgeted value into its token budget.
+
+    Args:
+        template: str.format template (e.g. one of the *_PROMPT constants).
+        budgets: Max tokens per placeholder name; unlisted values are not trimmed.
+        model_name: Model the prompt is for, to pick the tokenizer.
+        **values: Placeholder values. Dicts/lists are serialized as compact JSON.
+
+    Returns:
+        The formatted prompt.
+    """
+    budgets = budgets or {}
+    rendered = {}
+    for name, value in values.items():
+        budget = budgets.get(name)
+        if isinstance(value, (dict, list)):
+            rendered[name] = fit_json(value, budget, model_name) if budget else _dumps(value)
+        else:
+            text = "" if value is None else str(value)
+            rendered[name] = truncate_to_tokens(text, budget, model_name) if budget else text
+    return template.format(**rendered)
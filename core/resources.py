@@ -0,0 +1,177 @@
+"""
+Lazy resource registry.
+
+Expensive process-wide objects (ChatGroq clients, NLTK corpora, the MiniLM
+embedding model, the interview-prep RAG chain with its FAISS index and BM25
+retriever) are registered with a factory at import time and only built on
+first use, so importing the backend does no model loading or network I/O.
+
+`warm_up()` builds everything registered up front (in parallel), e.g. in the
+background right after the server starts accepting connections.
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+class ResourceRegistry:
+    """Named, build-once resources with per-resource locks and init timings."""
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._warm: Dict[str, bool] = {}
+        self._values: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._init_seconds: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[[], Any], warm_up: bool = True) -> None:
+        """
+        Registers `factory` under `name`; the first registration wins.
+
+        Args:
+            name: Resource name, e.g. "rag:faiss".
+            factory: Zero-argument callable building the resource.
+            warm_up: Whether `warm_up()` builds it by default.
+        """
+        with self._lock:
+            if name not in self._factories:
+                self._factories[name] = factory
+                self._warm[name] = warm_up
+                self._locks[name] = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        """Returns the resource, building it on first use."""
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        if name not in self._factories:
+            raise KeyError(f"Unknown resource: {name}")
+
+        with self._locks[name]:
+            if name not in self._values:
+                start = time.perf_counter()
+                try:
+                    value = self._factories[name]()
+                except Exception as e:
+                    self._errors[name] = str(e)
+                    raise
+                self._init_seconds[name] = time.perf_counter() - start
+                self._errors.pop(name, None)
+                self._values[name] = value
+        return self._values[name]
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._values
+
+    def warm_up(self, names: Optional[Iterable[str]] = None, max_workers: int = 4) -> Dict[str, Optional[float]]:
+        """
+        Builds resources ahead of first use.
+
+        Args:
+            names: Resources to build (default: every one registered with warm_up=True).
+            max_workers: Resources are built concurrently on this many threads.
+
+        Returns:
+            Init seconds per resource (None if it failed; the error is printed
+            and the resource is retried on first use).
+        """
+        with self._lock:
+            targets = list(names) if names is not None else [n for n, warm in self._warm.items() if warm]
+
+        def build(name: str) -> Optional[float]:
+            try:
+                self.get(name)
+                return self._init_seconds.get(name, 0.0)
+            except Exception as e:
+                print(f"Warning: warm-up of resource '{name}' failed: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="warm-up") as pool:
+            return dict(zip(targets, pool.map(build, targets)))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Loaded state, init time and last error per resource."""
+        with self._lock:
+            names = list(self._factories)
+        return {
+            name: {
+                "loaded": name in self._values,
+                "init_seconds": round(self._init_seconds[name], 3) if name in self._init_seconds else None,
+                "error": self._errors.get(name),
+            }
+            for name in names
+        }
+
+
+# Singleton instance
+_registry: Optional[ResourceRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_resource_registry() -> ResourceRegistry:
+    """Get the process-wide ResourceRegistry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ResourceRegistry()
+    return _registry
+
+
+def register_resource(name: str, factory: Callable[[], Any], warm_up: bool = True) -> Callable[[], Any]:
+    """Registers a lazy resource and returns a zero-argument getter for it."""
+    get_resource_registry().register(name, factory, warm_up)
+    return lambda: get_resource_registry().get(name)
+
+
+def get_resource(name: str) -> Any:
+    """Convenience function to get (building if needed) a registered resource."""
+    return get_resource_registry().get(name)
+
+
+def warm_up(names: Optional[Iterable[str]] = None, max_workers: int = 4) -> Dict[str, Optional[float]]:
+    """Convenience function to build registered resources ahead of first use."""
+    return get_resource_registry().warm_up(names, max_workers)
+
+
+# ---------- common resources ----------
+
+def lazy_chat_model(model_name: str, temperature: Optional[float] = None, **kwargs) -> Callable[[], Any]:
+    """Getter for a shared ChatGroq client that is only built on first use."""
+    name = f"llm:{model_name}" if temperature is None and not kwargs else f"llm:{model_name}:{temperature}:{sorted(kwargs.items())}"
+
+    def build():
+        from core.llm_gateway import get_chat_model
+        return get_chat_model(model_name, temperature, **kwargs)
+
+    return register_resource(name, build)
+
+
+def _ensure_nltk_data(packages: Iterable[str]) -> bool:
+    import nltk
+
+    # nltk.data.find paths for the corpora/models we use
+    locations = {
+        "vader_lexicon": "sentiment/vader_lexicon.zip",
+        "punkt": "tokenizers/punkt",
+        "punkt_tab": "tokenizers/punkt_tab",
+        "stopwords": "corpora/stopwords",
+        "wordnet": "corpora/wordnet",
+    }
+    for package in packages:
+        try:
+            nltk.data.find(locations.get(package, package))
+        except LookupError:
+            # Only hit the network for data that isn't installed yet.
+            nltk.download(package, quiet=True)
+    return True
+
+
+def lazy_nltk_data(*packages: str) -> Callable[[], bool]:
+    """Getter that makes sure the NLTK `packages` are available (downloading missing ones once)."""
+    return register_resource(f"nltk:{','.join(packages)}", lambda: _ensure_nltk_data(packages))
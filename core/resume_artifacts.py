@@ -0,0 +1,241 @@
+"""
+Per-resume artifact store shared by the ATS checker, the resume matcher and
+the portfolio builder.
+
+A resume is identified by the SHA-256 of the uploaded file (or of the text,
+when only text was submitted). Everything derived from it is stored under
+that id and filled lazily, the first time any tool needs it:
+
+- raw_text: extracted text (versioned by EXTRACTOR_VERSION),
+- cleaned_tokens: clean_text output (PREPROCESSOR_VERSION),
+- chunk_embeddings: MiniLM vectors of the token chunks (embedding namespace
+  plus chunk sizes),
+- parsed_resume: the LLM-parsed ResumeData (versioned by the caller, from the
+  parser prompt and models).
+
+A stored artifact whose version doesn't match the caller's is recomputed and
+replaced. Artifacts live in RAM (LRU) and in an SQLite file at
+RESUME_ARTIFACT_PATH (core.llm_cache's store), so every worker and restart
+reuses them. They hold resume text and personal data, so both tiers expire
+them after RESUME_ARTIFACT_TTL_SECONDS, and the disk tier drops the least
+recently used ones beyond RESUME_ARTIFACT_MAX_DISK_MB.
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.document_extractor import content_hash, EXTRACTOR_VERSION
+from core.llm_cache import LLMCache
+from core.single_flight import get_single_flight
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+RESUME_ARTIFACT_PATH = os.environ.get(
+    "RESUME_ARTIFACT_PATH", os.path.join(PROJECT_ROOT, "data", "cache", "resume_artifacts.sqlite3")
+)
+RESUME_ARTIFACT_RAM_ITEMS = int(os.environ.get("RESUME_ARTIFACT_RAM_ITEMS", 2048))
+RESUME_ARTIFACT_TTL_SECONDS = int(os.environ.get("RESUME_ARTIFACT_TTL_SECONDS", 7 * 24 * 60 * 60))
+RESUME_ARTIFACT_MAX_DISK_MB = int(os.environ.get("RESUME_ARTIFACT_MAX_DISK_MB", 512))
+
+
+def text_resume_id(text: str) -> str:
+    """Resume id for text submitted without a file."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResumeArtifactStore:
+    """
+    Versioned, lazily filled artifacts per resume id (RAM LRU + SQLite on disk).
+
+    Args:
+        path: SQLite file of the disk tier (None: RAM only).
+        ram_items: Max (resume, field) entries kept in RAM.
+        ttl_seconds: How long an artifact is kept after it was computed (0: forever).
+        max_disk_bytes: Size budget of the disk tier.
+    """
+
+    def __init__(self, path: Optional[str] = RESUME_ARTIFACT_PATH, ram_items: int = RESUME_ARTIFACT_RAM_ITEMS,
+                 ttl_seconds: int = RESUME_ARTIFACT_TTL_SECONDS,
+                 max_disk_bytes: int = RESUME_ARTIFACT_MAX_DISK_MB * 1024 * 1024):
+        self.ram_items = ram_items
+        self.ttl_seconds = ttl_seconds
+        self._ram: "OrderedDict[Tuple[str, str], Tuple[str, Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"ram_hits": 0, "disk_hits": 0, "computed": 0}
+        # The disk tier applies the TTL and the size budget; decoded values are kept in RAM here instead
+        self._disk = LLMCache(path=path, ttl_seconds=ttl_seconds, max_memory_entries=0, max_disk_bytes=max_disk_bytes)
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def _remember(self, key: Tuple[str, str], version: str, value: Any, created_at: float) -> None:
+        with self._lock:
+            self._ram[key] = (version, value, created_at)
+            self._ram.move_to_end(key)
+            while len(self._ram) > self.ram_items:
+                self._ram.popitem(last=False)
+
+    def get(self, resume_id: str, field: str, version: str) -> Optional[Any]:
+        """The stored artifact, or None if missing, expired or from another version."""
+        key = (resume_id, field)
+        now = time.time()
+        with self._lock:
+            entry = self._ram.get(key)
+            if entry is not None:
+                if self._is_expired(entry[2], now):
+                    del self._ram[key]
+                elif entry[0] == version:
+                    self._ram.move_to_end(key)
+                    self._stats["ram_hits"] += 1
+                    return entry[1]
+        try:
+            value = self._disk.get(f"{resume_id}:{field}")
+            stored = json.loads(value) if value is not None else None
+        except Exception as e:
+            print(f"Warning: could not read resume artifact {field} for {resume_id[:12]}: {e}")
+            return None
+        if stored is None or stored.get("version") != version:
+            return None
+        with self._lock:
+            self._stats["disk_hits"] += 1
+        self._remember(key, version, stored["value"], stored.get("created_at", now))
+        return stored["value"]
+
+    def put(self, resume_id: str, field: str, version: str, value: Any) -> None:
+        """Stores an artifact in both tiers (replacing any other version)."""
+        now = time.time()
+        self._remember((resume_id, field), version, value, now)
+        try:
+            self._disk.set(f"{resume_id}:{field}",
+                           json.dumps({"version": version, "value": value, "created_at": now}), model=field)
+        except Exception as e:
+            print(f"Warning: could not persist resume artifact {field} for {resume_id[:12]}: {e}")
+
+    def get_or_compute(self, resume_id: str, field: str, version: str, compute: Callable[[], Any]) -> Any:
+        """
+        Returns the artifact, computing and storing it on a miss.
+        Concurrent misses for the same artifact compute it once.
+        """
+        value = self.get(resume_id, field, version)
+        if value is not None:
+            return value
+
+        def run():
+            cached = self.get(resume_id, field, version)
+            if cached is not None:
+                return cached
+            result = compute()
+            with self._lock:
+                self._stats["computed"] += 1
+            if result is not None:
+                self.put(resume_id, field, version, result)
+            return result
+
+        return get_single_flight("resume_artifacts", distributed=False).do(f"{resume_id}:{field}:{version}", run)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats, ram_items=len(self._ram))
+        stats["disk"] = self._disk.stats()
+        return stats
+
+
+# Singleton instance
+_artifact_store: Optional[ResumeArtifactStore] = None
+_artifact_store_lock = threading.Lock()
+
+
+def get_resume_artifact_store() -> ResumeArtifactStore:
+    """Get the process-wide ResumeArtifactStore."""
+    global _artifact_store
+    if _artifact_store is None:
+        with _artifact_store_lock:
+            if _artifact_store is None:
+                _artifact_store = ResumeArtifactStore()
+    return _artifact_store
+
+
+class ResumeArtifact:
+    """
+    Lazy view of one resume's artifacts.
+
+    Args:
+        resume_id: Content hash of the file (or text).
+        data: File bytes, needed only if raw_text isn't stored yet.
+        filename: Original file name (for the extension).
+        text: Text submitted without a file.
+    """
+
+    def __init__(self, resume_id: str, data: Optional[bytes] = None, filename: Optional[str] = None,
+                 text: Optional[str] = None):
+        self.resume_id = resume_id
+        self._data = data
+        self._filename = filename
+        self._text = text
+        self.store = get_resume_artifact_store()
+
+    @property
+    def text(self) -> str:
+        """Raw text, as core.utils.load_resume returns it."""
+        if self._text is None:
+            from core.utils import load_resume_bytes
+            self._text = self.store.get_or_compute(
+                self.resume_id, "raw_text", EXTRACTOR_VERSION,
+                lambda: load_resume_bytes(self._data, self._filename)
+            )
+        return self._text
+
+    @property
+    def tokens(self) -> List[str]:
+        """clean_text(text)."""
+        from core.utils import clean_text, PREPROCESSOR_VERSION
+        return self.store.get_or_compute(
+            self.resume_id, "cleaned_tokens", PREPROCESSOR_VERSION, lambda: clean_text(self.text)
+        )
+
+    def chunk_embeddings(self) -> List[List[float]]:
+        """Embeddings of the token chunks used by chunked resume-JD similarity."""
+        from core.utils import PREPROCESSOR_VERSION
+        from core.embedding import EMBEDDING_NAMESPACE, CHUNK_MAX_TOKENS, CHUNK_OVERLAP, chunk_tokens, create_embeddings
+        version = f"{EMBEDDING_NAMESPACE}/{CHUNK_MAX_TOKENS}/{CHUNK_OVERLAP}/{PREPROCESSOR_VERSION}"
+        return self.store.get_or_compute(
+            self.resume_id, "chunk_embeddings", version, lambda: create_embeddings(chunk_tokens(self.tokens))
+        )
+
+    def parsed_resume(self, parse: Callable[[], Optional[dict]], version: str) -> Optional[dict]:
+        """
+        The structured (LLM-parsed) resume.
+
+        Args:
+            parse: Produces the parse; returning None means "don't store" (e.g. the LLM failed).
+            version: Parser version (prompt and models); other versions are re-parsed.
+        """
+        return self.store.get_or_compute(self.resume_id, "parsed_resume", version, parse)
+
+
+def artifact_for_upload(data: bytes, filename: str) -> ResumeArtifact:
+    """Artifacts of an uploaded resume file."""
+    return ResumeArtifact(content_hash(data), data=data, filename=filename)
+
+
+def artifact_for_path(path: str) -> ResumeArtifact:
+    """Artifacts of a resume file on disk (same id as uploading the same file)."""
+    with open(path, "rb") as f:
+        return artifact_for_upload(f.read(), os.path.basename(path))
+
+
+def artifact_for_text(text: str) -> ResumeArtifact:
+    """Artifacts of resume text submitted without a file."""
+    return ResumeArtifact(text_resume_id(text), text=text)
+
+
+def get_resume_artifact(resume_id: str) -> ResumeArtifact:
+    """Artifacts of a resume seen before, by id (raw_text must already be stored)."""
+    return ResumeArtifact(resume_id)
+
@@ -0,0 +1,254 @@
+"""
+Single-flight coalescing for identical in-flight work.
+
+When several callers ask for the same key at the same time (the same JD
+submitted from several tabs, the same resume embedded twice), only the first
+caller - the leader - does the work. Everyone else waits on the leader's
+shared future and receives the same result.
+
+Within one process the shared future is a `concurrent.futures.Future`, so
+threads (LangGraph nodes) and coroutines (FastAPI handlers) coalesce with each
+other. Across uvicorn workers, setting SINGLE_FLIGHT_REDIS_URL adds a short
+Redis lock per key: a worker that finds the lock taken polls the shared
+response cache instead of issuing its own request.
+"""
+
+import os
+import time
+import uuid
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+DEFAULT_LOCK_TTL_SECONDS = 60.0
+DEFAULT_POLL_INTERVAL_SECONDS = 0.1
+
+# Deletes the lock only if we still own it.
+_UNLOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into a single execution.
+
+    Args:
+        name: Namespace for this group (used in Redis lock keys and stats).
+        redis_url: Optional Redis URL enabling cross-process locking.
+        lock_ttl_seconds: Upper bound on how long a lock is held / waited for.
+        poll_interval: How often followers in other processes re-check.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        redis_url: Optional[str] = None,
+        lock_ttl_seconds: float = DEFAULT_LOCK_TTL_SECONDS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+    ):
+        self.name = name
+        self.lock_ttl_seconds = lock_ttl_seconds
+        self.poll_interval = poll_interval
+
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {"leaders": 0, "coalesced": 0, "remote_coalesced": 0, "errors": 0}
+
+        self._redis = None
+        if redis_url:
+            try:
+                import redis
+                self._redis = redis.from_url(redis_url)
+            except Exception as e:
+                print(f"Warning: Redis lock for single-flight '{name}' disabled: {e}")
+
+    # ---------- in-process coalescing ----------
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        """Returns the shared future for `key` and whether the caller is its leader."""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self._stats["coalesced"] += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            self._stats["leaders"] += 1
+            return future, True
+
+    def _settle(self, key: str, future: Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+            if error is not None:
+                self._stats["errors"] += 1
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: str, fn: Callable[[], Any], recheck: Optional[Callable[[], Any]] = None) -> Any:
+        """
+        Runs `fn` once for all concurrent callers with the same key.
+
+        Args:
+            key: Identity of the work, e.g. an LLM cache key.
+            fn: Zero-argument callable doing the actual work.
+            recheck: Optional callable returning a cached result (or None);
+                used when another process holds the Redis lock.
+
+        Returns:
+            The leader's result. Exceptions raised by the leader are re-raised
+            in every waiting caller.
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        try:
+            result = self._run_locked(key, fn, recheck)
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        self._settle(key, future, result=result)
+        return result
+
+    async def ado(
+        self,
+        key: str,
+        afn: Callable[[], Awaitable[Any]],
+        recheck: Optional[Callable[[], Any]] = None,
+    ) -> Any:
+        """
+        Async counterpart of `do`.
+
+        The leader's work runs as its own task, so a caller that disconnects
+        (and gets cancelled) does not cancel the request the others wait on.
+        """
+        future, leader = self._join(key)
+        if leader:
+            task = asyncio.ensure_future(self._arun_locked(key, afn, recheck))
+            task.add_done_callback(lambda t: self._settle_task(key, future, t))
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def _settle_task(self, key: str, future: Future, task: asyncio.Task) -> None:
+        if task.cancelled():
+            self._settle(key, future, error=asyncio.CancelledError())
+        elif task.exception() is not None:
+            self._settle(key, future, error=task.exception())
+        else:
+            self._settle(key, future, result=task.result())
+
+    # ---------- cross-process locking ----------
+
+    def _lock_key(self, key: str) -> str:
+        return f"single_flight:{self.name}:{key}"
+
+    def _try_lock(self, lock_key: str, token: str) -> bool:
+        try:
+            return bool(self._redis.set(lock_key, token, nx=True, px=int(self.lock_ttl_seconds * 1000)))
+        except Exception as e:
+            # Fail open: a Redis outage must not block LLM calls.
+            print(f"Warning: single-flight lock unavailable, proceeding without it: {e}")
+            return True
+
+    def _unlock(self, lock_key: str, token: str) -> None:
+        try:
+            self._redis.eval(_UNLOCK_SCRIPT, 1, lock_key, token)
+        except Exception:
+            pass
+
+    def _remote_hit(self, recheck: Optional[Callable[[], Any]]) -> Any:
+        if recheck is None:
+            return None
+        value = recheck()
+        if value is not None:
+            with self._lock:
+                self._stats["remote_coalesced"] += 1
+        return value
+
+    def _run_locked(self, key: str, fn: Callable[[], Any], recheck: Optional[Callable[[], Any]]) -> Any:
+        if self._redis is None:
+            return fn()
+        lock_key, token = self._lock_key(key), uuid.uuid4().hex
+        deadline = time.monotonic() + self.lock_ttl_seconds
+        waited = False
+        while not self._try_lock(lock_key, token):
+            waited = True
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(self.poll_interval)
+            value = self._remote_hit(recheck)
+            if value is not None:
+                return value
+        try:
+            # The other worker may have finished between our last poll and the lock.
+            value = self._remote_hit(recheck) if waited else None
+            return value if value is not None else fn()
+        finally:
+            self._unlock(lock_key, token)
+
+    async def _arun_locked(
+        self,
+        key: str,
+        afn: Callable[[], Awaitable[Any]],
+        recheck: Optional[Callable[[], Any]],
+    ) -> Any:
+        if self._redis is None:
+            return await afn()
+        lock_key, token = self._lock_key(key), uuid.uuid4().hex
+        deadline = time.monotonic() + self.lock_ttl_seconds
+        waited = False
+        while not await asyncio.to_thread(self._try_lock, lock_key, token):
+            waited = True
+            if time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(self.poll_interval)
+            value = self._remote_hit(recheck)
+            if value is not None:
+                return value
+        try:
+            value = self._remote_hit(recheck) if waited else None
+            return value if value is not None else await afn()
+        finally:
+            await asyncio.to_thread(self._unlock, lock_key, token)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns leader/coalesced counters since process start."""
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._inflight))
+
+
+# Registry of named groups
+_groups: Dict[str, SingleFlight] = {}
+_groups_lock = threading.Lock()
+
+
+def get_single_flight(name: str, distributed: bool = True) -> SingleFlight:
+    """
+    Get the process-wide SingleFlight group called `name`.
+
+    Args:
+        name: Group name, e.g. "llm" or "embeddings".
+        distributed: Whether to use the Redis lock when SINGLE_FLIGHT_REDIS_URL
+            is set. Only useful when followers have a shared cache to re-check.
+    """
+    with _groups_lock:
+        if name not in _groups:
+            redis_url = os.environ.get("SINGLE_FLIGHT_REDIS_URL") if distributed else None
+            _groups[name] = SingleFlight(
+                name,
+                redis_url=redis_url,
+                lock_ttl_seconds=float(os.environ.get("SINGLE_FLIGHT_LOCK_TTL_SECONDS", DEFAULT_LOCK_TTL_SECONDS)),
+            )
+        return _groups[name]
+
+
+def single_flight_stats() -> Dict[str, Dict[str, int]]:
+    """Counters for every SingleFlight group created in this process."""
+    with _groups_lock:
+        groups = dict(_groups)
+    return {name: group.stats() for name, group in groups.items()}
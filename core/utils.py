@@ -1,29 +1,47 @@
 import os
-from langchain_community.document_loaders import PyPDFLoader
+import sys
 import re
 import string
+import functools
+import threading
 import nltk
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.document_extractor import get_document_extractor
+
 # Download NLTK data 
 # nltk.download('stopwords')
 # nltk.download('wordnet')
 
 def load_resume(file_path: str):
     """
-    Loads a resume from a PDF file using Langchain's PyPDFLoader.
+    Loads a resume from a PDF file.
     For .doc files, this function currently raises a NotImplementedError.
+    Parsing goes through the shared DocumentExtractor, so a file seen before
+    (by content hash) is not parsed again.
     """
     if file_path.endswith('.pdf'):
-        loader = PyPDFLoader(file_path)
-        documents = loader.load()
-        return " ".join([doc.page_content for doc in documents])
+        with open(file_path, 'rb') as f:
+            return load_resume_bytes(f.read(), file_path)
     elif file_path.endswith('.doc') or file_path.endswith('.docx'):
         raise NotImplementedError("Loading .doc/.docx files is not yet implemented. Please convert to PDF or plain text.")
     else:
         raise ValueError("Unsupported file type. Only PDF and (placeholder for) DOC/DOCX are accepted.")
 
+def load_resume_bytes(data: bytes, filename: str) -> str:
+    """
+    Loads a resume from uploaded PDF bytes, without writing it to disk.
+    The text matches load_resume (page texts joined with spaces).
+    """
+    if filename.endswith('.pdf'):
+        return get_document_extractor().extract_text(data, filename, separator=" ")
+    elif filename.endswith('.doc') or filename.endswith('.docx'):
+        raise NotImplementedError("Loading .doc/.docx files is not yet implemented. Please convert to PDF or plain text.")
+    else:
+        raise ValueError("Unsupported file type. Only PDF and (placeholder for) DOC/DOCX are accepted.")
+
 # def load_job_description(file_path: str) -> str:
 #     """
 #     Loads a job description from a text file.
@@ -33,34 +51,118 @@ def load_resume(file_path: str):
 #     with open(file_path, 'r', encoding='utf-8') as f:
         # return f.read()
 
-def clean_text(text: str) -> list[str]:
+# Precompiled: every punctuation character and digit run is dropped in one pass
+_STRIP_PATTERN = re.compile(f'[{re.escape(string.punctuation)}\\d]+')
+# The Treebank tokenizer splits these words even without punctuation ("cannot" -> "can not")
+_TREEBANK_SPLITS = {
+    "cannot": ["can", "not"], "gimme": ["gim", "me"], "gonna": ["gon", "na"],
+    "gotta": ["got", "ta"], "lemme": ["lem", "me"], "wanna": ["wan", "na"],
+}
+# Bump when clean_text output changes, so stored resume artifacts are rebuilt
+PREPROCESSOR_VERSION = "clean-text-1"
+LEMMA_CACHE_SIZE = int(os.environ.get("LEMMA_CACHE_SIZE", 50000))
+# clean_many() fans out to a process pool from this many texts on
+CLEAN_PARALLEL_MIN = int(os.environ.get("CLEAN_PARALLEL_MIN", 64))
+
+
+class TextPreprocessor:
     """
-    Performs NLP-based text preprocessing on the input text.
-    Steps include lowercasing, removing punctuation, numbers, stopwords, and lemmatization.
-    Returns a list of cleaned tokens.
+    Reusable clean_text pipeline: precompiled regexes, a frozen stopword set,
+    one lemmatizer and a bounded LRU cache of lemmas (and of tokenized
+    non-ASCII words). Produces exactly the tokens of the original clean_text.
+
+    Args:
+        language: NLTK stopword list to use.
+        lemma_cache_size: Max words kept in each LRU cache.
     """
-    text = text.lower() # Lowercasing
-    text = re.sub(f'[{re.escape(string.punctuation)}]', '', text) # Remove punctuation
-    text = re.sub(r'\d+', '', text) # Remove numbers
 
-    tokens = nltk.word_tokenize(text) # Tokenization
+    def __init__(self, language: str = "english", lemma_cache_size: int = LEMMA_CACHE_SIZE):
+        self.stop_words = frozenset(stopwords.words(language))
+        self._lemmatizer = WordNetLemmatizer()
+        self._lemmatize = functools.lru_cache(maxsize=lemma_cache_size)(self._lemmatizer.lemmatize)
+        self._tokenize_word = functools.lru_cache(maxsize=lemma_cache_size)(self._nltk_tokenize_word)
+
+    @staticmethod
+    def _nltk_tokenize_word(word: str) -> tuple:
+        return tuple(nltk.word_tokenize(word))
 
-    stop_words = set(stopwords.words('english'))
-    tokens = [word for word in tokens if word not in stop_words] # Remove stopwords
+    def tokenize(self, text: str) -> list[str]:
+        """
+        nltk.word_tokenize for text already stripped of punctuation and digits.
+        ASCII words come out of the Treebank tokenizer unchanged (bar a few
+        colloquial splits), so only non-ASCII words go through NLTK.
+        """
+        tokens = []
+        for word in text.split():
+            if not word.isascii():
+                tokens.extend(self._tokenize_word(word))
+            elif word in _TREEBANK_SPLITS:
+                tokens.extend(_TREEBANK_SPLITS[word])
+            else:
+                tokens.append(word)
+        return tokens
 
-    lemmatizer = WordNetLemmatizer()
-    tokens = [lemmatizer.lemmatize(word) for word in tokens] # Lemmatization
+    def clean(self, text: str) -> list[str]:
+        """
+        Lowercases, removes punctuation, numbers and stopwords, and lemmatizes.
+        Returns a list of cleaned tokens.
+        """
+        text = _STRIP_PATTERN.sub('', text.lower())
+        stop_words = self.stop_words
+        return [self._lemmatize(word) for word in self.tokenize(text) if word not in stop_words]
 
-    return tokens
+    def clean_many(self, texts: list[str], workers: int = None) -> list[list[str]]:
+        """
+        Cleans a batch of texts, in order. Batches of CLEAN_PARALLEL_MIN texts
+        or more are spread over a process pool (`workers` processes, default:
+        one per CPU; workers=1 keeps everything in this process).
+        """
+        if workers == 1 or len(texts) < CLEAN_PARALLEL_MIN:
+            return [self.clean(text) for text in texts]
+        from concurrent.futures import ProcessPoolExecutor
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_clean_in_worker, texts, chunksize=max(1, len(texts) // (workers * 4))))
+
+
+def _clean_in_worker(text: str) -> list[str]:
+    return get_text_preprocessor().clean(text)
+
+
+# Singleton instance
+_text_preprocessor = None
+_text_preprocessor_lock = threading.Lock()
+
+
+def get_text_preprocessor() -> TextPreprocessor:
+    """Get the process-wide TextPreprocessor (built on first use; needs the NLTK stopwords/wordnet data)."""
+    global _text_preprocessor
+    if _text_preprocessor is None:
+        with _text_preprocessor_lock:
+            if _text_preprocessor is None:
+                _text_preprocessor = TextPreprocessor()
+    return _text_preprocessor
+
+
+def clean_text(text: str) -> list[str]:
+    """
+    Performs NLP-based text preprocessing on the input text.
+    Steps include lowercasing, removing punctuation, numbers, stopwords, and lemmatization.
+    Returns a list of cleaned tokens.
+    """
+    return get_text_preprocessor().clean(text)
 
-def process_documents(resume_path: str, jd_text: str) -> dict:
+def process_documents(resume_path: str, jd_text: str, resume_text: str = None, resume_tokens: list[str] = None) -> dict:
     """
     Loads and preprocesses both the resume and job description.
+    Pass `resume_text` / `resume_tokens` when the resume was already extracted or
+    cleaned (e.g. from the resume artifact store).
     Returns a dictionary containing the raw text and cleaned text for both.
     """
-    resume_text = load_resume(resume_path)
+    if resume_text is None:
+        resume_text = load_resume(resume_path)
 
-    cleaned_resume = clean_text(resume_text)
+    cleaned_resume = resume_tokens if resume_tokens is not None else clean_text(resume_text)
     cleaned_jd = clean_text(jd_text)
 
     return {
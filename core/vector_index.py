@@ -0,0 +1,394 @@
+"""
+Persisted FAISS indexes of job descriptions and resumes.
+
+The JD index ranks one resume against many JDs with a single resume embedding
+and one inner-product search, instead of one /resume-matcher/match call per
+JD. The resume index holds the resumes ingested by recruiter batch ranking
+(workflows/recruiter_pipeline.py), keyed by content hash, so uploading the
+same resume again replaces its entry.
+
+Vectors are the same L2-normalized MiniLM embeddings of the cleaned text that
+`calculate_resume_jd_similarity` compares, so a search score is the cosine
+similarity /match would report (in its default "single" mode).
+
+On disk (JD_INDEX_DIR, default data/embeddings/jd_index; RESUME_INDEX_DIR,
+default data/embeddings/resume_index), index.sqlite3 holds one row per
+document: its id, its vector and its metadata (JDs keep title/company/url
+and the raw text, needed when LLM insights are requested for the top
+matches). Adding or removing a document writes only its rows. The FAISS
+index (an IndexIDMap2 over IndexFlatIP, keyed by row id) is built in memory
+from the stored vectors; search results fetch the metadata of the hits only.
+
+Several processes (API workers, the CLI) can share one directory: writes
+are SQLite transactions, and each process applies the rows others added or
+removed (cheaply detected with PRAGMA data_version) before its next search.
+An index saved by the previous format (index.faiss + metadata.json) is
+imported on first load.
+
+Bulk ingestion from the command line:
+
+    python -m core.vector_index ingest data/raw/job_descriptions
+    python -m core.vector_index ingest jobs.jsonl
+    python -m core.vector_index remove <jd_id> [<jd_id> ...]
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import argparse
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.utils import clean_text, get_text_preprocessor
+from core.embedding import create_embeddings
+from core.resources import register_resource
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+JD_INDEX_DIR = os.environ.get("JD_INDEX_DIR", os.path.join(PROJECT_ROOT, "data", "embeddings", "jd_index"))
+RESUME_INDEX_DIR = os.environ.get("RESUME_INDEX_DIR", os.path.join(PROJECT_ROOT, "data", "embeddings", "resume_index"))
+# JDs embedded per create_embeddings call during bulk ingestion
+JD_INGEST_BATCH_SIZE = int(os.environ.get("JD_INGEST_BATCH_SIZE", 256))
+
+_DB_FILE = "index.sqlite3"
+_LEGACY_INDEX_FILE = "index.faiss"
+_LEGACY_METADATA_FILE = "metadata.json"
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    return vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+
+
+def embed_tokens(tokens: List[str]) -> List[float]:
+    """Embeds already cleaned tokens the way the JD index does (one string)."""
+    return create_embeddings([" ".join(tokens)])[0]
+
+
+def embed_document(text: str) -> List[float]:
+    """Embeds a resume or JD the way the JD index does (cleaned tokens, one string)."""
+    return embed_tokens(clean_text(text))
+
+
+def embed_docs(docs: Iterable[dict], batch_size: int = JD_INGEST_BATCH_SIZE) -> Tuple[List[dict], List[List[float]]]:
+    """
+    Embeds documents for `VectorIndex.add_vectors`.
+
+    Args:
+        docs: Dicts with "id" and "text"; documents without either are skipped.
+        batch_size: Documents embedded per model batch.
+
+    Returns:
+        (documents, vectors), one vector per document; the last one wins when an id repeats.
+    """
+    docs = list({str(d["id"]): d for d in docs if d.get("id") and (d.get("text") or "").strip()}.values())
+    vectors: List[List[float]] = []
+    for start in range(0, len(docs), batch_size):
+        cleaned = get_text_preprocessor().clean_many([d["text"] for d in docs[start:start + batch_size]])
+        vectors.extend(create_embeddings([" ".join(tokens) for tokens in cleaned]))
+    return docs, vectors
+
+
+class VectorIndex:
+    """
+    FAISS inner-product index of documents (JDs or resumes) with persisted metadata.
+
+    Documents live in SQLite, one row each; the FAISS index is built in memory
+    from the stored vectors and kept in step with the rows, so no write ever
+    rewrites the whole index.
+
+    Args:
+        directory: Where index.sqlite3 lives.
+    """
+
+    def __init__(self, directory: str = JD_INDEX_DIR):
+        self.directory = directory
+        self._index = None
+        self._fids: Dict[str, int] = {}       # document id -> FAISS id (the row's fid)
+        self._by_fid: Dict[int, str] = {}
+        self._max_fid = 0                      # highest fid loaded; newer rows were added since
+        self._data_version: Optional[int] = None
+        self._lock = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(
+            os.path.join(directory, _DB_FILE), check_same_thread=False, timeout=30, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS docs (
+                fid INTEGER PRIMARY KEY AUTOINCREMENT,
+                doc_id TEXT NOT NULL UNIQUE,
+                vector BLOB NOT NULL,
+                meta TEXT NOT NULL
+            )
+            """
+        )
+
+    # ---------- persistence ----------
+
+    def _sync(self) -> bool:
+        """
+        Applies rows other processes added or removed since the last sync.
+        AUTOINCREMENT never reuses a fid, so new rows are exactly those above `_max_fid`.
+        """
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return False
+        rows = self._conn.execute(
+            "SELECT fid, doc_id, vector FROM docs WHERE fid > ? ORDER BY fid", (self._max_fid,)
+        ).fetchall()
+        if self._by_fid:
+            live = {fid for (fid,) in self._conn.execute("SELECT fid FROM docs WHERE fid <= ?", (self._max_fid,))}
+            self._drop([fid for fid in self._by_fid if fid not in live])
+        if rows:
+            vectors = np.frombuffer(b"".join(row[2] for row in rows), dtype=np.float32).reshape(len(rows), -1)
+            self._ensure_index(vectors.shape[1])
+            self._index.add_with_ids(vectors, np.asarray([row[0] for row in rows], dtype=np.int64))
+            for fid, doc_id, _ in rows:
+                self._fids[doc_id] = fid
+                self._by_fid[fid] = doc_id
+            self._max_fid = rows[-1][0]
+        self._data_version = version
+        return True
+
+    def _reset(self) -> None:
+        """Forgets the in-memory state; the next sync reloads every row."""
+        self._index = None
+        self._fids, self._by_fid = {}, {}
+        self._max_fid = 0
+        self._data_version = None
+
+    def _import_legacy(self) -> None:
+        """Moves an index saved as index.faiss + metadata.json into the table (once, when it is empty)."""
+        metadata_path = os.path.join(self.directory, _LEGACY_METADATA_FILE)
+        index_path = os.path.join(self.directory, _LEGACY_INDEX_FILE)
+        if not os.path.exists(metadata_path) or not os.path.exists(index_path):
+            return
+        if self._conn.execute("SELECT 1 FROM docs LIMIT 1").fetchone():
+            return
+        import faiss
+
+        index = faiss.read_index(index_path)
+        with open(metadata_path, encoding="utf-8") as f:
+            items = json.load(f)["items"]
+        self._conn.executemany(
+            "INSERT INTO docs (doc_id, vector, meta) VALUES (?, ?, ?)",
+            [(doc_id, np.asarray(index.reconstruct(meta["_fid"]), dtype=np.float32).tobytes(),
+              json.dumps({k: v for k, v in meta.items() if k != "_fid"}))
+             for doc_id, meta in items.items()]
+        )
+        self._reset()  # Our own inserts don't bump data_version
+
+    @classmethod
+    def load(cls, directory: str = JD_INDEX_DIR) -> "VectorIndex":
+        """Loads the index from `directory` (an empty index if nothing was saved yet)."""
+        index = cls(directory)
+        with index.update():
+            index._import_legacy()
+        index.refresh()
+        return index
+
+    def refresh(self) -> bool:
+        """
+        Picks up documents other processes added or removed since the last call.
+
+        Returns:
+            True if anything may have changed.
+        """
+        with self._lock:
+            return self._sync()
+
+    @contextmanager
+    def update(self):
+        """
+        Groups changes into one transaction: holds SQLite's write lock, first
+        applies other processes' changes, and commits on exit (or rolls back
+        if the block raises). `add_vectors` and `remove` open one themselves
+        when called outside it.
+
+            with index.update():
+                index.add_vectors(docs, vectors)
+        """
+        with self._lock:
+            if self._conn.in_transaction:
+                yield self
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._sync()
+                yield self
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                self._reset()
+                raise
+            self._conn.execute("COMMIT")
+
+    # ---------- updates ----------
+
+    def _ensure_index(self, dim: int) -> None:
+        import faiss
+
+        if self._index is None:
+            self._index = faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+
+    def _drop(self, fids: List[int]) -> None:
+        if fids and self._index is not None:
+            self._index.remove_ids(np.asarray(fids, dtype=np.int64))
+        for fid in fids:
+            self._fids.pop(self._by_fid.pop(fid), None)
+
+    def add(self, docs: Iterable[dict], batch_size: int = JD_INGEST_BATCH_SIZE) -> int:
+        """
+        Embeds and adds (or replaces) documents.
+
+        Args:
+            docs: Dicts with "id" and "text"; any other keys (title, company, url, ...) are kept as metadata.
+            batch_size: Documents embedded per model batch.
+
+        Returns:
+            The number of documents added.
+        """
+        docs, vectors = embed_docs(docs, batch_size)
+        self.add_vectors(docs, vectors)
+        return len(docs)
+
+    def add_vectors(self, docs: List[dict], vectors: List[List[float]]) -> None:
+        """
+        Adds (or replaces) documents whose embeddings were already computed.
+
+        Args:
+            docs: Dicts with "id"; any other keys are kept as metadata.
+            vectors: One embedding per document.
+        """
+        if not docs:
+            return
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+        with self.update():
+            self._ensure_index(vectors.shape[1])
+            self.remove([str(d["id"]) for d in docs])
+            fids = []
+            for doc, vector in zip(docs, vectors):
+                meta = {k: v for k, v in doc.items() if k != "id"}
+                cursor = self._conn.execute(
+                    "INSERT INTO docs (doc_id, vector, meta) VALUES (?, ?, ?)",
+                    (str(doc["id"]), vector.tobytes(), json.dumps(meta))
+                )
+                fids.append(cursor.lastrowid)
+            self._index.add_with_ids(vectors, np.asarray(fids, dtype=np.int64))
+            for fid, doc in zip(fids, docs):
+                self._fids[str(doc["id"])] = fid
+                self._by_fid[fid] = str(doc["id"])
+            self._max_fid = max(self._max_fid, fids[-1])
+
+    def remove(self, doc_ids: Iterable[str]) -> int:
+        """Removes documents by id; unknown ids are ignored. Returns the number removed."""
+        with self.update():
+            fids = [self._fids[doc_id] for doc_id in doc_ids if doc_id in self._fids]
+            self._conn.executemany("DELETE FROM docs WHERE fid = ?", [(fid,) for fid in fids])
+            self._drop(fids)
+            return len(fids)
+
+    # ---------- queries ----------
+
+    def _metadata(self, fids: List[int]) -> Dict[int, dict]:
+        """Metadata of the given rows, read by primary key."""
+        found = {}
+        for start in range(0, len(fids), 500):
+            chunk = fids[start:start + 500]
+            rows = self._conn.execute(
+                f"SELECT fid, meta FROM docs WHERE fid IN ({','.join('?' * len(chunk))})", chunk
+            )
+            found.update((fid, json.loads(meta)) for fid, meta in rows)
+        return found
+
+    def search(self, vector: List[float], k: int = 10) -> List[dict]:
+        """
+        Top-`k` documents for an embedding.
+
+        Returns:
+            Dicts with "id", "score" (cosine similarity) and the document's metadata, best first.
+        """
+        with self._lock:
+            self._sync()
+            if self._index is None or self._index.ntotal == 0:
+                return []
+            query = _normalize(np.asarray([vector], dtype=np.float32))
+            scores, fids = self._index.search(query, min(k, self._index.ntotal))
+            hits = [(score, fid) for score, fid in zip(scores[0].tolist(), fids[0].tolist()) if fid in self._by_fid]
+            metadata = self._metadata([fid for _, fid in hits])
+            # A row another process removed since the sync has no metadata any more
+            return [{"id": self._by_fid[fid], "score": score, **metadata[fid]} for score, fid in hits if fid in metadata]
+
+    def get(self, doc_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT meta FROM docs WHERE doc_id = ?", (doc_id,)).fetchone()
+            return None if row is None else json.loads(row[0])
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return len(self._by_fid)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            self._sync()
+            return {
+                "items": len(self._by_fid),
+                "dim": None if self._index is None else self._index.d,
+                "directory": self.directory,
+            }
+
+
+# Loaded on first use (or during warm-up); the same instance serves every request in the process.
+get_jd_index = register_resource("jd_index", lambda: VectorIndex.load(JD_INDEX_DIR))
+get_resume_index = register_resource("resume_index", lambda: VectorIndex.load(RESUME_INDEX_DIR), warm_up=False)
+
+
+# ---------- bulk ingestion ----------
+
+def read_jds(path: str) -> List[dict]:
+    """
+    Reads JDs from a directory of .txt files (the file name is the id and title)
+    or from a JSON Lines file with one {"id", "text", ...} object per line.
+    """
+    if os.path.isdir(path):
+        jds = []
+        for name in sorted(os.listdir(path)):
+            if name.endswith(".txt"):
+                with open(os.path.join(path, name), encoding="utf-8", errors="ignore") as f:
+                    stem = os.path.splitext(name)[0]
+                    jds.append({"id": stem, "title": stem.replace("_", " ").title(), "text": f.read()})
+        return jds
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JD FAISS index maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ingest = sub.add_parser("ingest", help="Add or replace JDs from a .txt directory or a .jsonl file")
+    ingest.add_argument("path")
+    remove = sub.add_parser("remove", help="Remove JDs by id")
+    remove.add_argument("ids", nargs="+")
+    sub.add_parser("stats")
+    args = parser.parse_args()
+
+    index = get_jd_index()
+    if args.command == "ingest":
+        docs, vectors = embed_docs(read_jds(args.path))
+        with index.update():
+            index.add_vectors(docs, vectors)
+        print(f"Added {len(docs)} JDs")
+    elif args.command == "remove":
+        with index.update():
+            print(f"Removed {index.remove(args.ids)} JDs")
+    print(json.dumps(index.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
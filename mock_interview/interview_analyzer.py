@@ -2,35 +2,32 @@
 Interview Analysis Engine for Mock Interview Analyzer
 Analyzes speech for clarity, confidence, sentiment, and keyword matching
 """
-import json
-import os
-from langchain_groq import ChatGroq
 import re
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 from textblob import TextBlob
-import nltk
 from nltk.sentiment import SentimentIntensityAnalyzer
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
-import streamlit as st
 from dotenv import load_dotenv
 
+from core.llm_gateway import invoke_llm, ainvoke_llm
+from core.resources import lazy_chat_model, lazy_nltk_data
+from core.json_extract import JSONExtraction, extract_json, fill_missing_fields, afill_missing_fields
+from core.prompt_budget import truncate_to_tokens, strip_jd_boilerplate, JD_TOKEN_BUDGET
+
 load_dotenv()
-groq_api_key = os.environ.get("GROQ_API_KEY")
-if not groq_api_key:
-    raise ValueError("GROQ_API_KEY not found. Please set in .env file.")
-llm = ChatGroq(groq_api_key=groq_api_key, model_name="llama-3.3-70b-versatile")
-# Download required NLTK data
-try:
-    nltk.download('vader_lexicon', quiet=True)
-    nltk.download('punkt', quiet=True)
-    nltk.download('stopwords', quiet=True)
-except:
-    pass
+get_llm = lazy_chat_model("llama-3.3-70b-versatile")
+ANALYSIS_FIELDS = ["clarity", "confidence", "fluency", "relevance", "sentiment", "keyword_match"]
+# Required NLTK data, downloaded (only if missing) on first use instead of at import
+ensure_nltk_data = lazy_nltk_data('vader_lexicon', 'punkt', 'stopwords')
 
 class InterviewAnalyzer:
     def __init__(self):
+        try:
+            ensure_nltk_data()
+        except Exception as e:
+            print(f"Warning: could not fetch NLTK data: {e}")
         self.sia = SentimentIntensityAnalyzer()
         self.stop_words = set(stopwords.words('english'))
 
@@ -42,8 +39,35 @@ class InterviewAnalyzer:
         """
         LLM-based analysis of interview response using Groq
         """
-          # Make sure groq is installed and your API key is set
-        prompt = f"""
+        prompt = self._build_analysis_prompt(transcript, question, job_description)
+        response = invoke_llm(get_llm(), prompt)
+        print("Raw LLM response from InterviewAnalyzer:", response.content) # More specific debug print
+        result = extract_json(response.content, ANALYSIS_FIELDS)
+        if result.missing and isinstance(result.value, dict):
+            # Re-request only the metrics that are missing, not the whole analysis
+            result = fill_missing_fields(result, prompt, lambda p: invoke_llm(get_llm(), p).content)
+        return self._finalize_analysis(result)
+
+    async def aanalyze_response(self,
+            transcript: str,
+            question: str = "",
+            audio_features: Dict = None,
+            job_description: str = "") -> Dict:
+        """
+        Async variant of `analyze_response` for the FastAPI router
+        """
+        prompt = self._build_analysis_prompt(transcript, question, job_description)
+        response = await ainvoke_llm(get_llm(), prompt)
+        result = extract_json(response.content, ANALYSIS_FIELDS)
+        if result.missing and isinstance(result.value, dict):
+            async def ask(follow_up_prompt: str) -> str:
+                return (await ainvoke_llm(get_llm(), follow_up_prompt)).content
+            result = await afill_missing_fields(result, prompt, ask)
+        return self._finalize_analysis(result)
+
+    def _build_analysis_prompt(self, transcript: str, question: str, job_description: str) -> str:
+        job_description = truncate_to_tokens(strip_jd_boilerplate(job_description), JD_TOKEN_BUDGET, get_llm().model_name)
+        return f"""
 You are an expert interview evaluator. Analyze the following response and provide scores (0-1) for:
 - Clarity
 - Confidence
@@ -58,32 +82,17 @@ Job Description: {job_description}
 Candidate Response: {transcript}
         """
 
-        response = llm.invoke(prompt)
-        print("Raw LLM response from InterviewAnalyzer:", response.content) # More specific debug print
-    
-        json_string = response.content.strip()
-        start_index = json_string.find("```json")
-        end_index = json_string.find("```", start_index + len("```json"))
-
-        if start_index != -1 and end_index != -1:
-            json_string = json_string[start_index + len("```json\n") : end_index].strip()
-            print("Extracted JSON string (markdown block):", json_string) # Debug print
+    def _finalize_analysis(self, result: JSONExtraction) -> Dict:
+        if not isinstance(result.value, dict):
+            print("Error decoding JSON from LLM response. Returning default analysis.")
+            analysis = self._get_default_analysis("LLM response JSON parsing failed")
         else:
-            print("Warning: JSON markdown block not found in interview_analyzer.py. Attempting to parse raw response as is.")
-            print("Raw response being parsed as JSON:", json_string) # Debug print for fallback
-        
-        # Clean control characters before parsing
-        cleaned_json_string = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f]', '', json_string)
-        print("Cleaned JSON string before json.loads():", cleaned_json_string) # CRITICAL debug print
-        
-        try:
-            analysis = json.loads(cleaned_json_string)
-        except json.JSONDecodeError as e:
-            print(f"Error decoding JSON from LLM response: {e}. Returning default analysis.")
-            analysis = self._get_default_analysis(f"LLM response JSON parsing failed: {e}")
-        except Exception as e:
-            print(f"Unexpected error parsing JSON: {e}. Returning default analysis.")
-            analysis = self._get_default_analysis(f"Unexpected parsing error: {e}")
+            analysis = result.value
+            if result.missing:
+                print(f"Warning: analysis still missing {result.missing}, using defaults for them.")
+                defaults = self._get_default_analysis("Not returned by the model")
+                for metric in result.missing:
+                    analysis[metric] = defaults[metric]
         
         # Calculate overall score as before
         analysis['overall_score'] = self._calculate_overall_score(analysis)
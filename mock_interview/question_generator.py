@@ -3,12 +3,13 @@ Interview Question Generator
 Generates relevant interview questions based on job description using LLM
 """
 
-import os
-import json
-import re
-from typing import List, Dict, Optional
+from contextlib import aclosing
+from typing import AsyncIterator, List, Dict, Optional
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
+
+from core.llm_gateway import get_chat_model, invoke_llm, ainvoke_llm, astream_llm
+from core.json_extract import parse_json, JSONStreamParser
+from core.prompt_budget import truncate_to_tokens, strip_jd_boilerplate, JD_TOKEN_BUDGET
 
 load_dotenv()
 
@@ -16,11 +17,7 @@ class QuestionGenerator:
     """Generates interview questions based on job description"""
     
     def __init__(self):
-        groq_api_key = os.environ.get("GROQ_API_KEY")
-        if not groq_api_key:
-            raise ValueError("GROQ_API_KEY not found in environment variables")
-        
-        self.llm = ChatGroq(groq_api_key=groq_api_key, model_name="llama-3.1-8b-instant")
+        self.llm = get_chat_model("llama-3.1-8b-instant")
     
     def generate_questions(self, job_description: str, num_questions: int = 5, 
                           question_types: List[str] = None) -> List[Dict]:
@@ -35,10 +32,66 @@ class QuestionGenerator:
         Returns:
             List of question dictionaries with text, type, and difficulty
         """
+        prompt = self._build_questions_prompt(job_description, num_questions, question_types)
+
+        try:
+            response = invoke_llm(self.llm, prompt, use_cache=False)
+            return self._parse_questions(response.content, num_questions)
+        except Exception as e:
+            print(f"Error generating questions: {e}")
+            return self._get_fallback_questions(job_description, num_questions)
+
+    async def agenerate_questions(self, job_description: str, num_questions: int = 5,
+                                  question_types: List[str] = None) -> List[Dict]:
+        """Async variant of `generate_questions` for the FastAPI router."""
+        prompt = self._build_questions_prompt(job_description, num_questions, question_types)
+
+        try:
+            response = await ainvoke_llm(self.llm, prompt, use_cache=False)
+            return self._parse_questions(response.content, num_questions)
+        except Exception as e:
+            print(f"Error generating questions: {e}")
+            return self._get_fallback_questions(job_description, num_questions)
+
+    async def astream_questions(self, job_description: str, num_questions: int = 5,
+                                question_types: List[str] = None) -> AsyncIterator[Dict]:
+        """
+        Streams generated questions one by one, each as soon as its JSON object
+        closes in the LLM output, instead of waiting for the whole array.
+        Falls back to the generic questions if the stream yields none.
+        """
+        prompt = self._build_questions_prompt(job_description, num_questions, question_types)
+        parser = JSONStreamParser(emit_items=True)
+        sent = 0
+        try:
+            # aclosing: stopping early releases the model's concurrency slot right away
+            async with aclosing(astream_llm(self.llm, prompt)) as chunks:
+                async for chunk in chunks:
+                    for item in parser.feed(chunk):
+                        # {"questions": [...]} arrives whole; a bare array arrives item by item
+                        items = item.get("questions") if isinstance(item, dict) and "question" not in item else [item]
+                        for question in map(self._validate_question, items or []):
+                            if question and sent < num_questions:
+                                sent += 1
+                                yield question
+                    if sent >= num_questions:
+                        return
+        except Exception as e:
+            print(f"Error streaming questions: {e}")
+        if not sent:
+            for question in self._get_fallback_questions(job_description, num_questions):
+                yield question
+
+    def _build_questions_prompt(self, job_description: str, num_questions: int,
+                                question_types: List[str] = None) -> str:
+        """Build the question generation prompt"""
         if not question_types:
             question_types = ["technical", "behavioral", "general"]
+        job_description = truncate_to_tokens(
+            strip_jd_boilerplate(job_description), JD_TOKEN_BUDGET, self.llm.model_name
+        )
         
-        prompt = f"""
+        return f"""
 You are an expert interview coach and HR professional. Generate {num_questions} relevant interview questions based on the following job description.
 
 Job Description:
@@ -76,42 +129,31 @@ Example format:
 Generate exactly {num_questions} questions that are highly relevant to this specific job description.
 """
 
-        try:
-            response = self.llm.invoke(prompt)
-            json_string = response.content.strip()
-            
-            # Extract JSON from markdown if present
-            start_index = json_string.find("```json")
-            end_index = json_string.find("```", start_index + len("```json"))
-            
-            if start_index != -1 and end_index != -1:
-                json_string = json_string[start_index + len("```json\n"):end_index].strip()
-            
-            # Clean the JSON string
-            cleaned_json_string = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f]', '', json_string)
-            
-            questions = json.loads(cleaned_json_string)
-            
-            # Validate and clean the questions
-            validated_questions = []
-            for q in questions:
-                if isinstance(q, dict) and 'question' in q:
-                    validated_questions.append({
-                        'question': q.get('question', ''),
-                        'type': q.get('type', 'general'),
-                        'difficulty': q.get('difficulty', 'medium'),
-                        'focus_area': q.get('focus_area', ''),
-                        'ideal_answer_keywords': q.get('ideal_answer_keywords', [])
-                    })
-            
-            return validated_questions[:num_questions]
-            
-        except json.JSONDecodeError as e:
-            print(f"JSON Decode Error in generate_questions: {e}")
-            return self._get_fallback_questions(job_description, num_questions)
-        except Exception as e:
-            print(f"Error generating questions: {e}")
-            return self._get_fallback_questions(job_description, num_questions)
+    def _parse_questions(self, content: str, num_questions: int) -> List[Dict]:
+        """Parse and validate the questions returned by the LLM"""
+        # Tolerates fences, trailing commas and a cut-off final question
+        questions = parse_json(content)
+        if isinstance(questions, dict):
+            questions = questions.get("questions")
+        if not isinstance(questions, list):
+            raise ValueError("No JSON array of questions in LLM response")
+        
+        # Validate and clean the questions
+        validated_questions = [q for q in map(self._validate_question, questions) if q]
+        return validated_questions[:num_questions]
+
+    @staticmethod
+    def _validate_question(q) -> Optional[Dict]:
+        """One question in the response shape, or None if it isn't a question object"""
+        if not isinstance(q, dict) or 'question' not in q:
+            return None
+        return {
+            'question': q.get('question', ''),
+            'type': q.get('type', 'general'),
+            'difficulty': q.get('difficulty', 'medium'),
+            'focus_area': q.get('focus_area', ''),
+            'ideal_answer_keywords': q.get('ideal_answer_keywords', [])
+        }
     
     def _get_fallback_questions(self, job_description: str, num_questions: int) -> List[Dict]:
         """Fallback questions if LLM generation fails"""
@@ -184,20 +226,10 @@ Return as a JSON array of strings:
 """
 
         try:
-            response = self.llm.invoke(prompt)
-            json_string = response.content.strip()
-            
-            # Extract JSON from markdown if present
-            start_index = json_string.find("```json")
-            end_index = json_string.find("```", start_index + len("```json"))
-            
-            if start_index != -1 and end_index != -1:
-                json_string = json_string[start_index + len("```json\n"):end_index].strip()
-            
-            # Clean the JSON string
-            cleaned_json_string = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f]', '', json_string)
-            
-            follow_ups = json.loads(cleaned_json_string)
+            response = invoke_llm(self.llm, prompt, use_cache=False)
+            follow_ups = parse_json(response.content)
+            if follow_ups is None:
+                raise ValueError("No JSON in LLM response")
             return follow_ups if isinstance(follow_ups, list) else []
             
         except Exception as e:
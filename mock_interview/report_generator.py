@@ -3,12 +3,12 @@ Interview Report Generator
 Generates comprehensive reports for mock interview sessions
 """
 
-import os
 import json
 from datetime import datetime
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
+
+from core.llm_gateway import get_chat_model, invoke_llm
 
 load_dotenv()
 
@@ -16,11 +16,7 @@ class InterviewReportGenerator:
     """Generates detailed interview reports with AI insights"""
     
     def __init__(self):
-        groq_api_key = os.environ.get("GROQ_API_KEY")
-        if not groq_api_key:
-            raise ValueError("GROQ_API_KEY not found in environment variables")
-        
-        self.llm = ChatGroq(groq_api_key=groq_api_key, model_name="llama-3.1-8b-instant")
+        self.llm = get_chat_model("llama-3.1-8b-instant")
     
     def generate_comprehensive_report(self, 
                                     interview_session: Dict,
@@ -212,7 +208,7 @@ Be specific, constructive, and actionable in your feedback. Focus on helping the
 """
 
         try:
-            response = self.llm.invoke(prompt)
+            response = invoke_llm(self.llm, prompt)
             return response.content.strip()
         except Exception as e:
             return f"AI insights generation failed: {str(e)}. Please review the analysis metrics manually."
@@ -8,7 +8,8 @@ import re
 from typing import Dict, Any, List, Optional
 
 from portfolio_builder.core.state import PortfolioBuilderState, GeneratedCode
-from portfolio_builder.core.llm_config import get_code_llm
+from portfolio_builder.core.llm_config import get_code_llm, invoke_with_cascade
+from portfolio_builder.agents.validator.validator_agent import _static_validate
 from portfolio_builder.core.logger import get_logger
 from portfolio_builder.utils.helpers import format_component_name
 
@@ -252,7 +253,13 @@ def _generate_with_llm(
         prompt = prompt_template.format(**context)
         logger.info(f"  [LLM] Calling LLM for {section_name}...")
         
-        response = llm.invoke(prompt)
+        filename = f"{format_component_name(section_name)}.jsx"
+        response = invoke_with_cascade(
+            "code_generation",
+            prompt,
+            validate=lambda r: _is_valid_component(filename, r.content),
+            temperature=llm.temperature
+        )
         code = _extract_jsx_code(response.content)
         
         if code:
@@ -267,6 +274,14 @@ def _generate_with_llm(
         return _generate_fallback(section_name, section_content, website_plan, resume_data)
 
 
+def _is_valid_component(filename: str, response: str) -> bool:
+    """Cascade check: a component can be extracted and passes static validation."""
+    code = _extract_jsx_code(response)
+    if not code:
+        return False
+    return not any(e["severity"] == "error" for e in _static_validate(filename, _sanitize_jsx(code)))
+
+
 def _extract_jsx_code(response: str) -> Optional[str]:
     """Extract JSX code block from LLM response."""
     # Try to extract from code blocks
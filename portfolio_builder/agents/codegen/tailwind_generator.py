@@ -7,6 +7,7 @@ Hardcoded: base CSS structure, theme tokens, font imports
 
 from typing import Dict, Any, List
 
+from core.llm_gateway import invoke_llm
 from portfolio_builder.core.state import GeneratedCode
 from portfolio_builder.core.llm_config import get_fast_llm
 from portfolio_builder.core.logger import get_logger
@@ -198,7 +199,7 @@ def _get_custom_utilities_llm(colors: Dict, style: str, use_animations: bool) ->
         )
         
         logger.info("  [LLM] Calling LLM for custom utilities...")
-        response = llm.invoke(prompt)
+        response = invoke_llm(llm, prompt)
         
         utilities = _extract_css(response.content)
         
@@ -4,14 +4,14 @@ Projects Section Agent for Portfolio Builder.
 Generates content for the projects showcase section of the portfolio.
 """
 
-import json
 from typing import Dict, Any, List
 
+from core.llm_gateway import invoke_llm
 from portfolio_builder.core.state import PortfolioBuilderState, SectionContent
 from portfolio_builder.core.llm_config import get_fast_llm
 from portfolio_builder.core.prompts import PROJECTS_SECTION_PROMPT
 from portfolio_builder.core.logger import get_logger
-from portfolio_builder.utils.helpers import safe_json_parse
+from portfolio_builder.utils.helpers import safe_json_parse, build_section_prompt
 
 logger = get_logger("projects_section")
 
@@ -45,13 +45,11 @@ def projects_section_agent(state: PortfolioBuilderState) -> Dict[str, Any]:
     try:
         llm = get_fast_llm(temperature=0.6)
         
-        prompt = PROJECTS_SECTION_PROMPT.format(
-            resume_data=json.dumps(resume_data, indent=2, default=str),
-            website_plan=json.dumps(website_plan, indent=2, default=str),
-            style=website_plan.get("style", "modern")
+        prompt = build_section_prompt(
+            PROJECTS_SECTION_PROMPT, "projects", resume_data, website_plan, model_name=llm.model_name
         )
         
-        response = llm.invoke(prompt)
+        response = invoke_llm(llm, prompt, use_cache=False)
         content = safe_json_parse(response.content, default={})
         
     except Exception as e:
@@ -4,12 +4,17 @@ Resume Parser Node for Portfolio Builder LangGraph Workflow.
 This node extracts structured data from raw resume text using an LLM.
 """
 
+import os
+import re
 import json
-from typing import Dict, Any
+import hashlib
+from typing import Dict, Any, List, Optional
 
+from core.prompt_budget import truncate_to_tokens
+from core.resume_artifacts import ResumeArtifact, artifact_for_path, artifact_for_text
 from portfolio_builder.core.state import PortfolioBuilderState, ResumeData
-from portfolio_builder.core.llm_config import get_reasoning_llm
-from portfolio_builder.core.prompts import RESUME_PARSER_PROMPT
+from portfolio_builder.core.llm_config import get_llm_config
+from portfolio_builder.core.prompts import RESUME_PARSER_PROMPT, RESUME_TEXT_TOKEN_BUDGET
 from portfolio_builder.core.logger import get_logger
 from portfolio_builder.utils.text_cleaner import (
     clean_resume_text, 
@@ -22,6 +27,15 @@ from portfolio_builder.utils.helpers import safe_json_parse
 
 logger = get_logger("resume_parser")
 
+LIST_FIELDS = ("skills", "projects", "experience", "education", "certifications", "languages", "interests")
+
+# Section headings whose presence in the resume means the parse must not come back empty for them
+_SECTION_HEADINGS = {
+    "experience": re.compile(r"^\s*(work |professional )?experience\s*:?\s*$", re.IGNORECASE | re.MULTILINE),
+    "projects": re.compile(r"^\s*(personal |academic )?projects\s*:?\s*$", re.IGNORECASE | re.MULTILINE),
+    "skills": re.compile(r"^\s*(technical )?skills\s*:?\s*$", re.IGNORECASE | re.MULTILINE),
+}
+
 
 def resume_parser_node(state: PortfolioBuilderState) -> Dict[str, Any]:
     """
@@ -67,31 +81,30 @@ def resume_parser_node(state: PortfolioBuilderState) -> Dict[str, Any]:
     logger.info(f"  [UTILITY] Extracted github: {extracted_urls.get('github') or 'Not found'}")
     logger.info(f"  [UTILITY] Extracted linkedin: {extracted_urls.get('linkedin') or 'Not found'}")
     
-    # Step 3: Use LLM to extract structured data
+    # Step 3: Use LLM to extract structured data (stored per resume, so re-runs
+    # for the same resume and parser version skip the LLM)
     logger.info("--- LLM: Attempting to parse resume with LLM ---")
-    llm_result = {}
-    llm_success = False
-    
     try:
-        llm = get_reasoning_llm(temperature=0.1)  # Low temperature for accuracy
-        
-        prompt = RESUME_PARSER_PROMPT.format(resume_text=cleaned_text)
-        response = llm.invoke(prompt)
-        
-        llm_result = safe_json_parse(response.content, default={})
-        
+        # Every model the cascade may answer with is part of the version, so changing any of them re-parses
+        parser_version = hashlib.sha256(
+            f"{json.dumps(get_llm_config().cascade_models('resume_parsing'))}\n{RESUME_PARSER_PROMPT}".encode("utf-8")
+        ).hexdigest()[:16]
+        artifact = _resume_artifact(state.get("resume_file_path"), resume_text)
+        parsed = artifact.parsed_resume(lambda: _parse_with_llm(cleaned_text), parser_version) or {}
+        llm_result = parsed.get("fields") or {}
         if llm_result:
-            llm_success = True
-            logger.info("  [LLM] SUCCESS: LLM returned valid parsed data")
-            logger.info(f"  [LLM] Name: {llm_result.get('name', 'Not found')}")
-            logger.info(f"  [LLM] Skills count: {len(llm_result.get('skills', []))}")
-            logger.info(f"  [LLM] Projects count: {len(llm_result.get('projects', []))}")
-            logger.info(f"  [LLM] Experience count: {len(llm_result.get('experience', []))}")
-        else:
-            logger.warning("  [LLM] WARNING: LLM returned empty result, will use utility fallbacks")
-        
+            logger.info(f"  [LLM] Parse produced by {parsed.get('model') or 'unknown model'}")
     except Exception as e:
         logger.error(f"  [LLM] ERROR: LLM parsing failed: {e}")
+        llm_result = {}
+    llm_success = bool(llm_result)
+    if llm_success:
+        logger.info("  [LLM] SUCCESS: LLM returned valid parsed data")
+        logger.info(f"  [LLM] Name: {llm_result.get('name', 'Not found')}")
+        logger.info(f"  [LLM] Skills count: {len(llm_result.get('skills', []))}")
+        logger.info(f"  [LLM] Projects count: {len(llm_result.get('projects', []))}")
+        logger.info(f"  [LLM] Experience count: {len(llm_result.get('experience', []))}")
+    else:
         logger.warning("  [LLM] Will use utility function fallbacks")
     
     # Step 4: Build the final ResumeData, merging LLM results with direct extraction
@@ -157,6 +170,91 @@ def resume_parser_node(state: PortfolioBuilderState) -> Dict[str, Any]:
     }
 
 
+def _resume_artifact(resume_file_path: Optional[str], resume_text: str) -> ResumeArtifact:
+    """Artifacts of the uploaded file (same id as in the other tools), or of the text."""
+    if resume_file_path and os.path.isfile(resume_file_path):
+        return artifact_for_path(resume_file_path)
+    return artifact_for_text(resume_text)
+
+
+def _parse_with_llm(cleaned_text: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract structured data with the LLM.
+    
+    Args:
+        cleaned_text: Cleaned resume text
+        
+    Returns:
+        {"model": model that produced the parse, "fields": parsed fields},
+        or None if the LLM failed (so nothing is stored)
+    """
+    try:
+        llm_config = get_llm_config()
+        
+        prompt = RESUME_PARSER_PROMPT.format(
+            resume_text=truncate_to_tokens(
+                cleaned_text, RESUME_TEXT_TOKEN_BUDGET, llm_config.model_for("resume_parsing")
+            )
+        )
+        # Fast model first; escalate to the reasoning model if the parse looks incomplete
+        response = llm_config.invoke_with_cascade(
+            "resume_parsing",
+            prompt,
+            validate=lambda r: not validate_parsed_resume(r.content, cleaned_text),
+            temperature=0.1  # Low temperature for accuracy
+        )
+        
+        llm_result = safe_json_parse(response.content, default={})
+        if not llm_result:
+            logger.warning("  [LLM] WARNING: LLM returned empty result")
+            return None
+        return {"model": response.response_metadata.get("model_name"), "fields": llm_result}
+        
+    except Exception as e:
+        logger.error(f"  [LLM] ERROR: LLM parsing failed: {e}")
+        return None
+
+
+def validate_parsed_resume(response: str, resume_text: str = "") -> List[str]:
+    """
+    Check an LLM resume parse against the ResumeData shape.
+    
+    Args:
+        response: Raw LLM response
+        resume_text: Cleaned resume text, used to spot sections the parse missed
+        
+    Returns:
+        List of problems (empty if the parse is usable)
+    """
+    data = safe_json_parse(response, default={})
+    if not isinstance(data, dict) or not data:
+        return ["response is not a JSON object"]
+    
+    issues = []
+    if not data.get("name"):
+        issues.append("missing name")
+    for field in LIST_FIELDS:
+        if data.get(field) is not None and not isinstance(data[field], list):
+            issues.append(f"{field} is not a list")
+    if not any(data.get(field) for field in ("skills", "projects", "experience")):
+        issues.append("no skills, projects or experience")
+    
+    for item in data.get("projects") or []:
+        if not isinstance(item, dict) or not item.get("title"):
+            issues.append("project without a title")
+            break
+    for item in data.get("experience") or []:
+        if not isinstance(item, dict) or not (item.get("company") or item.get("role")):
+            issues.append("experience entry without company or role")
+            break
+    
+    for field, heading in _SECTION_HEADINGS.items():
+        if not data.get(field) and heading.search(resume_text):
+            issues.append(f"resume has a {field} section but none was parsed")
+    
+    return issues
+
+
 def _calculate_parsing_confidence(resume_data: ResumeData) -> float:
     """
     Calculate confidence score based on extracted data completeness.
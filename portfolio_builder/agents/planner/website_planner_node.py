@@ -5,17 +5,22 @@ This is the "brain" of the system - it analyzes the resume and user preferences
 to create a comprehensive website design plan.
 """
 
-import json
+import re
 from typing import Dict, Any, List
 
+from core.prompt_budget import build_prompt, select_fields
 from portfolio_builder.core.state import PortfolioBuilderState, WebsitePlan
-from portfolio_builder.core.llm_config import get_reasoning_llm
-from portfolio_builder.core.prompts import WEBSITE_PLANNER_PROMPT
+from portfolio_builder.core.llm_config import get_llm_config
+from portfolio_builder.core.prompts import WEBSITE_PLANNER_PROMPT, RESUME_FIELDS, PLANNER_RESUME_TOKEN_BUDGET
 from portfolio_builder.core.logger import get_logger
 from portfolio_builder.utils.helpers import safe_json_parse, get_section_order
 
 logger = get_logger("website_planner")
 
+VALID_STYLES = ("minimal", "modern", "creative", "professional", "bold")
+REQUIRED_COLORS = ("primary", "background", "text")
+_HEX_COLOR = re.compile(r"^#(?:[0-9a-fA-F]{3}){1,2}$")
+
 
 # Default color schemes for different styles
 DEFAULT_COLOR_SCHEMES = {
@@ -87,14 +92,23 @@ def website_planner_node(state: PortfolioBuilderState) -> Dict[str, Any]:
     llm_success = False
     
     try:
-        llm = get_reasoning_llm(temperature=0.7)
+        llm_config = get_llm_config()
         
-        prompt = WEBSITE_PLANNER_PROMPT.format(
+        prompt = build_prompt(
+            WEBSITE_PLANNER_PROMPT,
+            budgets={"resume_data": PLANNER_RESUME_TOKEN_BUDGET},
+            model_name=llm_config.model_for("website_planning"),
             user_prompt=user_prompt,
-            resume_data=json.dumps(resume_data, indent=2, default=str)
+            resume_data=select_fields(resume_data, RESUME_FIELDS["website_planner"])
         )
         
-        response = llm.invoke(prompt)
+        # Fast model first; escalate to the reasoning model if the plan is malformed
+        response = llm_config.invoke_with_cascade(
+            "website_planning",
+            prompt,
+            validate=lambda r: not validate_website_plan(r.content),
+            temperature=0.7
+        )
         llm_plan = safe_json_parse(response.content, default={})
         
         if llm_plan:
@@ -209,6 +223,34 @@ def website_planner_node(state: PortfolioBuilderState) -> Dict[str, Any]:
     }
 
 
+def validate_website_plan(response: str) -> List[str]:
+    """
+    Check an LLM website plan against the WebsitePlan shape.
+    
+    Returns:
+        List of problems (empty if the plan is usable)
+    """
+    plan = safe_json_parse(response, default={})
+    if not isinstance(plan, dict) or not plan:
+        return ["response is not a JSON object"]
+    
+    issues = []
+    if plan.get("style") not in VALID_STYLES:
+        issues.append(f"invalid style: {plan.get('style')}")
+    colors = plan.get("color_scheme")
+    if not isinstance(colors, dict):
+        issues.append("missing color_scheme")
+    else:
+        for key in REQUIRED_COLORS:
+            if not _HEX_COLOR.match(str(colors.get(key, ""))):
+                issues.append(f"color_scheme.{key} is not a hex color")
+    sections = plan.get("sections")
+    if not isinstance(sections, list) or not sections:
+        issues.append("missing sections")
+    
+    return issues
+
+
 def _infer_style_from_prompt(user_prompt: str) -> str:
     """Infer website style from user prompt keywords."""
     prompt_lower = user_prompt.lower() if user_prompt else ""
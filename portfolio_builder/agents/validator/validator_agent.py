@@ -16,7 +16,7 @@ from portfolio_builder.core.state import (
     ValidationResult,
     ValidationError
 )
-from portfolio_builder.core.llm_config import get_code_llm
+from portfolio_builder.core.llm_config import get_code_llm, invoke_with_cascade
 from portfolio_builder.core.logger import get_logger
 
 logger = get_logger("validator")
@@ -328,7 +328,13 @@ def _self_heal_with_llm(
             errors=errors_text
         )
         
-        response = llm.invoke(prompt)
+        error_count = len([e for e in errors if e['severity'] == 'error'])
+        response = invoke_with_cascade(
+            "code_repair",
+            prompt,
+            validate=lambda r: _fix_reduces_errors(filename, r.content, error_count),
+            temperature=llm.temperature
+        )
         fixed_code = _extract_code(response.content)
         
         return fixed_code if fixed_code else None
@@ -338,6 +344,15 @@ def _self_heal_with_llm(
         return None
 
 
+def _fix_reduces_errors(filename: str, response: str, error_count: int) -> bool:
+    """Cascade check: the fix parses out of the response and has fewer static errors."""
+    fixed_code = _extract_code(response)
+    if not fixed_code:
+        return False
+    new_errors = _static_validate(filename, fixed_code)
+    return len([e for e in new_errors if e["severity"] == "error"]) < error_count
+
+
 def _extract_code(response: str) -> Optional[str]:
     """Extract code from LLM response."""
     patterns = [
@@ -16,7 +16,8 @@ from .llm_config import (
     get_llm_config,
     get_reasoning_llm,
     get_fast_llm,
-    get_code_llm
+    get_code_llm,
+    invoke_with_cascade
 )
 
 from .routing import (
@@ -48,6 +49,7 @@ __all__ = [
     "get_reasoning_llm",
     "get_fast_llm",
     "get_code_llm",
+    "invoke_with_cascade",
     # Routing
     "route_to_sections",
     "should_revalidate",
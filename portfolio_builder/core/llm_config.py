@@ -4,17 +4,27 @@ LLM Configuration for Portfolio Builder.
 Configures ChatGroq models for different agent tasks:
 - Complex reasoning (planner, code generator): openai/gpt-oss-120b"
 - Simple tasks (section content): llama-3.1-8b-instant
+
+Cascade mode: heavy tasks (resume parsing, website planning, code generation)
+are first sent to the fast model; its output is checked by a task-specific
+validator and the call escalates to the large model only if the check fails.
 """
 
 import os
+import threading
 from functools import lru_cache
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
 from langchain_core.language_models.chat_models import BaseChatModel
 
+from core.llm_gateway import get_chat_model, invoke_llm
+from core.llm_telemetry import record_cascade
+from portfolio_builder.core.logger import get_logger
+
 load_dotenv()
 
+logger = get_logger("llm_config")
+
 
 class LLMConfig:
     """Configuration and factory for LLM instances."""
@@ -25,14 +35,27 @@ class LLMConfig:
     
     DEFAULT_TEMPERATURE = 0.7
     CODE_TEMPERATURE = 0.2  
-    
+
+    # Task type -> model type used when the fast model's output is rejected
+    # (or always, if the task is not in cascade mode).
+    TASK_MODELS = {
+        "resume_parsing": "reasoning",
+        "website_planning": "reasoning",
+        "code_generation": "code",
+        "code_repair": "code",
+    }
+
+    # Tasks that try the fast model first. Override with
+    # PORTFOLIO_LLM_CASCADE="resume_parsing,website_planning" ("none" disables).
+    CASCADE_TASKS = frozenset(
+        task.strip()
+        for task in os.environ.get("PORTFOLIO_LLM_CASCADE", ",".join(TASK_MODELS)).split(",")
+        if task.strip() and task.strip() != "none"
+    )
+
     def __init__(self):
-        self.api_key = os.environ.get("GROQ_API_KEY")
-        if not self.api_key:
-            raise ValueError(
-                "GROQ_API_KEY not found in environment variables. "
-                "Please set it in your .env file."
-            )
+        self._cascade_stats: Dict[str, Dict[str, int]] = {}
+        self._stats_lock = threading.Lock()
     
     @lru_cache(maxsize=10)
     def get_llm(
@@ -48,7 +71,7 @@ class LLMConfig:
             temperature: Optional temperature override
             
         Returns:
-            Configured ChatGroq instance
+            Shared ChatGroq instance from the LLM gateway
         """
         model_map = {
             "reasoning": (self.REASONING_MODEL, self.DEFAULT_TEMPERATURE),
@@ -62,10 +85,9 @@ class LLMConfig:
         model_name, default_temp = model_map[model_type]
         temp = temperature if temperature is not None else default_temp
         
-        return ChatGroq(
-            groq_api_key=self.api_key,
-            model_name=model_name,
-            temperature=temp,
+        return get_chat_model(
+            model_name,
+            temp,
             max_tokens=8192,
             max_retries=3,
         )
@@ -79,6 +101,87 @@ class LLMConfig:
     def get_code_llm(self, temperature: Optional[float] = None) -> BaseChatModel:
         return self.get_llm("code", temperature)
 
+    # ---------- cascade ----------
+
+    def model_for(self, task: str) -> str:
+        """Name of the large model for `task` (the one prompts are budgeted for)."""
+        return self.get_llm(self.TASK_MODELS[task]).model_name
+
+    def cascade_enabled(self, task: str) -> bool:
+        return task in self.CASCADE_TASKS
+
+    def cascade_models(self, task: str) -> List[str]:
+        """Names of the models that may answer `task`, in the order they are tried."""
+        models = [self.model_for(task)]
+        if self.cascade_enabled(task):
+            models.insert(0, self.get_fast_llm().model_name)
+        return models
+
+    def invoke_with_cascade(
+        self,
+        task: str,
+        prompt: Any,
+        validate: Callable[[Any], bool],
+        temperature: Optional[float] = None
+    ):
+        """
+        Run `prompt` for `task`, trying the fast model first.
+        
+        Args:
+            task: Task type, one of TASK_MODELS
+            prompt: Prompt passed to invoke_llm
+            validate: Returns True if a response is good enough to use
+            temperature: Optional temperature override for both models
+            
+        Returns:
+            The fast model's response if it validates, otherwise the large model's;
+            its response_metadata["model_name"] names the model that answered
+        """
+        if task not in self.TASK_MODELS:
+            raise ValueError(f"Unknown task type: {task}")
+        large_llm = self.get_llm(self.TASK_MODELS[task], temperature)
+        if not self.cascade_enabled(task):
+            return _tag_model(invoke_llm(large_llm, prompt), large_llm)
+
+        try:
+            fast_llm = self.get_fast_llm(temperature)
+            response = _tag_model(invoke_llm(fast_llm, prompt), fast_llm)
+            accepted = bool(validate(response))
+        except Exception as e:
+            logger.warning(f"  [CASCADE] {task}: fast model failed: {e}")
+            accepted = False
+
+        self._record(task, escalated=not accepted)
+        if accepted:
+            logger.info(f"  [CASCADE] {task}: fast model output accepted")
+            return response
+
+        logger.info(f"  [CASCADE] {task}: validation failed, escalating to {large_llm.model_name}")
+        return _tag_model(invoke_llm(large_llm, prompt), large_llm)
+
+    def _record(self, task: str, escalated: bool) -> None:
+        with self._stats_lock:
+            stats = self._cascade_stats.setdefault(task, {"calls": 0, "escalations": 0})
+            stats["calls"] += 1
+            stats["escalations"] += int(escalated)
+        record_cascade(task, escalated)
+
+    def cascade_stats(self) -> Dict[str, Dict[str, float]]:
+        """Calls, escalations and escalation rate per cascaded task."""
+        with self._stats_lock:
+            return {
+                task: dict(stats, escalation_rate=round(stats["escalations"] / stats["calls"], 3))
+                for task, stats in self._cascade_stats.items()
+            }
+
+
+def _tag_model(response, llm: BaseChatModel):
+    """Records which model answered (responses served from the LLM cache don't say)."""
+    metadata = getattr(response, "response_metadata", None)
+    if isinstance(metadata, dict):
+        metadata.setdefault("model_name", llm.model_name)
+    return response
+
 
 # Singleton instance
 _llm_config: Optional[LLMConfig] = None
@@ -105,3 +208,13 @@ def get_fast_llm(temperature: Optional[float] = None) -> BaseChatModel:
 def get_code_llm(temperature: Optional[float] = None) -> BaseChatModel:
     """Convenience function to get code generation LLM."""
     return get_llm_config().get_code_llm(temperature)
+
+
+def invoke_with_cascade(
+    task: str,
+    prompt: Any,
+    validate: Callable[[Any], bool],
+    temperature: Optional[float] = None
+):
+    """Convenience function for a fast-model-first call with escalation."""
+    return get_llm_config().invoke_with_cascade(task, prompt, validate, temperature)
@@ -4,6 +4,31 @@ Prompt Templates for Portfolio Builder Agents.
 Centralized prompts for all agent nodes in the LangGraph workflow.
 """
 
+# ============================================================
+# PROMPT BUDGETS
+# ============================================================
+
+# Resume fields each agent actually needs; everything else is left out of its prompt.
+RESUME_FIELDS = {
+    "website_planner": ["name", "summary", "skills", "projects", "experience", "education"],
+    "hero": ["name", "summary", "skills", "experience", "github", "linkedin", "website"],
+    "about": ["name", "summary", "experience", "education", "skills", "certifications", "languages", "interests"],
+    "skills": ["summary", "skills"],
+    "projects": ["projects", "skills"],
+    "experience": ["experience"],
+    "contact": ["name", "email", "phone", "linkedin", "github", "website"],
+}
+
+# Website plan fields the section content agents need (colors and fonts only matter to codegen).
+SECTION_PLAN_FIELDS = ["style", "sections", "use_animations", "dark_mode", "design_rationale"]
+
+# Hard per-call input budgets, in tokens.
+RESUME_TEXT_TOKEN_BUDGET = 6000
+PLANNER_RESUME_TOKEN_BUDGET = 2500
+SECTION_RESUME_TOKEN_BUDGET = 1500
+SECTION_PLAN_TOKEN_BUDGET = 300
+
+
 # ============================================================
 # RESUME PARSER PROMPTS
 # ============================================================
@@ -7,7 +7,8 @@ Handles extraction of text from various resume formats (PDF, TXT, DOCX).
 import os
 from pathlib import Path
 from typing import Optional, Union
-from pypdf import PdfReader
+
+from core.document_extractor import get_document_extractor
 
 
 class ResumeParserService:
@@ -40,16 +41,27 @@ class ResumeParserService:
         if file_path.suffix.lower() != '.pdf':
             raise ValueError(f"Not a PDF file: {file_path}")
         
-        try:
-            reader = PdfReader(str(file_path))
-            text_parts = []
+        return self.parse_pdf_bytes(file_path.read_bytes())
+    
+    def parse_pdf_bytes(self, file_bytes: bytes) -> str:
+        """
+        Extract text from PDF bytes, in memory.
+        
+        Parsing is shared with the ATS checker and resume matcher and cached by
+        content hash, so a resume they have already seen is not parsed again.
+        
+        Args:
+            file_bytes: PDF content
             
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
+        Returns:
+            Extracted text content
             
-            return '\n\n'.join(text_parts)
+        Raises:
+            ValueError: If the content is not a valid PDF
+        """
+        try:
+            pages = get_document_extractor().extract_pages(file_bytes, "resume.pdf")
+            return '\n\n'.join(page for page in pages if page)
         
         except Exception as e:
             raise ValueError(f"Error parsing PDF: {e}")
@@ -147,6 +159,8 @@ class ResumeParserService:
         """
         Extract text from file bytes (for uploaded files).
         
+        PDF and TXT are parsed in memory; DOCX still goes through a temp file.
+        
         Args:
             file_bytes: File content as bytes
             filename: Original filename (for extension detection)
@@ -165,6 +179,11 @@ class ResumeParserService:
                 f"Supported formats: {', '.join(self.SUPPORTED_EXTENSIONS)}"
             )
         
+        if extension == '.pdf':
+            return self.parse_pdf_bytes(file_bytes)
+        if extension == '.txt':
+            return get_document_extractor().extract_text(file_bytes, filename)
+        
         # Create a temporary file
         if temp_dir:
             temp_dir.mkdir(parents=True, exist_ok=True)
@@ -3,9 +3,17 @@ General Helper Utilities for Portfolio Builder.
 """
 
 import re
-import json
 import uuid
-from typing import Any, Optional
+from typing import Any, Dict, Optional
+
+from core.json_extract import parse_json
+from core.prompt_budget import build_prompt, select_fields
+from portfolio_builder.core.prompts import (
+    RESUME_FIELDS,
+    SECTION_PLAN_FIELDS,
+    SECTION_RESUME_TOKEN_BUDGET,
+    SECTION_PLAN_TOKEN_BUDGET,
+)
 
 
 def generate_project_id() -> str:
@@ -17,7 +25,8 @@ def safe_json_parse(json_string: str, default: Any = None) -> Any:
     """
     Safely parse JSON from LLM responses.
     
-    Handles common issues like markdown code blocks and control characters.
+    Handles markdown code blocks, control characters, trailing commas and
+    responses cut off mid-object (see core.json_extract).
     
     Args:
         json_string: String that should contain JSON
@@ -29,34 +38,12 @@ def safe_json_parse(json_string: str, default: Any = None) -> Any:
     if not json_string:
         return default
     
-    # Try to extract JSON from markdown code blocks
-    json_string = json_string.strip()
-    
-    # Check for ```json ... ``` blocks
-    json_match = re.search(r'```(?:json)?\s*\n?(.*?)\n?```', json_string, re.DOTALL)
-    if json_match:
-        json_string = json_match.group(1).strip()
-    
-    # Remove control characters that can cause parsing issues
-    json_string = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f]', '', json_string)
-    
-    # Try to find JSON object or array
-    if not json_string.startswith(('{', '[')):
-        # Try to find start of JSON
-        start_obj = json_string.find('{')
-        start_arr = json_string.find('[')
-        
-        if start_obj != -1 and (start_arr == -1 or start_obj < start_arr):
-            json_string = json_string[start_obj:]
-        elif start_arr != -1:
-            json_string = json_string[start_arr:]
-    
-    try:
-        return json.loads(json_string)
-    except json.JSONDecodeError as e:
-        print(f"JSON parse error: {e}")
+    parsed = parse_json(json_string, default=None)
+    if parsed is None:
+        print("JSON parse error: no valid JSON found")
         print(f"Problematic string (first 200 chars): {json_string[:200]}")
         return default
+    return parsed
 
 
 def format_component_name(name: str) -> str:
@@ -247,3 +234,37 @@ def merge_dicts(base: dict, override: dict) -> dict:
             result[key] = value
     
     return result
+
+
+def build_section_prompt(
+    template: str,
+    section: str,
+    resume_data: Dict,
+    website_plan: Dict,
+    model_name: Optional[str] = None
+) -> str:
+    """
+    Build a section agent prompt from only the resume and plan fields that
+    section needs, each capped at its token budget.
+    
+    Args:
+        template: Section prompt template (e.g. HERO_SECTION_PROMPT)
+        section: Section name, a key of RESUME_FIELDS
+        resume_data: Parsed resume
+        website_plan: Website plan from the planner
+        model_name: Model the prompt is for (selects the tokenizer)
+        
+    Returns:
+        Formatted prompt
+    """
+    return build_prompt(
+        template,
+        budgets={
+            "resume_data": SECTION_RESUME_TOKEN_BUDGET,
+            "website_plan": SECTION_PLAN_TOKEN_BUDGET,
+        },
+        model_name=model_name,
+        resume_data=select_fields(resume_data, RESUME_FIELDS[section]),
+        website_plan=select_fields(website_plan, SECTION_PLAN_FIELDS),
+        style=website_plan.get("style", "modern")
+    )
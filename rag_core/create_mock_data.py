@@ -2,7 +2,10 @@ import os
 import sys
 import json
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.llm_gateway import get_chat_model, invoke_llm
+from core.json_extract import parse_json
 
 # --- CONFIGURABLE PARAMETERS ---
 DOMAINS = ["Software Engineering", "Data Science", "Machine Learning", "DevOps", "Cloud Computing", "Cybersecurity", "Database Management", "Web Development", "Mobile Development", "AI Ethics", "Product Management", "UX/UI Design", "Blockchain", "Quantum Computing", "Game Development"]
@@ -31,10 +34,7 @@ MODEL_NAME = "llama-3.1-8b-instant"
 
 # --- LLM Setup ---
 load_dotenv()
-groq_api_key = os.environ.get("GROQ_API_KEY")
-if not groq_api_key:
-    raise ValueError("GROQ_API_KEY not found. Please set in .env file.")
-llm = ChatGroq(groq_api_key=groq_api_key, model_name=MODEL_NAME)
+llm = get_chat_model(MODEL_NAME)
 
 # --- Prompt Template ---
 LLM_PROMPT = '''
@@ -64,16 +64,9 @@ Respond ONLY with a JSON array of the objects, no markdown/title.
 def generate_qas(domain, topic, difficulty, n=2):
     prompt = LLM_PROMPT.format(domain=domain, topic=topic, difficulty=difficulty, n=n)
     try:
-        response = llm.invoke(prompt)
-        content = response.content.strip()
-        # Some LLMs may return markdown code block; clean it up (if exists)
-        if content.startswith('```json'):
-            content = content[7:]
-        if content.startswith('```'):
-            content = content[3:]
-        if content.endswith('```'):
-            content = content[:-3]
-        data = json.loads(content)
+        response = invoke_llm(llm, prompt)
+        # Handles markdown code blocks and truncated arrays
+        data = parse_json(response.content, default=[])
         # Patch missing IDs if LLM skips them
         for idx, item in enumerate(data):
             item.setdefault("id", f"{domain[:2]}_{topic[:2]}_{difficulty[0]}_{idx+1}")
@@ -1,11 +1,9 @@
 import os
 import sys
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
 from langchain_community.vectorstores import FAISS
 from langchain_community.retrievers import BM25Retriever
 from langchain_classic.retrievers.ensemble import EnsembleRetriever 
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnablePassthrough, RunnableBranch
@@ -20,14 +18,14 @@ from langchain_classic.chains.combine_documents import create_stuff_documents_ch
 
 # Internal project imports
 from .rag_loader import load_interview_json_files
+from core.resources import lazy_chat_model, register_resource
+from core.embedding_store import CachedEmbeddings
+from core.embedding_backends import get_embedding_model, embedding_namespace
 
 load_dotenv()
 
-# --- Init LLM ---
-groq_api_key = os.environ.get("GROQ_API_KEY", "")
-if not groq_api_key:
-    raise RuntimeError("Please set GROQ_API_KEY in your environment.")
-llm = ChatGroq(groq_api_key=groq_api_key, model_name="llama-3.1-8b-instant")
+# --- Init LLM (built on first use) ---
+get_llm = lazy_chat_model("llama-3.1-8b-instant")
 
 # --- Redis Config ---
 # Allow overriding with env var REDIS_URL
@@ -38,17 +36,28 @@ KB_DIR = os.path.join(os.path.dirname(__file__), "interview_prep_kb")
 VECTORSTORE_PATH = os.path.join(os.path.dirname(__file__), "vectorstores", "interview_prep_faiss")
 EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2" 
 
+# --- Lazy Retrieval Resources (loaded once, on first use or warm-up) ---
+def _load_embeddings():
+    # Same MiniLM instance as the resume matcher; query embeddings go through the
+    # persistent embedding store, so repeated questions skip the model
+    return CachedEmbeddings(get_embedding_model(EMBEDDING_MODEL), embedding_namespace(EMBEDDING_MODEL))
+
+get_rag_embeddings = register_resource("rag:embeddings", _load_embeddings)
+get_vectorstore = register_resource(
+    "rag:faiss",
+    lambda: FAISS.load_local(VECTORSTORE_PATH, get_rag_embeddings(), allow_dangerous_deserialization=True)
+)
+get_kb_documents = register_resource("rag:kb_documents", lambda: load_interview_json_files(KB_DIR))
+
 # --- Retriever Functions ---
 def get_hybrid_retriever(k: int):
     """
     Initializes and returns a hybrid retriever combining FAISS (vector search)
     and BM25 (keyword search) with Reciprocal Rank Fusion (RRF).
     """
-    embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
-    vectordb = FAISS.load_local(VECTORSTORE_PATH, embeddings, allow_dangerous_deserialization=True)
-    faiss_retriever = vectordb.as_retriever(search_kwargs={"k": k})
+    faiss_retriever = get_vectorstore().as_retriever(search_kwargs={"k": k})
 
-    docs = load_interview_json_files(KB_DIR) 
+    docs = get_kb_documents()
     bm25_retriever = BM25Retriever.from_documents(docs)
     bm25_retriever.k = k
 
@@ -127,7 +136,8 @@ def get_rag_chain(llm, k_retrieval: int):
     
     # The final RAG chain, combining history-aware retrieval with document stuffing
     rag_chain_raw = create_retrieval_chain(history_aware_retriever, qa_document_chain)
-    rag_chain = rag_chain_raw | (lambda x: x["answer"])
+    # pick() passes answer tokens through as they arrive, so astream() streams them
+    rag_chain = rag_chain_raw.pick("answer")
     return rag_chain
 
 def get_classification_chain(llm):
@@ -174,10 +184,11 @@ def messages_to_text(history) -> str:
     return "\n".join(text_lines)
 
 # --- Main Conversational Chain with Routing (Redis-backed) ---
-def get_full_conversational_chain(llm, k_retrieval: int):
+def get_conversational_branch_chain(llm, k_retrieval: int):
     """
-    Constructs the complete conversational chain, including intent classification
-    and routing to either the RAG chain or a chit-chat chain, with Redis-backed history.
+    Constructs the routing chain: intent classification followed by either the
+    RAG chain or the chit-chat chain. Expects 'input' and 'chat_history' keys
+    and does not touch Redis, so callers can stream it and persist history themselves.
     """
     rag_chain_for_branch = get_rag_chain(llm, k_retrieval)
     classification_chain = get_classification_chain(llm)
@@ -200,22 +211,30 @@ def get_full_conversational_chain(llm, k_retrieval: int):
         (routing_condition, chit_chat_chain),
         rag_chain_for_branch
     )
+    return branch_chain
 
-    # Wrap with RunnableWithMessageHistory to persist history into Redis
-    full_chain_with_history = RunnableWithMessageHistory(
-        branch_chain,
+def with_redis_history(chain):
+    """Wraps a conversational chain with RunnableWithMessageHistory backed by Redis."""
+    return RunnableWithMessageHistory(
+        chain,
         lambda session_id: get_redis_history(session_id),
         input_messages_key="input",
         history_messages_key="chat_history",
     )
-    return full_chain_with_history
+
+def get_full_conversational_chain(llm, k_retrieval: int):
+    """
+    Constructs the complete conversational chain, including intent classification
+    and routing to either the RAG chain or a chit-chat chain, with Redis-backed history.
+    """
+    return with_redis_history(get_conversational_branch_chain(llm, k_retrieval))
 
 # --- Main Execution for Demonstration ---
 if __name__ == "__main__":
     k_retrieval = 5 # Number of documents to retrieve for RAG
 
     # Build chain (Redis-based history)
-    final_conversational_chain = get_full_conversational_chain(llm, k_retrieval)
+    final_conversational_chain = get_full_conversational_chain(get_llm(), k_retrieval)
 
     print(f"Conversational RAG Chain Initialized (retrieving {k_retrieval} documents).")
     print("Type ':q' to quit.")
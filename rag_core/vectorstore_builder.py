@@ -1,7 +1,10 @@
 import os
+import sys
 from rag_loader import load_interview_json_files, chunk_documents
 from langchain_community.vectorstores import FAISS
-from langchain_huggingface import HuggingFaceEmbeddings
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.embedding_backends import load_embedding_model
 
 # --- CONFIGS ---
 KB_DIR = os.path.join(os.path.dirname(__file__), "interview_prep_kb")
@@ -12,8 +15,8 @@ EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-l6-v2"
 
 def build_faiss_vectorstore(chunks, persist_dir):
     #Step 1: Intialize embeddings model
-    print("🧠 Initializing embedding model (HuggingFace MiniLM)...")
-    embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+    print("🧠 Initializing embedding model (MiniLM, EMBEDDING_BACKEND=torch|onnx)...")
+    embeddings = load_embedding_model("sentence-transformers/all-MiniLM-L6-v2")
 
     # Step 2: Build FAISS index
     print("⚙️ Creating FAISS index and adding document chunks...")
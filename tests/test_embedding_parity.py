@@ -0,0 +1,48 @@
+"""
+ONNX embedding backend vs. PyTorch: the int8 export must keep every sample
+embedding within PARITY_MIN_COSINE of the sentence-transformers one.
+
+Skipped unless onnxruntime, tokenizers, torch and langchain_huggingface are
+installed. Uses the exported model if there is one, otherwise exports it
+(which needs transformers and the model download).
+
+    python -m pytest tests/test_embedding_parity.py
+"""
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("tokenizers")
+pytest.importorskip("torch")
+pytest.importorskip("langchain_huggingface")
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.embedding_backends import (
+    DEFAULT_MODEL_NAME, ONNX_MODEL_FILE, PARITY_MIN_COSINE, check_parity, export_onnx, onnx_model_dir
+)
+
+
+@pytest.fixture(scope="module")
+def onnx_export(tmp_path_factory):
+    """Directory of an ONNX export of the default model."""
+    model_dir = onnx_model_dir(DEFAULT_MODEL_NAME)
+    if os.path.exists(os.path.join(model_dir, ONNX_MODEL_FILE)):
+        return model_dir
+    pytest.importorskip("transformers")
+    try:
+        return export_onnx(DEFAULT_MODEL_NAME, str(tmp_path_factory.mktemp("onnx")))
+    except OSError as e:  # No network / model not cached
+        pytest.skip(f"Could not export {DEFAULT_MODEL_NAME}: {e}")
+
+
+def test_onnx_matches_torch_on_sample_texts(onnx_export, monkeypatch):
+    monkeypatch.setenv("EMBEDDING_ONNX_DIR", onnx_export)
+
+    result = check_parity(DEFAULT_MODEL_NAME)
+
+    assert result["texts"] > 0
+    assert result["min_cosine"] >= PARITY_MIN_COSINE, result
+    assert result["passed"], result
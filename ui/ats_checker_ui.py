@@ -8,7 +8,7 @@ import plotly.express as px
 import pandas as pd
 from io import BytesIO
 import base64
-from workflows.ats_flow import ats_analysis_flow
+from workflows.ats_flow import run_ats_analysis
 
 # Add the project root to Python path
 project_root = Path(__file__).parent.parent
@@ -73,8 +73,8 @@ def show_ats_checker_ui():
                             tmp_file.write(uploaded_file.getvalue())
                             tmp_file_path = tmp_file.name
                         
-                        # Run Prefect flow instead of direct call
-                        results = ats_analysis_flow(tmp_file_path, job_description)
+                        # Run the analysis (execution mode from ATS_EXECUTION_MODE)
+                        results = run_ats_analysis(tmp_file_path, job_description)
                         
                         # Store results in session state
                         st.session_state.ats_analysis_results = results
@@ -8,8 +8,8 @@ import datetime
 # Add the parent directory to the sys.path to allow importing rag_core
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-# Import the main conversational chain and the LLM instance from your RAG core
-from rag_core.retriever import get_full_conversational_chain, llm
+# Import the main conversational chain from your RAG core
+from rag_core.retriever import get_full_conversational_chain
 
 def show_interview_prep_ui():
     # Set page config
@@ -186,10 +186,11 @@ def show_interview_prep_ui():
     if "active_chat_id" not in st.session_state and st.session_state.all_chats:
         st.session_state.active_chat_id = next(iter(st.session_state.all_chats))
         
+    # Shared LLM client for both chains below
+    from rag_core.retriever import get_llm
     if "chain" not in st.session_state:
-        from rag_core.retriever import llm
         k_retrieval = 5  # Number of documents to retrieve
-        st.session_state.chain = get_full_conversational_chain(llm, k_retrieval, st.session_state.chat_history_store)
+        st.session_state.chain = get_full_conversational_chain(get_llm(), k_retrieval, st.session_state.chat_history_store)
             
 
     if "active_chat_id" not in st.session_state or not st.session_state.all_chats:
@@ -203,7 +204,7 @@ def show_interview_prep_ui():
     
     # Initialize the RAG chain, passing the central history store from session_state
     if "rag_chain" not in st.session_state:
-        st.session_state.rag_chain = get_full_conversational_chain(llm, 5, st.session_state.chat_history_store)
+        st.session_state.rag_chain = get_full_conversational_chain(get_llm(), 5, st.session_state.chat_history_store)
 
     # --- Sidebar UI ---
     st.sidebar.markdown("### 💬 Interview Prep")
@@ -0,0 +1,298 @@
+"""
+Batch ATS scoring: score a whole cohort of resumes against one optional JD.
+
+Resumes are extracted, cleaned and scored in a process pool (PDF parsing,
+NLTK and the checks are CPU-bound) with the in-process ATS analysis, and
+each result is yielded as soon as its resume finishes, so callers can stream
+NDJSON. The JD is cleaned once, in the parent, and handed to every worker,
+along with the rule pack to score with. Results carry the resume's position
+in the input ("upload_index") and its content hash ("resume_id"), since file
+names need not be unique and results arrive in completion order.
+
+    python workflows/ats_batch.py resumes/ --jd data/raw/job_descriptions/ai_engineer.txt --out scores.csv
+    python workflows/ats_batch.py cohort.zip --out scores.parquet
+    python workflows/ats_batch.py resumes/ > scores.ndjson
+    python workflows/ats_batch.py resumes/ --rule-pack ai_engineer --out scores.csv
+"""
+
+import os
+import sys
+import csv
+import json
+import shutil
+import zipfile
+import tempfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import BinaryIO, Dict, Iterator, List, Optional, Union
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.utils import clean_text
+from core.resume_artifacts import ResumeArtifact
+from core.document_extractor import content_hash
+from core.ats_cache import get_ats_result_cache
+from core.ats_rules import get_rule_pack, list_rule_packs
+from workflows.ats_flow import ats_analysis_inprocess
+
+ATS_BATCH_WORKERS = int(os.environ.get("ATS_BATCH_WORKERS", os.cpu_count() or 4))
+# Caps on what one batch (uploads and unpacked ZIP members) may write to disk
+ATS_BATCH_MAX_FILES = int(os.environ.get("ATS_BATCH_MAX_FILES", 500))
+ATS_BATCH_MAX_FILE_MB = int(os.environ.get("ATS_BATCH_MAX_FILE_MB", 10))
+ATS_BATCH_MAX_TOTAL_MB = int(os.environ.get("ATS_BATCH_MAX_TOTAL_MB", 500))
+
+RESUME_EXTENSIONS = (".pdf",)
+
+# Set in each worker by _init_worker, so the JD is sent once per worker rather than per resume
+_worker_jd: Optional[str] = None
+_worker_jd_tokens: Optional[List[str]] = None
+_worker_rule_pack: Optional[str] = None
+
+
+def _init_worker(job_description: Optional[str], jd_tokens: Optional[List[str]],
+                 rule_pack: Optional[str] = None) -> None:
+    global _worker_jd, _worker_jd_tokens, _worker_rule_pack
+    _worker_jd, _worker_jd_tokens, _worker_rule_pack = job_description, jd_tokens, rule_pack
+
+
+def list_resumes(folder: str) -> List[str]:
+    """Resume files directly under `folder`, sorted by name."""
+    return sorted(
+        os.path.join(folder, name) for name in os.listdir(folder)
+        if name.lower().endswith(RESUME_EXTENSIONS)
+    )
+
+
+class BatchLimits:
+    """
+    Resume count and size caps for one batch, shared by all of its uploads.
+
+    Args:
+        max_files: Max resumes.
+        max_file_bytes: Max size of one resume.
+        max_total_bytes: Max size of all resumes together.
+
+    Raises:
+        ValueError: From `check` / `copy`, when a cap would be exceeded.
+    """
+
+    def __init__(self, max_files: int = ATS_BATCH_MAX_FILES, max_file_bytes: int = ATS_BATCH_MAX_FILE_MB * 1024 * 1024,
+                 max_total_bytes: int = ATS_BATCH_MAX_TOTAL_MB * 1024 * 1024):
+        self.max_files = max_files
+        self.max_file_bytes = max_file_bytes
+        self.max_total_bytes = max_total_bytes
+        self.files = 0
+        self.total_bytes = 0
+
+    def check(self, name: str, size: int) -> None:
+        """Rejects a resume of `size` bytes up front (e.g. from a ZIP member's declared size)."""
+        if self.files >= self.max_files:
+            raise ValueError(f"Too many resumes in one batch (limit {self.max_files})")
+        if size > self.max_file_bytes:
+            raise ValueError(f"{name} is larger than {self.max_file_bytes // (1024 * 1024)} MB")
+        if self.total_bytes + size > self.max_total_bytes:
+            raise ValueError(f"Batch is larger than {self.max_total_bytes // (1024 * 1024)} MB")
+
+    def _chunks(self, src: BinaryIO, name: str) -> Iterator[bytes]:
+        """Reads one resume in chunks, counting the bytes actually read (declared sizes can lie)."""
+        self.check(name, 0)
+        self.files += 1
+        written = 0
+        while chunk := src.read(1 << 20):
+            written += len(chunk)
+            self.total_bytes += len(chunk)
+            if written > self.max_file_bytes:
+                raise ValueError(f"{name} is larger than {self.max_file_bytes // (1024 * 1024)} MB")
+            if self.total_bytes > self.max_total_bytes:
+                raise ValueError(f"Batch is larger than {self.max_total_bytes // (1024 * 1024)} MB")
+            yield chunk
+
+    def copy(self, src: BinaryIO, path: str, name: str) -> None:
+        """Copies one resume to `path`."""
+        with open(path, "wb") as out:
+            for chunk in self._chunks(src, name):
+                out.write(chunk)
+
+    def read(self, src: BinaryIO, name: str) -> bytes:
+        """Reads one resume into memory."""
+        return b"".join(self._chunks(src, name))
+
+
+def extract_zip(archive: Union[str, BinaryIO], dest: str, limits: Optional[BatchLimits] = None) -> List[str]:
+    """
+    Extracts the resumes in a ZIP archive into `dest`.
+
+    Member paths are never used as-is: each resume is written under its own
+    numbered subdirectory by base name, so entries like "../x.pdf" can't
+    escape `dest` and same-named files in different folders are kept apart.
+
+    Args:
+        archive: ZIP file path or file object.
+        dest: Directory to extract into.
+        limits: Count and size caps (default: a fresh BatchLimits), so a small
+            archive can't unpack into a disk-filling one.
+
+    Returns:
+        The extracted resume paths, in archive order.
+
+    Raises:
+        ValueError: The archive exceeds `limits`.
+    """
+    limits = limits or BatchLimits()
+    paths = []
+    with zipfile.ZipFile(archive) as zf:
+        for info in zf.infolist():
+            name = os.path.basename(info.filename)
+            if info.is_dir() or not name.lower().endswith(RESUME_EXTENSIONS) or info.filename.startswith("__MACOSX/"):
+                continue
+            limits.check(name, info.file_size)
+            target_dir = os.path.join(dest, str(len(paths)))
+            os.makedirs(target_dir)
+            path = os.path.join(target_dir, name)
+            with zf.open(info) as src:
+                limits.copy(src, path, name)
+            paths.append(path)
+    return paths
+
+
+def score_resume(upload_index: int, path: str) -> Dict:
+    """
+    Extracts, cleans and scores one resume. Runs in a worker process.
+
+    Returns:
+        {"type": "resume", "upload_index", "resume_id", "file", "overall_score", "category_scores",
+        "recommendations"} or {"type": "error", "upload_index", "file", "error"} (plus "resume_id"
+        when the file could be read).
+    """
+    name = os.path.basename(path)
+    ids = {"upload_index": upload_index}
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        resume_hash = ids["resume_id"] = content_hash(data)
+
+        def analyze():
+            artifact = ResumeArtifact(resume_hash, data=data, filename=name)
+            return ats_analysis_inprocess(
+                job_description=_worker_jd,
+                resume_text=artifact.text,
+                resume_tokens=artifact.tokens,
+                jd_tokens=_worker_jd_tokens,
+                rule_pack=_worker_rule_pack
+            )
+
+        result = get_ats_result_cache().get_or_compute(resume_hash, _worker_jd, analyze, _worker_rule_pack)
+        return {"type": "resume", **ids, "file": name, **result}
+    except Exception as e:
+        return {"type": "error", **ids, "file": name, "error": str(e)}
+
+
+def score_resumes(
+    paths: List[str],
+    job_description: Optional[str] = None,
+    workers: int = ATS_BATCH_WORKERS,
+    use_processes: bool = True,
+    rule_pack: Optional[str] = None,
+) -> Iterator[Dict]:
+    """
+    Scores resumes, yielding each result as soon as it is ready (completion order).
+
+    Args:
+        paths: Resume files.
+        job_description: Optional JD text for keyword matching.
+        workers: Scoring workers.
+        use_processes: Score in a process pool (False: threads, e.g. where forking is unwanted).
+        rule_pack: ATS rule pack name or path (default: ATS_RULE_PACK).
+
+    Yields:
+        One `score_resume` result per path.
+    """
+    jd_tokens = clean_text(job_description) if job_description else None
+    pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    pool = pool_cls(max_workers=max(1, workers), initializer=_init_worker,
+                    initargs=(job_description, jd_tokens, rule_pack))
+    try:
+        futures = [pool.submit(score_resume, i, path) for i, path in enumerate(paths)]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # When the consumer stops early (e.g. the client disconnected), resumes not started yet are dropped
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def score_resumes_ndjson(paths: List[str], job_description: Optional[str] = None, **kwargs) -> Iterator[str]:
+    """`score_resumes` as NDJSON lines."""
+    for result in score_resumes(paths, job_description, **kwargs):
+        yield json.dumps(result) + "\n"
+
+
+def to_row(result: Dict) -> Dict:
+    """Flattens a result into one table row (category scores as columns)."""
+    row = {
+        "upload_index": result.get("upload_index"),
+        "resume_id": result.get("resume_id", ""),
+        "file": result["file"],
+        "overall_score": result.get("overall_score"),
+    }
+    for category, data in result.get("category_scores", {}).items():
+        row[f"{category}_score"] = round(data["score"], 4)
+    row["recommendations"] = " | ".join(result.get("recommendations", []))
+    row["error"] = result.get("error", "")
+    return row
+
+
+def write_results(results: List[Dict], out_path: str) -> None:
+    """Writes results as CSV, or as Parquet when `out_path` ends with .parquet (needs pandas and pyarrow)."""
+    rows = [to_row(result) for result in results]
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    if out_path.endswith(".parquet"):
+        import pandas as pd
+        pd.DataFrame(rows, columns=columns).to_parquet(out_path, index=False)
+        return
+    with open(out_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ATS-score a folder (or ZIP) of resumes")
+    parser.add_argument("source", help="Folder of resumes or a .zip archive")
+    parser.add_argument("--jd", help="Job description text file (optional)")
+    parser.add_argument("--out", help="Output .csv or .parquet (default: NDJSON on stdout)")
+    parser.add_argument("--workers", type=int, default=ATS_BATCH_WORKERS)
+    parser.add_argument("--rule-pack", help=f"ATS rule pack name or file (available: {', '.join(list_rule_packs())})")
+    args = parser.parse_args()
+    get_rule_pack(args.rule_pack)  # Fails fast on an unknown or invalid pack
+
+    job_description = None
+    if args.jd:
+        with open(args.jd, encoding="utf-8") as f:
+            job_description = f.read()
+
+    extract_dir = None
+    try:
+        if args.source.lower().endswith(".zip"):
+            extract_dir = tempfile.mkdtemp(prefix="ats_batch_")
+            paths = extract_zip(args.source, extract_dir)
+        else:
+            paths = list_resumes(args.source)
+
+        results = []
+        for result in score_resumes(paths, job_description, workers=args.workers, rule_pack=args.rule_pack):
+            if args.out:
+                results.append(result)
+                print(f"Scored {len(results)}/{len(paths)}: {result['file']}", file=sys.stderr)
+            else:
+                sys.stdout.write(json.dumps(result) + "\n")
+                sys.stdout.flush()
+        if args.out:
+            results.sort(key=lambda r: r.get("overall_score", -1), reverse=True)
+            write_results(results, args.out)
+            print(f"Wrote {len(results)} results to {args.out}", file=sys.stderr)
+    finally:
+        if extract_dir:
+            shutil.rmtree(extract_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
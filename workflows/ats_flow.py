@@ -1,69 +1,137 @@
+"""
+ATS analysis: the category scores of an ATS rule pack (core/ats_rules),
+aggregated into an overall score with recommendations.
+
+Two ways to run it, with the same result schema:
+- "inprocess" (default, used by the API): every category is scored in one
+  vectorized step by the rule pack, with no orchestration overhead.
+- "prefect": `ats_analysis_flow`, one Prefect task per category inside a
+  flow, for offline batch runs that want flow-run tracking and logs.
+
+`run_ats_analysis` picks one by ATS_EXECUTION_MODE (or its `mode` argument).
+"""
+
 from prefect import flow, task
 import sys
 import os
+from typing import Dict, List
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from core.ats import ATSAnalyzer
 from core.utils import load_resume,clean_text
 
+ATS_EXECUTION_MODE = os.environ.get("ATS_EXECUTION_MODE", "inprocess").lower()
+EXECUTION_MODES = ("inprocess", "prefect")
+
+
+def aggregate_scores(ats_criteria: Dict, category_scores_data: Dict[str, float]):
+    """Weights the category scores; returns (per-category breakdown, weighted total in [0, 1])."""
+    scores = {}
+    total_score = 0
+    for category, score in category_scores_data.items():
+        config = ats_criteria[category]
+        scores[category] = {
+            'score': score,
+            'weight': config['weight'],
+            'weighted_score': score * config['weight']
+        }
+        total_score += scores[category]['weighted_score']
+    return scores, total_score
+
+
+def build_result(total_score: float, scores: Dict, recommendations: List[str]) -> Dict:
+    return {
+        'overall_score': round(total_score * 100, 1),
+        'category_scores': scores,
+        'recommendations': recommendations,
+    }
+
+
 @task
-def load_and_clean_resume(resume_path: str):
-    """Loads resume text and cleans it."""
-    print(f"Loading and cleaning resume from: {resume_path}")
-    resume_text = load_resume(resume_path)
-    resume_tokens = clean_text(resume_text)
+def load_and_clean_resume(resume_path: str = None, resume_text: str = None, resume_tokens: list = None):
+    """Loads resume text (unless already extracted) and cleans it (unless already cleaned)."""
+    if resume_text is None:
+        print(f"Loading and cleaning resume from: {resume_path}")
+        resume_text = load_resume(resume_path)
+    if resume_tokens is None:
+        resume_tokens = clean_text(resume_text)
     return resume_text, resume_tokens
 @flow(name="ATS Analysis Flow", log_prints=True)
-def ats_analysis_flow(resume_path: str, job_description: str = None):
+def ats_analysis_flow(resume_path: str = None, job_description: str = None, resume_text: str = None,
+                      resume_tokens: list = None, rule_pack: str = None):
     """
     Orchestrates the full ATS analysis by running individual checks as tasks.
+    Takes either a resume file path or text (and optionally tokens) already
+    extracted from the upload.
     """
-    analyzer = ATSAnalyzer()
+    analyzer = ATSAnalyzer(rule_pack)
     ats_criteria = analyzer.ats_criteria
 
     # 1. Load and preprocess resume
-    resume_text, resume_tokens = load_and_clean_resume(resume_path)
+    resume_text, resume_tokens = load_and_clean_resume(resume_path, resume_text, resume_tokens)
 
     # 2. Run analysis tasks
     print("Running individual analysis tasks...")
-    format_score = analyzer.check_format_compatibility(resume_text)
-    keyword_score = analyzer.check_keyword_optimization(resume_text, resume_tokens, job_description)
-    structure_score = analyzer.check_structure_quality(resume_text)
-    content_score = analyzer.check_content_quality(resume_text, resume_tokens)
+    category_scores_data = {
+        category: analyzer.check_category(category, resume_text, resume_tokens, job_description)
+        for category in ats_criteria
+    }
 
     # 3. Aggregate scores (this logic runs inside the flow)
     print("Aggregating scores...")
-    category_scores_data = {
-        'format_compatibility': format_score,
-        'keyword_optimization': keyword_score,
-        'structure_quality': structure_score,
-        'content_quality': content_score
-    }
-    
-    scores = {}
-    total_score = 0
-    for category, score in category_scores_data.items():
-        config = ats_criteria[category]
-        scores[category] = {
-            'score': score,
-            'weight': config['weight'],
-            'weighted_score': score * config['weight']
-        }
-        total_score += scores[category]['weighted_score']
+    scores, total_score = aggregate_scores(ats_criteria, category_scores_data)
 
     # 4. Generate recommendations
     recommendations = analyzer.generate_recommendations(scores, resume_text)
 
     # 5. Compile final results
-    result = {
-        'overall_score': round(total_score * 100, 1),
-        'category_scores': scores,
-        'recommendations': recommendations,
-    }
+    result = build_result(total_score, scores, recommendations)
     
     print("ATS Analysis Complete:")
     print(f"Overall Score: {result['overall_score']}%")
     return result
 
+
+def ats_analysis_inprocess(resume_path: str = None, job_description: str = None, resume_text: str = None,
+                           resume_tokens: list = None, jd_tokens: list = None, rule_pack: str = None) -> Dict:
+    """
+    Same analysis and result as `ats_analysis_flow`, without Prefect: all
+    categories are scored by the rule pack in one call.
+    Pass `jd_tokens` when the JD is already cleaned.
+    """
+    analyzer = ATSAnalyzer(rule_pack)
+    if resume_text is None:
+        resume_text = load_resume(resume_path)
+    if resume_tokens is None:
+        resume_tokens = clean_text(resume_text)
+
+    category_scores_data = analyzer.score_categories(resume_text, resume_tokens, job_description, jd_tokens)
+    scores, total_score = aggregate_scores(analyzer.ats_criteria, category_scores_data)
+    recommendations = ATSAnalyzer.generate_recommendations.fn(analyzer, scores, resume_text)
+    return build_result(total_score, scores, recommendations)
+
+
+def run_ats_analysis(resume_path: str = None, job_description: str = None, resume_text: str = None,
+                     resume_tokens: list = None, mode: str = None, rule_pack: str = None) -> Dict:
+    """
+    Runs the ATS analysis in the configured execution mode.
+
+    Args:
+        resume_path: Resume file (unless resume_text is given).
+        job_description: Optional JD for keyword matching.
+        resume_text: Resume text already extracted.
+        resume_tokens: Resume tokens already cleaned.
+        mode: "inprocess" or "prefect" (default: ATS_EXECUTION_MODE).
+        rule_pack: ATS rule pack name or path (default: ATS_RULE_PACK).
+
+    Returns:
+        {"overall_score", "category_scores", "recommendations"}
+    """
+    mode = (mode or ATS_EXECUTION_MODE).lower()
+    if mode not in EXECUTION_MODES:
+        raise ValueError(f"Unknown ATS execution mode: {mode} (expected one of {EXECUTION_MODES})")
+    run = ats_analysis_flow if mode == "prefect" else ats_analysis_inprocess
+    return run(resume_path, job_description, resume_text, resume_tokens, rule_pack=rule_pack)
+
 if __name__ == "__main__":
     jd = """Job Title: AI Engineer Company Overview:
 We are a forward-thinking technology company at the forefront of artificial intelligence innovation. Our mission is to develop cutting-edge AI solutions that transform industries and create meaningful impact. We're looking for a talented AI Engineer to join our dynamic team and help shape the future of AI.
@@ -0,0 +1,196 @@
+"""
+Recruiter mode: rank a folder of resumes against one job description.
+
+Resumes are extracted and cleaned in a process pool (PDF parsing and NLTK are
+CPU-bound), embedded in batches as extractions finish, added to the resume
+vector index and scored as
+
+    score = RECRUITER_SIMILARITY_WEIGHT * embedding similarity
+          + (1 - RECRUITER_SIMILARITY_WEIGHT) * ATS keyword score
+
+where the ATS keyword score is `ATSAnalyzer.check_keyword_optimization`
+against the JD. `rank_resumes` yields one event per resume as soon as it is
+scored, then the ranked shortlist, so callers can stream NDJSON. Events
+carry the resume's position in the input ("upload_index") and its content
+hash ("resume_id"), since file names need not be unique. The resume index is
+keyed by resume_id too, so re-uploading a resume replaces its entry.
+
+    python workflows/recruiter_pipeline.py resumes/ --jd data/raw/job_descriptions/ai_engineer.txt > ranking.ndjson
+"""
+
+import os
+import sys
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Tuple, Union
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.utils import clean_text
+from core.embedding import create_embeddings
+from core.ats import ATSAnalyzer
+from core.document_extractor import content_hash
+from core.resume_artifacts import ResumeArtifact
+from core.vector_index import get_resume_index
+
+RECRUITER_WORKERS = int(os.environ.get("RECRUITER_WORKERS", os.cpu_count() or 4))
+# Resumes embedded per model batch; also how often results are flushed to the stream
+RECRUITER_EMBED_BATCH = int(os.environ.get("RECRUITER_EMBED_BATCH", 32))
+RECRUITER_SIMILARITY_WEIGHT = float(os.environ.get("RECRUITER_SIMILARITY_WEIGHT", 0.7))
+RECRUITER_SHORTLIST_SIZE = int(os.environ.get("RECRUITER_SHORTLIST_SIZE", 20))
+
+RESUME_EXTENSIONS = (".pdf",)
+
+# A resume file on disk, or an upload already in memory as (filename, bytes)
+Resume = Union[str, Tuple[str, bytes]]
+
+
+def list_resumes(folder: str) -> List[str]:
+    """Resume files directly under `folder`, sorted by name."""
+    return sorted(
+        os.path.join(folder, name) for name in os.listdir(folder)
+        if name.lower().endswith(RESUME_EXTENSIONS)
+    )
+
+
+def extract_resume(upload_index: int, resume: Resume, job_description: str) -> Dict:
+    """
+    Loads, cleans and keyword-scores one resume. Runs in a worker process.
+
+    Returns:
+        {"upload_index", "resume_id", "file", "tokens", "ats_keyword_score"}
+        or {"upload_index", "file", "error"}.
+    """
+    if isinstance(resume, str):
+        name, data = os.path.basename(resume), None
+    else:
+        name, data = os.path.basename(resume[0] or "resume.pdf"), resume[1]
+    try:
+        if data is None:
+            with open(resume, "rb") as f:
+                data = f.read()
+        artifact = ResumeArtifact(content_hash(data), data=data, filename=name)
+        resume_text, tokens = artifact.text, artifact.tokens
+        # The undecorated check: a Prefect task run per resume would dominate the cost.
+        keyword_score = ATSAnalyzer.check_keyword_optimization.fn(
+            ATSAnalyzer(), resume_text, tokens, job_description
+        )
+        return {"upload_index": upload_index, "resume_id": artifact.resume_id, "file": name,
+                "tokens": tokens, "ats_keyword_score": keyword_score}
+    except Exception as e:
+        return {"upload_index": upload_index, "file": name, "error": str(e)}
+
+
+def _score_batch(batch: List[Dict], jd_vector: np.ndarray, similarity_weight: float, index_resumes: bool) -> List[Dict]:
+    """Embeds a batch of extracted resumes (one model call) and scores them against the JD."""
+    vectors = np.asarray(create_embeddings([" ".join(item["tokens"]) for item in batch]), dtype=np.float32)
+    vectors /= np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+    similarities = vectors @ jd_vector
+
+    if index_resumes:
+        index = get_resume_index()
+        with index.update():
+            index.add_vectors(
+                [{"id": item["resume_id"], "file": item["file"], "tokens": len(item["tokens"])} for item in batch],
+                vectors.tolist()
+            )
+
+    results = []
+    for item, similarity in zip(batch, similarities.tolist()):
+        keyword_score = item["ats_keyword_score"]
+        results.append({
+            "type": "resume",
+            "upload_index": item["upload_index"],
+            "resume_id": item["resume_id"],
+            "file": item["file"],
+            "similarity": round(similarity, 4),
+            "ats_keyword_score": round(keyword_score, 4),
+            "score": round(similarity_weight * similarity + (1 - similarity_weight) * keyword_score, 4),
+        })
+    return results
+
+
+def rank_resumes(
+    resumes: List[Resume],
+    job_description: str,
+    shortlist_size: int = RECRUITER_SHORTLIST_SIZE,
+    similarity_weight: float = RECRUITER_SIMILARITY_WEIGHT,
+    workers: int = RECRUITER_WORKERS,
+    use_processes: bool = True,
+    index_resumes: bool = True,
+) -> Iterator[Dict]:
+    """
+    Ranks resumes against one JD, yielding results as they become available.
+
+    Args:
+        resumes: Resume file paths, or uploads as (filename, bytes).
+        job_description: JD text.
+        shortlist_size: Resumes in the final shortlist.
+        similarity_weight: Weight of the embedding similarity; the ATS keyword score gets the rest.
+        workers: Extraction workers.
+        use_processes: Extract in a process pool (False: threads, e.g. where forking is unwanted).
+        index_resumes: Add the resume embeddings to the resume vector index, batch by batch.
+
+    Yields:
+        {"type": "resume", ...} per scored resume, {"type": "error", ...} per unreadable file,
+        then one {"type": "shortlist", "results": [...]} with the best `shortlist_size`, best first.
+    """
+    jd_vector = np.asarray(create_embeddings([" ".join(clean_text(job_description))])[0], dtype=np.float32)
+    jd_vector /= max(float(np.linalg.norm(jd_vector)), 1e-12)
+
+    scored: List[Dict] = []
+    pending: List[Dict] = []
+    pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    pool = pool_cls(max_workers=max(1, workers))
+    try:
+        futures = [pool.submit(extract_resume, i, resume, job_description) for i, resume in enumerate(resumes)]
+        for future in as_completed(futures):
+            item = future.result()
+            if "error" in item:
+                yield {"type": "error", **item}
+                continue
+            pending.append(item)
+            if len(pending) >= RECRUITER_EMBED_BATCH:
+                for result in _score_batch(pending, jd_vector, similarity_weight, index_resumes):
+                    scored.append(result)
+                    yield result
+                pending = []
+    finally:
+        # When the consumer stops early (e.g. the client disconnected), resumes not started yet are dropped
+        pool.shutdown(wait=False, cancel_futures=True)
+    if pending:
+        for result in _score_batch(pending, jd_vector, similarity_weight, index_resumes):
+            scored.append(result)
+            yield result
+
+    shortlist = sorted(scored, key=lambda r: r["score"], reverse=True)[:shortlist_size]
+    yield {"type": "shortlist", "total": len(scored), "results": shortlist}
+
+
+def rank_resumes_ndjson(resumes: List[Resume], job_description: str, **kwargs) -> Iterator[str]:
+    """`rank_resumes` as NDJSON lines."""
+    for event in rank_resumes(resumes, job_description, **kwargs):
+        yield json.dumps(event) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank a folder of resumes against one job description")
+    parser.add_argument("folder")
+    parser.add_argument("--jd", required=True, help="Job description text file")
+    parser.add_argument("--shortlist", type=int, default=RECRUITER_SHORTLIST_SIZE)
+    parser.add_argument("--workers", type=int, default=RECRUITER_WORKERS)
+    parser.add_argument("--no-index", action="store_true", help="Don't add resumes to the resume index")
+    args = parser.parse_args()
+
+    with open(args.jd, encoding="utf-8") as f:
+        job_description = f.read()
+    for line in rank_resumes_ndjson(list_resumes(args.folder), job_description, shortlist_size=args.shortlist,
+                                    workers=args.workers, index_resumes=not args.no_index):
+        sys.stdout.write(line)
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
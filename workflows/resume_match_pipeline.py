@@ -10,11 +10,14 @@ from agents.ingestion_agent import IngestionAgent
 from agents.embedding_agent import EmbeddingAgent
 from agents.advisor_agent import AdvisorAgent
 from agents.pdf_generator_agent import PDFGeneratorAgent
+from core.embedding import SIMILARITY_MODE
+from core.resume_artifacts import get_resume_artifact
 
 
 class AgentState(TypedDict):
     """ The state of the agentic RAG workflow. """
     resume_path: str
+    resume_id: str  # Content hash of the upload (core.resume_artifacts), when known
     jd_text: str 
     raw_resume_text: str
     raw_jd_text: str
@@ -37,7 +40,10 @@ pdf_generator_agent = PDFGeneratorAgent()
 def ingest_node(state: AgentState):
     """Call ingestion once and extract all required data."""
     print("Ingesting documents...")
-    ingested_data = ingestion_agent.ingest(state["resume_path"], state["jd_text"])
+    # The router passes the resume's stored text and tokens; a path is only read when it doesn't
+    ingested_data = ingestion_agent.ingest(
+        state.get("resume_path"), state["jd_text"], state.get("raw_resume_text"), state.get("cleaned_resume")
+    )
     print("Documents ingested successfully.")
     return {
         "raw_resume_text": ingested_data["raw_resume_text"],
@@ -49,7 +55,11 @@ def ingest_node(state: AgentState):
 def embed_node(state: AgentState):
     """Calculate similarity score."""
     print("Generating embeddings and calculating similarity...")
-    score = embedding_agent.process(state["cleaned_resume"], state["cleaned_jd"])
+    # Chunk embeddings of a known resume come from the artifact store
+    resume_vectors = None
+    if state.get("resume_id") and SIMILARITY_MODE == "chunked":
+        resume_vectors = get_resume_artifact(state["resume_id"]).chunk_embeddings()
+    score = embedding_agent.process(state["cleaned_resume"], state["cleaned_jd"], resume_vectors)
     print(f"Similarity score calculated: {score:.4f}")
     return {"similarity_score": score}
 